@@ -2,9 +2,15 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from home_calculator_core import DEFAULT_VALUES
+from home_calculator_core import HomeCalculatorCore, DEFAULT_VALUES, MORTGAGE_COLUMNS, RENT_COLUMNS, STOCK_COLUMNS
 from tkinter import font
 
+
+def format_currency(value):
+    """Format a numeric table value for display, e.g. 1234.5 -> '$1,234.50'"""
+    return f"${value:,.2f}"
+
+
 class HomeRentCalculator:
     def __init__(self, root):
         self.root = root
@@ -227,18 +233,6 @@ class HomeRentCalculator:
         self.result_frame.columnconfigure(0, weight=1)
         self.result_frame.rowconfigure(1, weight=1)
         
-    def calculate_mortgage_payment(self, principal, annual_rate, years):
-        """Calculate monthly mortgage payment using standard formula"""
-        monthly_rate = annual_rate / 100 / 12
-        num_payments = years * 12
-        
-        if monthly_rate == 0:
-            return principal / num_payments
-        
-        payment = principal * (monthly_rate * (1 + monthly_rate)**num_payments) / \
-                 ((1 + monthly_rate)**num_payments - 1)
-        return payment
-    
     def generate_comparison(self):
         try:
             # Get all input values
@@ -247,7 +241,6 @@ class HomeRentCalculator:
             # Purchase inputs
             home_price = float(self.purchase_entries['home_price'].get())
             down_payment_pct = float(self.purchase_entries['down_payment_pct'].get())
-            down_payment = home_price * (down_payment_pct / 100)
             apr = float(self.purchase_entries['apr'].get())
             property_tax_rate = float(self.purchase_entries['property_tax'].get())
             property_tax_growth = float(self.purchase_entries['property_tax_growth'].get())
@@ -276,141 +269,40 @@ class HomeRentCalculator:
             # Capital gains exemption input
             capital_gains_exemption_enabled = self.enable_capital_gains_exemption.get()
             
-            # Calculate loan amount
-            loan_amount = home_price - down_payment
-            
-            # Calculate monthly mortgage payment (principal + interest)
-            monthly_payment = self.calculate_mortgage_payment(loan_amount, apr, 30)
-            
-            # Calculate property tax monthly
-            annual_property_tax = home_price * (property_tax_rate / 100)
-            monthly_property_tax = annual_property_tax / 12
+            inputs = {
+                'years': years, 'home_price': home_price, 'down_payment_pct': down_payment_pct,
+                'apr': apr, 'property_tax_rate': property_tax_rate, 'property_tax_growth': property_tax_growth,
+                'house_growth': house_growth, 'maintenance_annual': maintenance_annual,
+                'brokerage_cost': brokerage_cost, 'registration_cost': registration_cost,
+                'capital_gains_exemption_enabled': capital_gains_exemption_enabled,
+                'monthly_rent': monthly_rent, 'rent_growth': rent_growth, 'monthly_income': monthly_income,
+                'income_growth': income_growth, 'rsu_income': rsu_income, 'tax_rate': tax_rate,
+                'standard_deduction': standard_deduction, 'stocks_enabled': stocks_enabled,
+                'include_down_payment_growth': include_down_payment_growth, 'stock_growth': stock_growth,
+                'capital_gains_tax_rate': capital_gains_tax_rate
+            }
             
             # Generate year-by-year data
-            self.generate_detailed_analysis(years, monthly_payment, monthly_rent, 
-                                          rent_growth, monthly_property_tax, 
-                                          home_price, house_growth, loan_amount, apr,
-                                          down_payment, stock_growth, property_tax_rate, tax_rate, stocks_enabled, standard_deduction,
-                                          brokerage_cost, registration_cost, capital_gains_exemption_enabled, maintenance_annual,
-                                          include_down_payment_growth, capital_gains_tax_rate)
+            self.generate_detailed_analysis(inputs)
             
         except ValueError as e:
             messagebox.showerror("Input Error", "Please enter valid numeric values for all fields.")
         except Exception as e:
             messagebox.showerror("Calculation Error", f"An error occurred: {str(e)}")
     
-    def generate_detailed_analysis(self, years, monthly_payment, initial_rent, 
-                                 rent_growth, monthly_property_tax, initial_home_value, 
-                                 house_growth, loan_amount, apr, down_payment, stock_growth, property_tax_rate, tax_rate, stocks_enabled, standard_deduction,
-                                 brokerage_cost, registration_cost, capital_gains_exemption_enabled, maintenance_annual,
-                                 include_down_payment_growth, capital_gains_tax_rate):
+    def generate_detailed_analysis(self, inputs):
         # Clear previous results
         for tab in self.notebook.tabs():
             self.notebook.forget(tab)
         
-        # Create mortgage amortization table
-        mortgage_data = []
-        current_balance = loan_amount
-        monthly_rate = apr / 100 / 12
-        
-        for year in range(1, years + 1):
-            year_principal = 0
-            year_interest = 0
-            
-            for month in range(12):
-                if current_balance > 0:
-                    interest_payment = current_balance * monthly_rate
-                    principal_payment = monthly_payment - interest_payment
-                    
-                    year_interest += interest_payment
-                    year_principal += principal_payment
-                    current_balance -= principal_payment
-                    
-                    if current_balance < 0:
-                        current_balance = 0
-            
-            # Calculate property tax for this year
-            current_home_value = initial_home_value * ((1 + house_growth/100) ** year)
-            annual_property_tax = current_home_value * (property_tax_rate / 100)
-            
-            # Property tax is only an expense, no tax benefit
-            
-            # Calculate mortgage interest deduction (limited to $750k principal per IRS)
-            deductible_principal_limit = 750000
-            current_loan_balance = min(current_balance + year_principal, deductible_principal_limit)
-            deductible_interest = year_interest * (current_loan_balance / (current_balance + year_principal)) if (current_balance + year_principal) > 0 else year_interest
-            interest_tax_savings = deductible_interest * (tax_rate / 100)
-            
-            mortgage_data.append({
-                'Year': year,
-                'Monthly EMI': f"${monthly_payment:,.2f}",
-                'Principal Paid': f"${year_principal:,.2f}",
-                'Interest Paid': f"${year_interest:,.2f}",
-                'Deductible Interest': f"${deductible_interest:,.2f}",
-                'Interest Tax Savings': f"${interest_tax_savings:,.2f}",
-                'Total P&I': f"${year_principal + year_interest:,.2f}",
-                'Property Tax': f"${annual_property_tax:,.2f}",
-                'Remaining Balance': f"${current_balance:,.2f}",
-                'Home Value': f"${current_home_value:,.2f}"
-            })
-        
-        # Create rent table with conditional stock investment calculations
-        rent_data = []
-        current_rent = initial_rent
-        cumulative_emi_rent_diff_investment = 0  # Cumulative investment balance
-        
-        for year in range(1, years + 1):
-            annual_rent = current_rent * 12
-            monthly_emi_rent_diff = monthly_payment - current_rent  # Can be positive or negative
-            annual_emi_rent_diff = monthly_emi_rent_diff * 12
-            monthly_emi_rent_diff_positive = max(0, monthly_emi_rent_diff)  # Only positive for investments
-            annual_emi_rent_diff_positive = monthly_emi_rent_diff_positive * 12
-            
-            if stocks_enabled:
-                # Calculate stock growth on down payment (only if enabled)
-                if include_down_payment_growth:
-                    down_payment_value = down_payment * ((1 + stock_growth/100) ** year)
-                else:
-                    down_payment_value = down_payment  # No growth, just original amount
-                
-                # Calculate stock growth on accumulated EMI-rent difference investments
-                if year == 1:
-                    cumulative_emi_rent_diff_investment = annual_emi_rent_diff_positive
-                else:
-                    # Previous year's investment grows + new year's investment
-                    cumulative_emi_rent_diff_investment = (cumulative_emi_rent_diff_investment * (1 + stock_growth/100)) + annual_emi_rent_diff_positive
-                
-                total_stock_investment_value = down_payment_value + cumulative_emi_rent_diff_investment
-                
-                rent_data.append({
-                    'Year': year,
-                    'Monthly Rent': f"${current_rent:,.2f}",
-                    'Annual Rent': f"${annual_rent:,.2f}",
-                    'EMI-Rent Diff': f"${monthly_emi_rent_diff:,.2f}",
-                    'Yearly Savings with EMI-Rent Diff': f"${annual_emi_rent_diff:,.2f}",
-                    'Down Payment Investment': f"${down_payment_value:,.2f}",
-                    'EMI-Rent Diff Investment': f"${cumulative_emi_rent_diff_investment:,.2f}",
-                    'Total Stock Value': f"${total_stock_investment_value:,.2f}"
-                })
-            else:
-                # No stock investments - simplified rent table
-                rent_data.append({
-                    'Year': year,
-                    'Monthly Rent': f"${current_rent:,.2f}",
-                    'Annual Rent': f"${annual_rent:,.2f}",
-                    'EMI-Rent Diff': f"${monthly_emi_rent_diff:,.2f}",
-                    'Yearly Savings with EMI-Rent Diff': f"${annual_emi_rent_diff:,.2f}"
-                })
-            
-            current_rent *= (1 + rent_growth/100)
+        # Numeric yearly tables and summary from the shared core, amortized monthly like a lender schedule
+        mortgage_data, rent_data, summary = HomeCalculatorCore.generate_complete_analysis(inputs, fidelity='monthly')
         
         # Create tabs
         try:
             self.create_mortgage_tab(mortgage_data)
-            self.create_rent_tab(rent_data, stocks_enabled)
-            self.create_summary_tab(mortgage_data, rent_data, years, monthly_payment, down_payment, stocks_enabled, property_tax_rate, tax_rate, standard_deduction,
-                                   brokerage_cost, registration_cost, capital_gains_exemption_enabled, maintenance_annual,
-                                   include_down_payment_growth, capital_gains_tax_rate)
+            self.create_rent_tab(rent_data, inputs['stocks_enabled'])
+            self.create_summary_tab(mortgage_data, summary, inputs)
             
             # Switch to Summary tab by default
             self.notebook.select(2)  # Summary is the 3rd tab (index 2)
@@ -420,8 +312,8 @@ class HomeRentCalculator:
             print(f"Debug - Mortgage data length: {len(mortgage_data)}")
             print(f"Debug - Rent data length: {len(rent_data)}")
             if rent_data:
-                print(f"Debug - First rent data: {rent_data[0]}")
-                print(f"Debug - Last rent data: {rent_data[-1]}")
+                print(f"Debug - First rent data: {dict(rent_data[0])}")
+                print(f"Debug - Last rent data: {dict(rent_data[-1])}")
     
     def create_mortgage_tab(self, data):
         # Create mortgage tab
@@ -429,9 +321,7 @@ class HomeRentCalculator:
         self.notebook.add(mortgage_frame, text="Mortgage Details")
         
         # Create treeview for mortgage data
-        columns = ('Year', 'Monthly EMI', 'Principal Paid', 'Interest Paid', 'Deductible Interest', 
-                  'Interest Tax Savings', 'Total P&I', 'Property Tax', 
-                  'Remaining Balance', 'Home Value')
+        columns = MORTGAGE_COLUMNS
         
         mortgage_tree = ttk.Treeview(mortgage_frame, columns=columns, show='headings', height=15)
         
@@ -443,9 +333,9 @@ class HomeRentCalculator:
             else:
                 mortgage_tree.column(col, width=90, anchor='center')
         
-        # Insert data
+        # Insert data, formatting numbers only for display
         for row in data:
-            mortgage_tree.insert('', 'end', values=list(row.values()))
+            mortgage_tree.insert('', 'end', values=[row['Year']] + [format_currency(row[col]) for col in columns[1:]])
         
         # Add scrollbar
         scrollbar1 = ttk.Scrollbar(mortgage_frame, orient='vertical', command=mortgage_tree.yview)
@@ -464,10 +354,9 @@ class HomeRentCalculator:
         
         # Create treeview for rent data with conditional columns
         if stocks_enabled:
-            columns = ('Year', 'Monthly Rent', 'Annual Rent', 'EMI-Rent Diff', 'Yearly Savings with EMI-Rent Diff',
-                      'Down Payment Investment', 'EMI-Rent Diff Investment', 'Total Stock Value')
+            columns = RENT_COLUMNS + STOCK_COLUMNS
         else:
-            columns = ('Year', 'Monthly Rent', 'Annual Rent', 'EMI-Rent Diff', 'Yearly Savings with EMI-Rent Diff')
+            columns = RENT_COLUMNS
         
         rent_tree = ttk.Treeview(rent_frame, columns=columns, show='headings', height=15)
         
@@ -481,9 +370,9 @@ class HomeRentCalculator:
             else:
                 rent_tree.column(col, width=120, anchor='center')
         
-        # Insert data
+        # Insert data, formatting numbers only for display
         for row in data:
-            rent_tree.insert('', 'end', values=list(row.values()))
+            rent_tree.insert('', 'end', values=[row['Year']] + [format_currency(row[col]) for col in columns[1:]])
         
         # Add scrollbar
         scrollbar2 = ttk.Scrollbar(rent_frame, orient='vertical', command=rent_tree.yview)
@@ -495,88 +384,39 @@ class HomeRentCalculator:
         rent_frame.columnconfigure(0, weight=1)
         rent_frame.rowconfigure(0, weight=1)
     
-    def create_summary_tab(self, mortgage_data, rent_data, years, monthly_payment, down_payment, stocks_enabled, property_tax_rate, tax_rate, standard_deduction,
-                          brokerage_cost, registration_cost, capital_gains_exemption_enabled, maintenance_annual,
-                          include_down_payment_growth, capital_gains_tax_rate):
+    def create_summary_tab(self, mortgage_data, summary, inputs):
         # Create summary tab
         summary_frame = ttk.Frame(self.notebook)
         self.notebook.add(summary_frame, text="Summary")
         
-        # Calculate totals for ownership
-        total_principal = sum([float(row['Principal Paid'].replace('$', '').replace(',', '')) 
-                             for row in mortgage_data])
-        total_interest = sum([float(row['Interest Paid'].replace('$', '').replace(',', '')) 
-                            for row in mortgage_data])
-        total_property_tax = sum([float(row['Property Tax'].replace('$', '').replace(',', '')) 
-                                for row in mortgage_data])
-        # Property tax is only an expense, no tax savings
-        total_interest_tax_savings = sum([float(row['Interest Tax Savings'].replace('$', '').replace(',', '')) 
-                                        for row in mortgage_data])
-        total_deductible_interest = sum([float(row['Deductible Interest'].replace('$', '').replace(',', '')) 
-                                       for row in mortgage_data])
-        
-        # Calculate totals for rental + investments
-        total_rent = sum([float(row['Annual Rent'].replace('$', '').replace(',', '')) 
-                         for row in rent_data])
-        
-        # Get final values
-        final_home_value = float(mortgage_data[-1]['Home Value'].replace('$', '').replace(',', ''))
-        
-        # Calculate pure home appreciation and selling costs separately
-        initial_home_value = float(mortgage_data[0]['Home Value'].replace('$', '').replace(',', ''))
-        total_selling_costs = final_home_value * ((brokerage_cost + registration_cost) / 100)
-        net_sale_proceeds = final_home_value - total_selling_costs
-        
-        # Pure home growth (appreciation only)
-        home_sale_gains = final_home_value - initial_home_value
-        
-        # Net gains after selling costs (for capital gains tax calculation)
-        net_home_gains_after_costs = net_sale_proceeds - initial_home_value
-        
-        # Calculate capital gains tax benefit (tax saved on home growth)
-        # Use long-term capital gains tax rate, not ordinary income tax rate
-        home_capital_gains_rate = capital_gains_tax_rate if capital_gains_tax_rate > 0 else 20.0  # Default 20% if not set
-        if capital_gains_exemption_enabled and home_sale_gains > 0:
-            # Tax benefit = long_term_capital_gains_rate * growth_value (pure appreciation)
-            capital_gains_tax_savings = home_sale_gains * (home_capital_gains_rate / 100)
-        else:
-            capital_gains_tax_savings = 0
-        
-        # Conditional stock calculations
-        if stocks_enabled:
-            # Get final values from last year data
-            final_down_payment_value = float(rent_data[-1]['Down Payment Investment'].replace('$', '').replace(',', ''))
-            final_emi_rent_diff_investment = float(rent_data[-1]['EMI-Rent Diff Investment'].replace('$', '').replace(',', ''))
-            
-            # Calculate gains using empirical formula
-            # Gains from renting = down_payment_value_gain + EMI_rent_investments_value_gain
-            
-            # Down payment gains (only if growth enabled)
-            if include_down_payment_growth:
-                down_payment_value_gain = final_down_payment_value - down_payment
-            else:
-                down_payment_value_gain = 0  # No growth, no gains
-            
-            # EMI-rent difference investment gains
-            total_emi_rent_diff_invested = sum([
-                max(0, monthly_payment * 12 - float(row['Annual Rent'].replace('$', '').replace(',', '')))
-                for row in rent_data
-            ])
-            emi_rent_investments_value_gain = final_emi_rent_diff_investment - total_emi_rent_diff_invested
-            
-            # Total stock investment gains = down_payment_value_gain + EMI_rent_investments_value_gain
-            stock_investment_gains = down_payment_value_gain + emi_rent_investments_value_gain
-            
-            # Calculate capital gains tax on stock gains
-            capital_gains_tax_owed = stock_investment_gains * (capital_gains_tax_rate / 100)
-        else:
-            down_payment_value_gain = 0
-            emi_rent_investments_value_gain = 0
-            stock_investment_gains = 0
-            capital_gains_tax_owed = 0
-        
-        # Calculate net cost of ownership (interest + property tax - home sale gains - interest tax savings)
-        ownership_net_cost = total_interest + total_property_tax - home_sale_gains - total_interest_tax_savings
+        years = inputs['years']
+        tax_rate = inputs['tax_rate']
+        standard_deduction = inputs['standard_deduction']
+        stocks_enabled = inputs['stocks_enabled']
+        capital_gains_exemption_enabled = inputs['capital_gains_exemption_enabled']
+        monthly_payment = mortgage_data[0]['Monthly EMI']
+        
+        # Totals for ownership
+        total_interest = summary['total_interest']
+        total_property_tax = summary['total_property_tax']
+        total_interest_tax_savings = summary['total_interest_tax_savings']
+        total_deductible_interest = sum(mortgage_data.column('Deductible Interest'))
+        total_maintenance = summary['total_maintenance']
+        total_selling_costs = summary['total_selling_costs']
+        home_sale_gains = summary['home_sale_gains']
+        home_capital_gains_rate = summary['home_capital_gains_rate']
+        capital_gains_tax_savings = summary['capital_gains_tax_savings']
+        
+        # Totals for rental + investments
+        total_rent = summary['total_rent']
+        down_payment_value_gain = summary['down_payment_investment_gain']
+        emi_rent_investments_value_gain = summary['emi_rent_diff_investment_gain']
+        stock_investment_gains = summary['stock_investment_gains']
+        capital_gains_tax_owed = summary['capital_gains_tax_owed']
+        rental_standard_deduction_benefit = summary['rental_standard_deduction_benefit']
+        
+        rent_net_cost = summary['rent_net_cost']
+        ownership_net_cost_detailed = summary['ownership_net_cost']
         
         # Calculate standard vs itemized deduction comparison
         total_itemized_deductions = total_deductible_interest  # Only mortgage interest, not property tax
@@ -591,15 +431,6 @@ class HomeRentCalculator:
             deduction_benefit = standard_deduction_total - total_itemized_deductions
             additional_tax_savings = 0
         
-        # Calculate standard deduction benefits for rental scenario
-        rental_standard_deduction_benefit = standard_deduction * years * (tax_rate / 100)
-        
-        # Calculate detailed costs for comparison
-        total_maintenance = maintenance_annual * years
-        rent_net_cost = total_rent + (capital_gains_tax_owed if stocks_enabled else 0) - (stock_investment_gains if stocks_enabled else 0) - rental_standard_deduction_benefit
-        # For ownership: costs (interest + maintenance + property tax + selling) minus savings (tax benefits + pure home appreciation)
-        ownership_net_cost_detailed = total_interest + total_maintenance + total_property_tax + total_selling_costs - (total_interest_tax_savings + capital_gains_tax_savings) - home_sale_gains
-        
         # Determine which is better
         if ownership_net_cost_detailed < rent_net_cost:
             advantage = "OWNERSHIP"
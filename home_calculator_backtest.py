@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Backtest Module
+Replays historical house, rent and stock returns over every rolling window
+"""
+
+import csv
+import math
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from home_calculator_batch import GROWTH_FIELDS, generate_complete_analysis_batch
+from home_calculator_core import FIDELITY_LEVELS
+from home_calculator_montecarlo import DEFAULT_PERCENTILES
+
+
+YEAR_COLUMN = 'year'
+
+
+def load_return_series(
+    path: str,
+    columns: Optional[Dict[str, str]] = None,
+    year_column: str = YEAR_COLUMN,
+    fractions: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Read annual return series from a CSV file
+
+    The file has one row per calendar year with a year column and any of
+    GROWTH_FIELDS as columns (yearly percentage change, e.g. 4.5 for +4.5%).
+    Series left out are not replayed and keep the scenario's constant rate;
+    empty cells are missing years.
+
+    Args:
+        path: CSV file
+        columns: Optional GROWTH_FIELDS name -> CSV column name mapping
+        year_column: Name of the calendar year column
+        fractions: Returns are fractions (0.045) instead of percentages
+
+    Returns:
+        Dictionary with 'year' (consecutive calendar years, int64) and one
+        float64 array of percentage returns per series found, NaN where missing
+    """
+    columns = {field: field for field in GROWTH_FIELDS} if columns is None else dict(columns)
+    unknown = [field for field in columns if field not in GROWTH_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown return series: {', '.join(unknown)}; expected {', '.join(GROWTH_FIELDS)}")
+
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.DictReader(handle)
+        header = [name.strip() for name in reader.fieldnames or []]
+        reader.fieldnames = header
+        if year_column not in header:
+            raise ValueError(f"{path}: missing '{year_column}' column")
+        present = {field: column for field, column in columns.items() if column in header}
+        if not present:
+            raise ValueError(f"{path}: no return columns, expected any of {', '.join(columns.values())}")
+        rows = list(reader)
+
+    def number(text: Optional[str]) -> float:
+        return float(text) if text is not None and text.strip() else math.nan
+
+    try:
+        years = np.array([int(row[year_column]) for row in rows], dtype=np.int64)
+        series = {
+            field: np.array([number(row[column]) for row in rows], dtype=np.float64)
+            for field, column in present.items()
+        }
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+
+    order = np.argsort(years, kind='stable')
+    years = years[order]
+    if years.size and not np.array_equal(years, np.arange(years[0], years[0] + years.size)):
+        raise ValueError(f"{path}: years must be consecutive without duplicates")
+    result = {'year': years}
+    for field, values in series.items():
+        result[field] = values[order] * (100 if fractions else 1)
+    return result
+
+
+def rolling_windows(
+    series: Dict[str, np.ndarray],
+    years: int,
+    start_years: Optional[Tuple[int, int]] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Every complete window of consecutive years in the return series
+
+    Windows are sliding-window views of the series, so no per-window copies
+    are made. Windows with a missing value in any series are dropped.
+
+    Args:
+        series: Return series from load_return_series
+        years: Window length
+        start_years: Optional (first, last) calendar start years to keep
+
+    Returns:
+        Tuple of (calendar start year per window, GROWTH_FIELDS name ->
+        (windows, years) array of percentage returns)
+    """
+    calendar = series['year']
+    if years < 1:
+        raise ValueError("years must be at least 1")
+    if years > calendar.size:
+        raise ValueError(f"A {years}-year window needs at least {years} years of returns, got {calendar.size}")
+
+    fields = [field for field in GROWTH_FIELDS if field in series]
+    windows = {
+        field: np.lib.stride_tricks.sliding_window_view(series[field], years) for field in fields
+    }
+    starts = calendar[:calendar.size - years + 1]
+    keep = np.ones(starts.size, dtype=bool)
+    for values in windows.values():
+        keep &= ~np.isnan(values).any(axis=1)
+    if start_years is not None:
+        keep &= (starts >= start_years[0]) & (starts <= start_years[1])
+    if keep.all():
+        return starts, windows
+    return starts[keep], {field: values[keep] for field, values in windows.items()}
+
+
+def _window_growth(series: np.ndarray, years: int) -> np.ndarray:
+    """Total growth (percent) over every window, from one running sum of log returns"""
+    log_growth = np.concatenate([[0.0], np.cumsum(np.log1p(series / 100))])
+    return np.expm1(log_growth[years:] - log_growth[:-years]) * 100
+
+
+def backtest(
+    inputs: Dict[str, Any],
+    series: Dict[str, np.ndarray],
+    years: Optional[int] = None,
+    start_years: Optional[Tuple[int, int]] = None,
+    fidelity: str = 'annual',
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> Dict[str, Any]:
+    """
+    Evaluate one scenario over every historical window of its horizon
+
+    Each window replaces the constant growth inputs with the realized yearly
+    returns of years start..start + years - 1. All windows are evaluated in
+    a single summary-only batch call. The windows are sliding-window views
+    passed as growth paths, so the yearly recurrence runs once for all of
+    them.
+
+    Args:
+        inputs: Dictionary containing all input parameters
+        series: Return series from load_return_series
+        years: Window length, defaults to inputs['years']
+        start_years: Optional (first, last) calendar start years to keep
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+        percentiles: Percentiles to report for the net cost gap
+
+    Returns:
+        Dictionary with 'years', 'windows', per-window arrays ('start_year',
+        'winner', 'ownership_net_cost', 'rent_net_cost', 'net_cost_difference'
+        (ownership minus rent) and 'cumulative_growth', the total growth of
+        each replayed series over the window), 'winner_counts',
+        'probability_ownership_wins', 'net_cost_difference_percentiles',
+        'mean_net_cost_difference', and the 'best_start_year'/'worst_start_year'
+        for owning
+    """
+    if fidelity not in FIDELITY_LEVELS:
+        raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+    years = int(inputs['years'] if years is None else years)
+    starts, growth_paths = rolling_windows(series, years, start_years)
+    if starts.size == 0:
+        raise ValueError("No complete windows in the requested start years")
+
+    # Window totals from one running sum per series; windows with gaps are dropped as above
+    offsets = starts - series['year'][0]
+    cumulative_growth = {
+        field: _window_growth(np.nan_to_num(series[field]), years)[offsets] for field in growth_paths
+    }
+
+    inputs_batch = dict(inputs, years=np.full(starts.size, years))
+    _, _, summary = generate_complete_analysis_batch(
+        inputs_batch, include_yearly=False, growth_paths=growth_paths, fidelity=fidelity
+    )
+    difference = summary['ownership_net_cost'] - summary['rent_net_cost']
+    winners, counts = np.unique(summary['winner'], return_counts=True)
+
+    return {
+        'years': years,
+        'windows': int(starts.size),
+        'start_year': starts,
+        'winner': summary['winner'],
+        'ownership_net_cost': summary['ownership_net_cost'],
+        'rent_net_cost': summary['rent_net_cost'],
+        'net_cost_difference': difference,
+        'cumulative_growth': cumulative_growth,
+        'winner_counts': dict(zip(winners.tolist(), counts.tolist())),
+        'probability_ownership_wins': float(np.mean(difference < 0)),
+        'net_cost_difference_percentiles': dict(zip(percentiles, np.percentile(difference, percentiles).tolist())),
+        'mean_net_cost_difference': float(difference.mean()),
+        'best_start_year': int(starts[np.argmin(difference)]),
+        'worst_start_year': int(starts[np.argmax(difference)])
+    }
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Batch Module
+Vectorized NumPy engine that evaluates many input sets at once
+"""
+
+import time
+from array import array
+from typing import Dict, Tuple, Any, Optional, Sequence
+
+import numpy as np
+
+from home_calculator_core import (
+    BOOLEAN_INPUTS, DAYS_IN_MONTH, DEDUCTIBLE_PRINCIPAL_LIMIT, FIDELITY_LEVELS, MORTGAGE_COLUMNS,
+    OPTIONAL_INPUT_DEFAULTS, RENT_COLUMNS, REQUIRED_INPUTS, STOCK_COLUMNS, HomeCalculatorCore, YearlyTable
+)
+
+
+# Growth inputs that may be given as per-year paths instead of constants
+GROWTH_FIELDS = ('house_growth', 'rent_growth', 'stock_growth')
+
+
+def inputs_to_batch(inputs_list: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of scalar inputs dicts into a struct-of-arrays batch
+
+    Args:
+        inputs_list: Sequence of inputs dictionaries as used by generate_complete_analysis
+
+    Returns:
+        Dictionary mapping each field to an array with one entry per scenario
+    """
+    batch = {}
+    for field in REQUIRED_INPUTS:
+        batch[field] = np.array([inputs[field] for inputs in inputs_list])
+    for field, default in OPTIONAL_INPUT_DEFAULTS.items():
+        batch[field] = np.array([inputs.get(field, default) for inputs in inputs_list])
+    return normalize_batch(batch)
+
+
+def normalize_batch(inputs_batch: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Broadcast a struct-of-arrays batch to a common length and fill in defaults
+
+    Scalars are broadcast across the batch, so a base scenario can be combined
+    with one or more varying fields without repeating the constant ones.
+
+    Args:
+        inputs_batch: Dictionary mapping input fields to scalars or 1-D arrays
+
+    Returns:
+        Dictionary of 1-D arrays of equal length (float64, int64 for years, bool for flags)
+    """
+    missing = [field for field in REQUIRED_INPUTS if field not in inputs_batch]
+    if missing:
+        raise KeyError(f"Missing required batch fields: {', '.join(missing)}")
+
+    fields = list(REQUIRED_INPUTS) + list(OPTIONAL_INPUT_DEFAULTS)
+    raw = [np.asarray(inputs_batch.get(field, OPTIONAL_INPUT_DEFAULTS.get(field))) for field in fields]
+    if any(arr.ndim > 1 for arr in raw):
+        raise ValueError("Batch fields must be scalars or 1-D arrays")
+
+    # Convert before broadcasting so scalars stay zero-stride views of one value
+    converted = []
+    for field, arr in zip(fields, raw):
+        if field == 'years':
+            converted.append(np.atleast_1d(arr).astype(np.int64, copy=False))
+        elif field in BOOLEAN_INPUTS:
+            converted.append(np.atleast_1d(arr).astype(bool, copy=False))
+        else:
+            converted.append(np.atleast_1d(arr).astype(np.float64, copy=False))
+    batch = dict(zip(fields, np.broadcast_arrays(*converted)))
+
+    if np.any(batch['years'] < 1):
+        raise ValueError("All scenarios must analyze at least 1 year")
+    return batch
+
+
+def batch_size(inputs_batch: Dict[str, np.ndarray]) -> int:
+    """Number of scenarios in a normalized batch"""
+    return len(inputs_batch['years'])
+
+
+def subset_batch(inputs_batch: Dict[str, np.ndarray], index: Any) -> Dict[str, np.ndarray]:
+    """Select the scenarios at index (integer array, mask or slice) from a normalized batch"""
+    return {field: values[index] for field, values in inputs_batch.items()}
+
+
+def calculate_mortgage_payment_batch(principal: np.ndarray, annual_rate: np.ndarray, years: int = 30) -> np.ndarray:
+    """
+    Vectorized equivalent of HomeCalculatorCore.calculate_mortgage_payment
+
+    Args:
+        principal: Loan principal amounts
+        annual_rate: Annual interest rates (percentage)
+        years: Loan term in years (default 30)
+
+    Returns:
+        Array of monthly payment amounts
+    """
+    monthly_rate = annual_rate / 100 / 12
+    num_payments = years * 12
+
+    growth = (1 + monthly_rate)**num_payments
+    zero_rate = monthly_rate == 0
+    # Substitute a harmless denominator for zero-rate loans and overwrite them below
+    denominator = np.where(zero_rate, 1.0, growth - 1)
+    payment = principal * (monthly_rate * growth) / denominator
+    return np.where(zero_rate, principal / num_payments, payment)
+
+
+def monthly_rates_batch(apr: np.ndarray, fidelity: str) -> np.ndarray:
+    """
+    Vectorized equivalent of HomeCalculatorCore.monthly_rates
+
+    Returns:
+        (scenarios, 12) array of the interest rate charged in each month
+    """
+    # Same operation order as the scalar rates, so both round identically
+    if fidelity == 'monthly':
+        return np.repeat((apr / 100 / 12)[:, None], 12, axis=1)
+    if fidelity == 'daily':
+        return (apr / 100 / 365)[:, None] * np.array(DAYS_IN_MONTH, dtype=np.float64)[None, :]
+    raise ValueError(f"No monthly rates for fidelity '{fidelity}'")
+
+
+def year_amortizer_batch(monthly_payment: np.ndarray, apr: np.ndarray, fidelity: str):
+    """
+    Vectorized equivalent of HomeCalculatorCore._year_amortizer
+
+    For 'monthly' and 'daily' the (scenarios, 12) months axis is reduced once
+    to a yearly map closing = opening * growth - payment * weight. Scenarios
+    whose loan is paid off during the year are resolved on the months axis:
+    the balance before month j is opening * G[j-1] - payment * W[j-1], and
+    interest stops once it reaches zero. The prefix maps are folded month by
+    month exactly like HomeCalculatorCore.yearly_amortization_map. Interest
+    is payment minus principal in both paths, so it agrees to rounding of
+    the balance, not relative to itself, when it is tiny (APRs near 0).
+
+    Returns:
+        Function mapping the opening balance array to (interest, principal,
+        closing balance) arrays
+    """
+    if fidelity not in FIDELITY_LEVELS:
+        raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+
+    annual_payment = monthly_payment * 12
+    if fidelity == 'annual':
+        def amortize_annual(current_balance):
+            year_interest = current_balance * (apr / 100)
+            year_principal = annual_payment - year_interest
+            return year_interest, year_principal, np.maximum(0, current_balance - year_principal)
+        return amortize_annual
+
+    rates = monthly_rates_batch(apr, fidelity)
+    # Fold the months one at a time, as HomeCalculatorCore.yearly_amortization_map
+    # does, so every prefix map matches the scalar one to the last bit. Months
+    # lead here so each step works on contiguous rows.
+    factors = 1 + rates.T
+    month_weight = np.empty_like(factors)
+    month_weight[0] = 1.0
+    for month in range(1, 12):
+        np.multiply(month_weight[month - 1], factors[month], out=month_weight[month])
+        month_weight[month] += 1
+    month_growth = np.cumprod(factors, axis=0).T
+    month_weight = month_weight.T
+    growth = month_growth[:, -1]
+    weight = month_weight[:, -1]
+    # Balance multipliers before each month: (1, G[0], ..., G[10]) and (0, W[0], ..., W[10])
+    growth_before = np.concatenate([np.ones((len(apr), 1)), month_growth[:, :-1]], axis=1)
+    weight_before = np.concatenate([np.zeros((len(apr), 1)), month_weight[:, :-1]], axis=1)
+
+    def amortize_monthly(current_balance):
+        closing_balance = current_balance * growth - monthly_payment * weight
+        year_principal = current_balance - closing_balance
+        year_interest = annual_payment - year_principal
+
+        payoff = np.flatnonzero((closing_balance < 0) | (current_balance <= 0))
+        if payoff.size:
+            opening = current_balance[payoff, None]
+            balance_before = opening * growth_before[payoff] - monthly_payment[payoff, None] * weight_before[payoff]
+            month_interest = np.where(balance_before > 0, balance_before * rates[payoff], 0.0)
+            # A loan with nothing owed (down payment of 100% or more) accrues no interest
+            year_interest[payoff] = np.where(opening[:, 0] > 0, month_interest.sum(axis=1), 0.0)
+            year_principal[payoff] = np.maximum(0, current_balance[payoff])
+            closing_balance[payoff] = 0.0
+        return year_interest, year_principal, closing_balance
+
+    return amortize_monthly
+
+
+def _direct_amortizer(loan_amount: np.ndarray, apr: np.ndarray, fidelity: str):
+    """
+    Amortize every loan with its own yearly recurrence
+
+    Same contract as loan_amortizer_batch, except amortize must be called
+    for consecutive years starting at 0 since it advances the balances.
+    """
+    monthly_payment = calculate_mortgage_payment_batch(loan_amount, apr, 30)
+    amortize_year = year_amortizer_batch(monthly_payment, apr, fidelity)
+    current_balance = loan_amount
+
+    def amortize(col):
+        nonlocal current_balance
+        interest, principal, current_balance = amortize_year(current_balance)
+        # Closing balance plus principal, as in the shared schedules: in the
+        # payoff year this is what was actually repaid
+        opening_balance = current_balance + principal
+        positive_balance = opening_balance > 0
+        safe_balance = np.where(positive_balance, opening_balance, 1.0)
+        deductible = np.where(
+            positive_balance,
+            interest * (np.minimum(opening_balance, DEDUCTIBLE_PRINCIPAL_LIMIT) / safe_balance),
+            interest
+        )
+        return interest, principal, current_balance, deductible
+
+    return monthly_payment, amortize
+
+
+def loan_amortizer_batch(loan_amount: np.ndarray, apr: np.ndarray, fidelity: str, max_years: int):
+    """
+    Amortize every loan by scaling one shared schedule per APR
+
+    Each step of the yearly recurrence is linear in the loan amount, so each
+    distinct APR is stepped once for a loan of 1 and every loan is that
+    schedule times its amount. A sweep over home price and down payment at
+    one rate runs the yearly recurrence on a single row. The $750k deduction
+    cap becomes a clip of the loan amount against the scale at which each
+    year's opening balance reaches the limit. Negative loans (down payment
+    above 100%) are not scaled copies and get schedules of their own. When
+    most rates are distinct there is nothing to share and each loan is
+    stepped directly instead.
+
+    Returns:
+        Tuple of (monthly_payment, amortize) where amortize(col) gives the
+        (interest, principal, closing balance, deductible interest) arrays of
+        year col + 1; call it for consecutive years starting at 0
+    """
+    rates, index = np.unique(apr, return_inverse=True)
+    if 2 * len(rates) > len(apr):
+        # Mostly distinct rates leave nothing to share; step the loans directly
+        return _direct_amortizer(loan_amount, apr, fidelity)
+    index = index.reshape(-1)
+    negative = np.flatnonzero(loan_amount < 0)
+    principal_amount = np.concatenate([np.ones(len(rates)), loan_amount[negative]])
+    schedule_apr = np.concatenate([rates, apr[negative]])
+    index[negative] = len(rates) + np.arange(len(negative))
+    scale = loan_amount.copy()
+    scale[negative] = 1.0
+
+    schedule_payment = calculate_mortgage_payment_batch(principal_amount, schedule_apr, 30)
+    amortize_year = year_amortizer_batch(schedule_payment, schedule_apr, fidelity)
+    # Rows are years so each year's schedule values are contiguous
+    interest = np.empty((max_years, len(principal_amount)))
+    principal = np.empty_like(interest)
+    balance = np.empty_like(interest)
+    current_balance = principal_amount
+    for col in range(max_years):
+        interest[col], principal[col], current_balance = amortize_year(current_balance)
+        balance[col] = current_balance
+    opening_balance = balance + principal
+    positive_balance = opening_balance > 0
+    scale_limit = np.where(
+        positive_balance, DEDUCTIBLE_PRINCIPAL_LIMIT / np.where(positive_balance, opening_balance, 1.0), np.inf
+    )
+
+    if len(principal_amount) == 1:
+        # One shared schedule: broadcast its scalars instead of gathering
+        def take(values):
+            return values[0]
+    else:
+        def take(values):
+            return values[index]
+
+    def amortize(col):
+        unit_interest = take(interest[col])
+        return (
+            scale * unit_interest,
+            scale * take(principal[col]),
+            scale * take(balance[col]),
+            unit_interest * np.minimum(scale, take(scale_limit[col]))
+        )
+
+    return scale * take(schedule_payment), amortize
+
+
+def generate_complete_analysis_batch(
+    inputs_batch: Dict[str, Any],
+    include_yearly: bool = True,
+    growth_paths: Optional[Dict[str, np.ndarray]] = None,
+    fidelity: str = 'annual'
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Generate complete financial analysis for a whole batch of scenarios
+
+    Runs the same yearly recurrences as HomeCalculatorCore.generate_mortgage_data
+    and generate_rent_data, but each step advances every scenario at once.
+    Scenarios with shorter horizons are masked out once their final year has
+    passed, so their totals and final values stop at their own `years`.
+    Results match the scalar path to within 1e-10 of the home price.
+
+    Args:
+        inputs_batch: Struct-of-arrays with the same fields as DEFAULT_VALUES
+        include_yearly: Whether to materialize the per-year columns
+        growth_paths: Optional per-year growth rates (percentage) for any of
+            GROWTH_FIELDS, broadcastable to (scenarios, max_years). Column k
+            is the rate applied in year k+1 and replaces the constant input.
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+    Returns:
+        Tuple of (mortgage_columns, rent_columns, summary_metrics). The column
+        dicts map each table column to a (scenarios, max_years) array padded
+        with NaN past each scenario's horizon (empty when include_yearly is
+        False). Summary metrics map each summary key to a per-scenario array.
+    """
+    metrics = HomeCalculatorCore.analysis_metrics
+    started = time.perf_counter() if metrics is not None else 0.0
+    batch = normalize_batch(inputs_batch)
+    n = batch_size(batch)
+    years = batch['years']
+    max_years = int(years.max())
+
+    home_price = batch['home_price']
+    apr = batch['apr']
+    house_growth = batch['house_growth']
+    property_tax_growth = batch['property_tax_growth']
+    property_tax_rate = batch['property_tax_rate']
+    tax_rate = batch['tax_rate']
+    rent_growth = batch['rent_growth']
+    stock_growth = batch['stock_growth']
+    stocks_enabled = batch['stocks_enabled']
+    include_down_payment_growth = batch['include_down_payment_growth']
+
+    down_payment = home_price * (batch['down_payment_pct'] / 100)
+    loan_amount = home_price - down_payment
+    monthly_payment, amortize_year = loan_amortizer_batch(loan_amount, apr, fidelity, max_years)
+
+    # Summary recomputes the payment from home_price * (1 - pct), keep that rounding
+    summary_monthly_payment = calculate_mortgage_payment_batch(
+        home_price * (1 - batch['down_payment_pct'] / 100), apr, 30
+    )
+
+    mortgage_columns = {}
+    rent_columns = {}
+    if include_yearly:
+        year_grid = np.broadcast_to(np.arange(1, max_years + 1, dtype=np.float64), (n, max_years))
+        padding = np.arange(1, max_years + 1)[None, :] > years[:, None]
+        mortgage_columns = {col: np.full((n, max_years), np.nan) for col in MORTGAGE_COLUMNS}
+        rent_columns = {col: np.full((n, max_years), np.nan) for col in RENT_COLUMNS + STOCK_COLUMNS}
+        mortgage_columns['Year'] = np.where(padding, np.nan, year_grid)
+        rent_columns['Year'] = mortgage_columns['Year'].copy()
+
+    # Running state, frozen per scenario once its horizon is reached
+    current_home_value = home_price.copy()
+    current_property_tax_base = home_price.copy()
+    current_rent = batch['monthly_rent'].copy()
+    cumulative_emi_rent_diff_investment = np.zeros(n)
+    down_payment_value = np.where(stocks_enabled, down_payment, 0.0)
+
+    total_rent = np.zeros(n)
+    total_interest = np.zeros(n)
+    total_property_tax = np.zeros(n)
+    total_interest_tax_savings = np.zeros(n)
+    total_emi_rent_diff_invested = np.zeros(n)
+
+    house_factor = 1 + house_growth / 100
+    property_tax_factor = 1 + property_tax_growth / 100
+    rent_factor = 1 + rent_growth / 100
+    stock_factor = 1 + stock_growth / 100
+
+    paths = {}
+    for field, path in (growth_paths or {}).items():
+        if field not in GROWTH_FIELDS:
+            raise KeyError(f"Unknown growth path '{field}', expected one of {', '.join(GROWTH_FIELDS)}")
+        paths[field] = np.broadcast_to(np.asarray(path, dtype=np.float64), (n, max_years))
+    # With a stock path the down payment compounds year by year instead of stock_factor ** year
+    stock_compound = np.ones(n)
+
+    for year in range(1, max_years + 1):
+        active = year <= years
+        col = year - 1
+
+        if 'house_growth' in paths:
+            house_factor = 1 + paths['house_growth'][:, col] / 100
+        if 'rent_growth' in paths:
+            rent_factor = 1 + paths['rent_growth'][:, col] / 100
+        if 'stock_growth' in paths:
+            stock_factor = 1 + paths['stock_growth'][:, col] / 100
+            stock_compound = stock_compound * stock_factor
+        else:
+            stock_compound = stock_factor ** year
+
+        # Mortgage step
+        year_interest, year_principal, next_balance, deductible_interest = amortize_year(col)
+        next_home_value = current_home_value * house_factor
+        next_property_tax_base = current_property_tax_base * property_tax_factor
+        annual_property_tax = next_property_tax_base * (property_tax_rate / 100)
+
+        interest_tax_savings = deductible_interest * (tax_rate / 100)
+
+        # Rent step
+        annual_rent = current_rent * 12
+        monthly_emi_rent_diff = monthly_payment - current_rent
+        annual_emi_rent_diff = monthly_emi_rent_diff * 12
+        annual_emi_rent_diff_positive = np.maximum(0, monthly_emi_rent_diff) * 12
+
+        next_down_payment_value = np.where(
+            include_down_payment_growth, down_payment * stock_compound, down_payment
+        )
+        if year == 1:
+            next_investment = annual_emi_rent_diff_positive
+        else:
+            next_investment = cumulative_emi_rent_diff_investment * stock_factor + annual_emi_rent_diff_positive
+
+        # Accumulate totals only for scenarios still inside their horizon
+        total_interest = np.where(active, total_interest + year_interest, total_interest)
+        total_property_tax = np.where(active, total_property_tax + annual_property_tax, total_property_tax)
+        total_interest_tax_savings = np.where(active, total_interest_tax_savings + interest_tax_savings, total_interest_tax_savings)
+        total_rent = np.where(active, total_rent + annual_rent, total_rent)
+        total_emi_rent_diff_invested = np.where(
+            active, total_emi_rent_diff_invested + np.maximum(0, summary_monthly_payment * 12 - annual_rent), total_emi_rent_diff_invested
+        )
+
+        if include_yearly:
+            stock_active = active & stocks_enabled
+            mortgage_columns['Monthly EMI'][:, col] = np.where(active, monthly_payment, np.nan)
+            mortgage_columns['Principal Paid'][:, col] = np.where(active, year_principal, np.nan)
+            mortgage_columns['Interest Paid'][:, col] = np.where(active, year_interest, np.nan)
+            mortgage_columns['Deductible Interest'][:, col] = np.where(active, deductible_interest, np.nan)
+            mortgage_columns['Interest Tax Savings'][:, col] = np.where(active, interest_tax_savings, np.nan)
+            mortgage_columns['Total P&I'][:, col] = np.where(active, year_principal + year_interest, np.nan)
+            mortgage_columns['Property Tax'][:, col] = np.where(active, annual_property_tax, np.nan)
+            mortgage_columns['Remaining Balance'][:, col] = np.where(active, next_balance, np.nan)
+            mortgage_columns['Home Value'][:, col] = np.where(active, next_home_value, np.nan)
+            rent_columns['Monthly Rent'][:, col] = np.where(active, current_rent, np.nan)
+            rent_columns['Annual Rent'][:, col] = np.where(active, annual_rent, np.nan)
+            rent_columns['EMI-Rent Diff'][:, col] = np.where(active, monthly_emi_rent_diff, np.nan)
+            rent_columns['Yearly Savings with EMI-Rent Diff'][:, col] = np.where(active, annual_emi_rent_diff, np.nan)
+            rent_columns['Down Payment Investment'][:, col] = np.where(stock_active, next_down_payment_value, np.nan)
+            rent_columns['EMI-Rent Diff Investment'][:, col] = np.where(stock_active, next_investment, np.nan)
+            rent_columns['Total Stock Value'][:, col] = np.where(
+                stock_active, next_down_payment_value + next_investment, np.nan
+            )
+
+        current_home_value = np.where(active, next_home_value, current_home_value)
+        current_property_tax_base = np.where(active, next_property_tax_base, current_property_tax_base)
+        down_payment_value = np.where(active & stocks_enabled, next_down_payment_value, down_payment_value)
+        cumulative_emi_rent_diff_investment = np.where(active, next_investment, cumulative_emi_rent_diff_investment)
+        current_rent = np.where(active, current_rent * rent_factor, current_rent)
+
+    final_emi_rent_diff_investment = np.where(stocks_enabled, cumulative_emi_rent_diff_investment, 0.0)
+    summary = calculate_summary_metrics_batch(
+        batch,
+        total_rent=total_rent,
+        total_interest=total_interest,
+        total_property_tax=total_property_tax,
+        total_interest_tax_savings=total_interest_tax_savings,
+        final_home_value=current_home_value,
+        final_down_payment_value=down_payment_value,
+        final_emi_rent_diff_investment=final_emi_rent_diff_investment,
+        total_emi_rent_diff_invested=total_emi_rent_diff_invested
+    )
+    if metrics is not None:
+        # Both tables get one row per scenario-year
+        rows = 2 * int(years.sum()) if include_yearly else 0
+        metrics.record_stage('batch', time.perf_counter() - started, rows)
+        horizons, counts = np.unique(years, return_counts=True)
+        metrics.record_scenarios('batch', dict(zip(horizons.tolist(), counts.tolist())))
+    return mortgage_columns, rent_columns, summary
+
+
+def calculate_summary_metrics_batch(
+    batch: Dict[str, np.ndarray],
+    total_rent: np.ndarray,
+    total_interest: np.ndarray,
+    total_property_tax: np.ndarray,
+    total_interest_tax_savings: np.ndarray,
+    final_home_value: np.ndarray,
+    final_down_payment_value: np.ndarray,
+    final_emi_rent_diff_investment: np.ndarray,
+    total_emi_rent_diff_invested: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of HomeCalculatorCore.calculate_summary_metrics
+
+    Takes the totals and final values the scalar version extracts from the
+    yearly tables, so any engine that produces them can share this step.
+
+    Args:
+        batch: Normalized struct-of-arrays inputs
+        total_rent: Sum of annual rent over each horizon
+        total_interest: Sum of interest paid over each horizon
+        total_property_tax: Sum of property tax over each horizon
+        total_interest_tax_savings: Sum of interest tax savings over each horizon
+        final_home_value: Home value in the final year
+        final_down_payment_value: Down payment investment value in the final year
+        final_emi_rent_diff_investment: EMI-rent difference investment value in the final year
+        total_emi_rent_diff_invested: Sum of max(0, annual EMI - annual rent) contributions
+
+    Returns:
+        Dictionary containing all summary metrics as per-scenario arrays
+    """
+    home_price = batch['home_price']
+    years = batch['years']
+    stocks_enabled = batch['stocks_enabled']
+    capital_gains_tax_rate = batch['capital_gains_tax_rate']
+
+    initial_home_value = home_price
+    home_sale_gains = final_home_value - initial_home_value
+
+    brokerage_costs = final_home_value * (batch['brokerage_cost'] / 100)
+    registration_costs = initial_home_value * (batch['registration_cost'] / 100)
+    total_selling_costs = brokerage_costs + registration_costs
+
+    home_capital_gains_rate = np.where(capital_gains_tax_rate > 0, capital_gains_tax_rate, 20.0)
+    capital_gains_tax_savings = np.where(
+        batch['capital_gains_exemption_enabled'] & (home_sale_gains > 0),
+        home_sale_gains * (home_capital_gains_rate / 100),
+        0.0
+    )
+
+    down_payment_value_gain = np.where(
+        stocks_enabled & batch['include_down_payment_growth'],
+        final_down_payment_value - home_price * (batch['down_payment_pct'] / 100),
+        0.0
+    )
+    emi_rent_investments_value_gain = np.where(
+        stocks_enabled, final_emi_rent_diff_investment - total_emi_rent_diff_invested, 0.0
+    )
+    stock_investment_gains = np.where(
+        stocks_enabled, down_payment_value_gain + emi_rent_investments_value_gain, 0.0
+    )
+    capital_gains_tax_owed = np.where(
+        stocks_enabled, stock_investment_gains * (capital_gains_tax_rate / 100), 0.0
+    )
+
+    total_maintenance = batch['maintenance_annual'] * years
+    rental_standard_deduction_benefit = batch['standard_deduction'] * years * (batch['tax_rate'] / 100)
+
+    rent_net_cost = total_rent + capital_gains_tax_owed - stock_investment_gains - rental_standard_deduction_benefit
+    ownership_net_cost = total_interest + total_maintenance + total_property_tax + total_selling_costs - (total_interest_tax_savings + capital_gains_tax_savings) - home_sale_gains
+
+    return {
+        'total_rent': total_rent,
+        'total_interest': total_interest,
+        'total_property_tax': total_property_tax,
+        'total_maintenance': total_maintenance,
+        'total_selling_costs': total_selling_costs,
+        'brokerage_costs': brokerage_costs,
+        'registration_costs': registration_costs,
+        'home_sale_gains': home_sale_gains,
+        'total_interest_tax_savings': total_interest_tax_savings,
+        'capital_gains_tax_savings': capital_gains_tax_savings,
+        'home_capital_gains_rate': home_capital_gains_rate,
+        'stock_investment_gains': stock_investment_gains,
+        'down_payment_investment_gain': down_payment_value_gain,
+        'emi_rent_diff_investment_gain': emi_rent_investments_value_gain,
+        'capital_gains_tax_owed': capital_gains_tax_owed,
+        'rental_standard_deduction_benefit': rental_standard_deduction_benefit,
+        'rent_net_cost': rent_net_cost,
+        'ownership_net_cost': ownership_net_cost,
+        'winner': np.where(ownership_net_cost < rent_net_cost, 'HOME OWNERSHIP', 'RENTING'),
+        'savings': np.abs(ownership_net_cost - rent_net_cost)
+    }
+
+
+def summary_row(summary: Dict[str, np.ndarray], index: int) -> Dict[str, Any]:
+    """
+    Extract one scenario's summary from batch output as a scalar-path style dict
+
+    Args:
+        summary: Summary metrics returned by generate_complete_analysis_batch
+        index: Scenario index within the batch
+
+    Returns:
+        Dictionary with the same keys and Python scalar types as calculate_summary_metrics
+    """
+    return {key: values[index].item() for key, values in summary.items()}
+
+
+def yearly_table(columns: Dict[str, np.ndarray], index: int) -> YearlyTable:
+    """
+    Extract one scenario's yearly table from batch columns
+
+    Args:
+        columns: Mortgage or rent columns returned by generate_complete_analysis_batch
+        index: Scenario index within the batch
+
+    Returns:
+        YearlyTable matching the scalar table layout (stock columns are
+        dropped for scenarios with stocks disabled)
+    """
+    years = columns['Year'][index]
+    horizon = int(np.count_nonzero(~np.isnan(years)))
+    table_columns = {}
+    for key, values in columns.items():
+        row_values = values[index, :horizon]
+        if np.isnan(row_values).any():
+            continue
+        if key == 'Year':
+            table_columns[key] = array('l', row_values.astype(np.int64).tolist())
+        else:
+            table_columns[key] = array('d', row_values.tolist())
+    return YearlyTable(table_columns)
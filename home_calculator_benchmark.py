@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Benchmark Module
+Times the core engine across horizons, stock settings and batch sizes and compares against a baseline,
+and checks cold-start import times against per-module budgets
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from home_calculator_core import DEFAULT_VALUES, HomeCalculatorCore
+
+
+BENCHMARK_HORIZONS = (1, 5, 30, 50)
+BENCHMARK_BATCH_SIZES = (1, 100, 10000)
+BATCH_HORIZON = 30
+
+DEFAULT_RESULTS_PATH = 'benchmark_results.json'
+DEFAULT_BASELINE_PATH = 'benchmark_baseline.json'
+
+# Allowed fractional drop in ops/sec and growth in peak memory before a case fails
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+# Peak memory changes smaller than this are never reported
+MEMORY_NOISE_KIB = 4.0
+
+# Cold-start budgets checked with `python -X importtime`: the module's
+# cumulative import time in milliseconds, the third-party packages it may load
+# (None: any) and packages it must leave to the code paths that need them
+IMPORT_BUDGETS = {
+    'home_calculator_core': {'max_ms': 10.0, 'third_party': ()},
+    'home_calculator_store': {'max_ms': 25.0, 'third_party': ()},
+    'home_calculator_benchmark': {'max_ms': 25.0, 'third_party': ()},
+    'run': {'max_ms': 25.0, 'third_party': ()},
+    'home_calculator_batch': {'max_ms': 250.0, 'third_party': ('numpy',)},
+    'home_calculator_stream': {'max_ms': 300.0, 'third_party': ('numpy',)},
+    'streamlit_app': {'max_ms': 1500.0, 'third_party': None, 'forbidden': ('pandas', 'numpy', 'pyarrow', 'altair')}
+}
+DEFAULT_IMPORT_REPEAT = 5
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _inputs(years: int, stocks_enabled: bool) -> Dict[str, Any]:
+    """Default scenario with the given horizon and stock setting"""
+    return dict(DEFAULT_VALUES, years=years, stocks_enabled=stocks_enabled)
+
+
+def _stocks_label(stocks_enabled: bool) -> str:
+    """Case name fragment for the stock setting"""
+    return 'on' if stocks_enabled else 'off'
+
+
+def benchmark_cases() -> List[Tuple[str, Callable[[], Any], int]]:
+    """
+    Build every benchmark case
+
+    Returns:
+        List of (case name, zero-argument callable, scenarios per call). Names
+        look like 'generate_rent_data[years=30,stocks=on]' and are the keys
+        compared against the baseline.
+    """
+    # NumPy is only needed for the batch cases, keep importing this module cheap
+    import numpy as np
+    from home_calculator_batch import generate_complete_analysis_batch, inputs_to_batch
+    
+    core = HomeCalculatorCore
+    cases = []
+
+    loan = DEFAULT_VALUES['home_price'] * (1 - DEFAULT_VALUES['down_payment_pct'] / 100)
+    cases.append(('calculate_mortgage_payment', lambda: core.calculate_mortgage_payment(loan, DEFAULT_VALUES['apr']), 1))
+
+    for years in BENCHMARK_HORIZONS:
+        inputs = _inputs(years, True)
+        cases.append((f'generate_mortgage_data[years={years}]', lambda inputs=inputs: core.generate_mortgage_data(
+            inputs['home_price'], inputs['down_payment_pct'], inputs['apr'], inputs['property_tax_rate'],
+            inputs['property_tax_growth'], inputs['house_growth'], inputs['tax_rate'], inputs['years']
+        ), 1))
+
+    for years in BENCHMARK_HORIZONS:
+        for stocks_enabled in (False, True):
+            inputs = _inputs(years, stocks_enabled)
+            label = f'years={years},stocks={_stocks_label(stocks_enabled)}'
+            down_payment = inputs['home_price'] * inputs['down_payment_pct'] / 100
+            payment = core.calculate_mortgage_payment(inputs['home_price'] - down_payment, inputs['apr'])
+            mortgage_data, rent_data, _ = core.generate_complete_analysis(inputs)
+
+            cases.append((f'generate_rent_data[{label}]', lambda inputs=inputs, payment=payment, down_payment=down_payment: core.generate_rent_data(
+                inputs['monthly_rent'], inputs['rent_growth'], payment, down_payment, inputs['stock_growth'],
+                inputs['years'], inputs['stocks_enabled'], inputs['include_down_payment_growth']
+            ), 1))
+            cases.append((f'calculate_summary_metrics[{label}]', lambda inputs=inputs, tables=(mortgage_data, rent_data): core.calculate_summary_metrics(
+                tables[0], tables[1], inputs
+            ), 1))
+            cases.append((f'generate_complete_analysis[{label}]', lambda inputs=inputs: core.generate_complete_analysis(inputs), 1))
+            cases.append((f'generate_complete_analysis_summary_only[{label}]', lambda inputs=inputs: core.generate_complete_analysis(
+                inputs, summary_only=True
+            ), 1))
+
+    for size in BENCHMARK_BATCH_SIZES:
+        for stocks_enabled in (False, True):
+            batch = inputs_to_batch([_inputs(BATCH_HORIZON, stocks_enabled)] * size)
+            # Vary the price so no two scenarios are identical
+            batch['home_price'] = batch['home_price'] * np.linspace(0.5, 1.5, size)
+            for include_yearly in (False, True):
+                label = f'batch={size},years={BATCH_HORIZON},stocks={_stocks_label(stocks_enabled)},yearly={include_yearly}'
+                cases.append((f'generate_complete_analysis_batch[{label}]', lambda batch=batch, include_yearly=include_yearly: generate_complete_analysis_batch(
+                    batch, include_yearly=include_yearly
+                ), size))
+    return cases
+
+
+def _calibrate(function: Callable[[], Any], min_time: float) -> int:
+    """Calls per timing repeat so that one repeat takes about min_time (as timeit.autorange)"""
+    number = 1
+    while True:
+        elapsed = _time_calls(function, number) * number
+        if elapsed >= min_time / 4:
+            return max(1, int(number * min_time / elapsed))
+        number *= 4
+
+
+def _time_calls(function: Callable[[], Any], number: int) -> float:
+    """Seconds per call over `number` back-to-back calls, with garbage collection paused"""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        return (time.perf_counter() - started) / number
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _memory_case(function: Callable[[], Any]) -> Dict[str, float]:
+    """Peak traced memory during one call, and the blocks/bytes its result keeps alive"""
+    import tracemalloc
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = function()
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return {
+        'peak_kib': (peak_bytes - start_bytes) / 1024,
+        'retained_kib': (current_bytes - start_bytes) / 1024,
+        'retained_blocks': retained_blocks
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Interpreter and machine details stored with every run"""
+    import platform
+    import numpy as np
+    
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_benchmarks(
+    min_time: float = 0.05,
+    repeat: int = 7,
+    match: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, float]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmark cases
+
+    Timing follows timeit: each case is called enough times per repeat to
+    take min_time, garbage collection is paused while timing, and the best
+    repeat gives ops_per_sec (the median repeat is recorded as well). The
+    repeats run round-robin over all cases, so a burst of load from another
+    process slows one repeat of many cases rather than every repeat of one.
+    Memory is measured separately with tracemalloc on one call. The analysis
+    cache is disabled for the run.
+
+    Args:
+        min_time: Seconds per timing repeat
+        repeat: Timing repeats per case
+        match: Only run cases whose name contains this substring
+        progress: Called with (case name, measurements) after each case
+
+    Returns:
+        Dictionary with 'environment', 'settings' and 'results' (case name ->
+        ops_per_sec, ops_per_sec_median, scenarios_per_sec, peak_kib,
+        retained_kib and retained_blocks)
+    """
+    import statistics
+    
+    cache = HomeCalculatorCore.analysis_cache
+    HomeCalculatorCore.disable_cache()
+    results = {}
+    try:
+        cases = [(name, function, scenarios) for name, function, scenarios in benchmark_cases() if not match or match in name]
+        numbers = {name: _calibrate(function, min_time) for name, function, _ in cases}
+        timings = {name: [] for name, _, _ in cases}
+        for _ in range(repeat):
+            for name, function, _ in cases:
+                timings[name].append(_time_calls(function, numbers[name]))
+
+        for name, function, scenarios in cases:
+            best, median = min(timings[name]), statistics.median(timings[name])
+            measurements = {
+                'ops_per_sec': 1 / best,
+                'ops_per_sec_median': 1 / median,
+                'scenarios_per_sec': scenarios / best,
+                **_memory_case(function)
+            }
+            results[name] = measurements
+            if progress is not None:
+                progress(name, measurements)
+    finally:
+        HomeCalculatorCore.analysis_cache = cache
+    return {
+        'environment': environment(),
+        'settings': {'min_time': min_time, 'repeat': repeat, 'match': match},
+        'results': results
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """
+    Compare a run against a baseline run
+
+    Args:
+        current: Output of run_benchmarks
+        baseline: Earlier output of run_benchmarks
+        tolerance: Allowed fractional drop in ops/sec
+        memory_tolerance: Allowed fractional growth in peak memory
+
+    Returns:
+        One row per case and metric with 'case', 'metric', 'baseline',
+        'current', 'change' (fraction, positive = higher) and 'status':
+        'regressed', 'improved', 'ok', 'new' or 'missing'
+    """
+    rows = []
+    current_results = current['results']
+    baseline_results = baseline['results']
+    for name, measurements in current_results.items():
+        reference = baseline_results.get(name)
+        if reference is None:
+            rows.append({'case': name, 'metric': 'ops_per_sec', 'baseline': None,
+                         'current': measurements['ops_per_sec'], 'change': None, 'status': 'new'})
+            continue
+
+        change = measurements['ops_per_sec'] / reference['ops_per_sec'] - 1
+        status = 'regressed' if change < -tolerance else 'improved' if change > tolerance else 'ok'
+        rows.append({'case': name, 'metric': 'ops_per_sec', 'baseline': reference['ops_per_sec'],
+                     'current': measurements['ops_per_sec'], 'change': change, 'status': status})
+
+        growth = measurements['peak_kib'] - reference['peak_kib']
+        change = growth / reference['peak_kib'] if reference['peak_kib'] > 0 else 0.0
+        status = 'ok'
+        if abs(growth) > MEMORY_NOISE_KIB:
+            status = 'regressed' if change > memory_tolerance else 'improved' if change < -memory_tolerance else 'ok'
+        rows.append({'case': name, 'metric': 'peak_kib', 'baseline': reference['peak_kib'],
+                     'current': measurements['peak_kib'], 'change': change, 'status': status})
+
+    for name in baseline_results:
+        match = current['settings'].get('match')
+        if name not in current_results and (not match or match in name):
+            rows.append({'case': name, 'metric': 'ops_per_sec', 'baseline': baseline_results[name]['ops_per_sec'],
+                         'current': None, 'change': None, 'status': 'missing'})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]], only_changes: bool = True) -> str:
+    """
+    Render comparison rows as an aligned text table
+
+    Args:
+        rows: Output of compare_results
+        only_changes: Leave out rows whose status is 'ok'
+
+    Returns:
+        Table text, one line per row, regressions first
+    """
+    order = {'regressed': 0, 'missing': 1, 'improved': 2, 'new': 3, 'ok': 4}
+    shown = sorted(
+        (row for row in rows if not only_changes or row['status'] != 'ok'),
+        key=lambda row: (order[row['status']], row['case'])
+    )
+    if not shown:
+        return "All cases within tolerance"
+
+    def number(value):
+        return '-' if value is None else f"{value:,.1f}"
+
+    width = max(len(row['case']) for row in shown)
+    lines = [f"{'status':<10} {'case':<{width}} {'metric':<12} {'baseline':>14} {'current':>14} {'change':>8}"]
+    for row in shown:
+        change = '-' if row['change'] is None else f"{row['change']:+.1%}"
+        lines.append(
+            f"{row['status'].upper():<10} {row['case']:<{width}} {row['metric']:<12} "
+            f"{number(row['baseline']):>14} {number(row['current']):>14} {change:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def environment_differences(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Environment fields that differ between two runs (timings are only comparable on the same setup)"""
+    return [
+        f"{key}: baseline {baseline['environment'].get(key)!r}, current {value!r}"
+        for key, value in current['environment'].items()
+        if baseline['environment'].get(key) != value
+    ]
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    """Write a run to a JSON file"""
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read a run written by save_results"""
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """(depth, self us, cumulative us, module) for every line of -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return entries
+
+
+def _is_third_party(name: str) -> bool:
+    """
+    Whether a top-level module name is a third-party package
+    
+    Private names (_sysconfigdata_*, _cython_*) and cython_runtime are
+    support modules loaded alongside stdlib or extension packages.
+    """
+    if name in sys.stdlib_module_names or name.startswith('_') or name == 'cython_runtime':
+        return False
+    return not os.path.exists(os.path.join(REPO_DIR, f'{name}.py'))
+
+
+def measure_import(module: str, repeat: int = DEFAULT_IMPORT_REPEAT) -> Dict[str, Any]:
+    """
+    Import a module in fresh interpreters under `python -X importtime`
+    
+    Args:
+        module: Module to import, resolved from the repository directory
+        repeat: Number of fresh interpreters; the fastest import is kept
+        
+    Returns:
+        Dictionary with ms (cumulative import time), third_party (sorted
+        non-stdlib top-level packages the import loaded) and slowest (the
+        five costliest modules by self time as (ms, name) pairs)
+        
+    Raises:
+        ImportError: If the module cannot be imported
+    """
+    import ast
+    import subprocess
+    
+    probe = (
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        f"import {module}\n"
+        "print(sorted(set(sys.modules) - before))"
+    )
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', probe],
+            cwd=REPO_DIR, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            message = completed.stderr.strip().splitlines()
+            raise ImportError(message[-1] if message else f"import {module} failed")
+        entries = _parse_importtime(completed.stderr)
+        position = next(i for i, entry in enumerate(entries) if entry[0] == 0 and entry[3] == module)
+        if best is None or entries[position][2] < best[0][best[1]][2]:
+            best = (entries, position, completed.stdout)
+    
+    entries, position, stdout = best
+    # A module's own imports are the deeper lines listed just before it
+    start = position
+    while start > 0 and entries[start - 1][0] > 0:
+        start -= 1
+    subtree = sorted(entries[start:position + 1], key=lambda entry: entry[1], reverse=True)
+    loaded = ast.literal_eval(stdout.strip().splitlines()[-1])
+    top_level = {name.split('.')[0] for name in loaded}
+    return {
+        'ms': entries[position][2] / 1000,
+        'third_party': sorted(name for name in top_level if _is_third_party(name)),
+        'slowest': [(self_us / 1000, name) for _, self_us, _, name in subtree[:5]]
+    }
+
+
+def check_import_budgets(
+    budgets: Optional[Dict[str, Dict[str, Any]]] = None,
+    repeat: int = DEFAULT_IMPORT_REPEAT
+) -> List[Dict[str, Any]]:
+    """
+    Measure every budgeted module and flag the ones over budget
+    
+    Args:
+        budgets: Module -> budget, in the IMPORT_BUDGETS layout (default IMPORT_BUDGETS)
+        repeat: Fresh interpreters per module
+        
+    Returns:
+        One row per module with module, max_ms, status ('ok', 'over' or
+        'skipped' when the module or its dependencies cannot be imported
+        here), problems (human readable) and the measure_import() fields
+    """
+    rows = []
+    for module, budget in (budgets or IMPORT_BUDGETS).items():
+        row = {'module': module, 'max_ms': budget['max_ms'], 'problems': []}
+        try:
+            row.update(measure_import(module, repeat))
+        except ImportError as error:
+            row.update(status='skipped', ms=None, third_party=[], slowest=[], problems=[str(error)])
+            rows.append(row)
+            continue
+        
+        if row['ms'] > budget['max_ms']:
+            row['problems'].append(f"{row['ms']:.1f} ms is over the {budget['max_ms']:.0f} ms budget")
+        allowed = budget.get('third_party')
+        if allowed is not None:
+            unexpected = [name for name in row['third_party'] if name not in allowed]
+            if unexpected:
+                row['problems'].append(f"loads third-party {', '.join(unexpected)}")
+        forbidden = [name for name in row['third_party'] if name in budget.get('forbidden', ())]
+        if forbidden:
+            row['problems'].append(f"loads {', '.join(forbidden)} up front")
+        row['status'] = 'over' if row['problems'] else 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_import_report(rows: List[Dict[str, Any]], verbose: bool = False) -> str:
+    """Plain-text table of check_import_budgets() rows"""
+    lines = [f"{'status':<8} {'module':<28} {'import ms':>10} {'budget':>8}  third-party"]
+    for row in rows:
+        measured = f"{row['ms']:.1f}" if row['ms'] is not None else '-'
+        third_party = ', '.join(row['third_party']) or '-'
+        lines.append(f"{row['status'].upper():<8} {row['module']:<28} {measured:>10} {row['max_ms']:>8.0f}  {third_party}")
+        for problem in row['problems']:
+            lines.append(f"{'':<8} -> {problem}")
+        if verbose:
+            for self_ms, name in row['slowest']:
+                lines.append(f"{'':<8}    {self_ms:8.2f} ms  {name}")
+    return '\n'.join(lines)
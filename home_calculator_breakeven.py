@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Breakeven Module
+Finds the input value where home ownership and renting cost the same
+"""
+
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from home_calculator_batch import batch_size, generate_complete_analysis_batch, normalize_batch, subset_batch
+
+
+# Search range per solvable input, matching the web app's input limits
+DEFAULT_BRACKETS = {
+    'monthly_rent': (0.0, 50000.0),
+    'home_price': (50000.0, 10000000.0),
+    'apr': (0.0, 20.0),
+    'house_growth': (-10.0, 50.0),
+    'stock_growth': (0.0, 50.0),
+    'years': (1, 50)
+}
+
+
+def _net_cost_difference(
+    batch: Dict[str, np.ndarray],
+    field: str,
+    values: np.ndarray,
+    fidelity: str
+) -> np.ndarray:
+    """ownership_net_cost - rent_net_cost with field set to values, summary only"""
+    trial = dict(batch)
+    trial[field] = values
+    _, _, summary = generate_complete_analysis_batch(trial, include_yearly=False, fidelity=fidelity)
+    return summary['ownership_net_cost'] - summary['rent_net_cost']
+
+
+def solve_breakeven(
+    inputs_batch: Dict[str, Any],
+    field: str,
+    bracket: Optional[Tuple[float, float]] = None,
+    xtol: float = 1e-6,
+    max_iterations: int = 100,
+    fidelity: str = 'annual'
+) -> Dict[str, Any]:
+    """
+    Find where ownership_net_cost == rent_net_cost by varying one input
+
+    Every scenario is solved at once: each iteration evaluates all unsolved
+    scenarios in a single summary-only batch call. Continuous inputs use the
+    Illinois variant of regula falsi, which keeps the root bracketed like
+    bisection but typically converges in 10-20 evaluations. 'years' is
+    integer, so all horizons in the bracket are evaluated in one batch and
+    the first year where the winner differs from the bracket start is
+    reported.
+
+    Args:
+        inputs_batch: Struct-of-arrays of scenarios (a single inputs dict also works)
+        field: Input to solve for, one of DEFAULT_BRACKETS
+        bracket: (low, high) search range, defaults to DEFAULT_BRACKETS[field]
+        xtol: Stop once the bracket is narrower than this (in the field's units)
+        max_iterations: Upper bound on solver iterations
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+    Returns:
+        Dictionary with 'field', 'value' (breakeven per scenario, NaN when the
+        winner does not flip inside the bracket), 'converged', 'owning_wins_above'
+        (True when owning wins for values above the breakeven), 'iterations'
+        and 'evaluations' (scenario evaluations performed)
+    """
+    if field not in DEFAULT_BRACKETS:
+        raise ValueError(f"Cannot solve for '{field}', expected one of {', '.join(DEFAULT_BRACKETS)}")
+    low, high = bracket if bracket is not None else DEFAULT_BRACKETS[field]
+    if not low < high:
+        raise ValueError("bracket must satisfy low < high")
+
+    batch = normalize_batch(inputs_batch)
+    n = batch_size(batch)
+
+    if field == 'years':
+        return _solve_years(batch, int(low), int(high), fidelity)
+
+    lo = np.full(n, float(low))
+    hi = np.full(n, float(high))
+    both = _net_cost_difference(
+        {key: np.concatenate([values, values]) for key, values in batch.items()},
+        field, np.concatenate([lo, hi]), fidelity
+    )
+    f_lo, f_hi = both[:n], both[n:]
+    evaluations = 2 * n
+
+    value = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    owning_wins_above = f_hi < 0
+
+    exact_lo = f_lo == 0
+    exact_hi = (f_hi == 0) & ~exact_lo
+    value[exact_lo] = lo[exact_lo]
+    value[exact_hi] = hi[exact_hi]
+    converged[exact_lo | exact_hi] = True
+
+    active = np.flatnonzero(~converged & (np.sign(f_lo) != np.sign(f_hi)))
+    # Which bracket end was kept last time, for the Illinois halving
+    last_side = np.zeros(n, dtype=np.int8)
+    iterations = 0
+    while active.size and iterations < max_iterations:
+        iterations += 1
+        a, b = lo[active], hi[active]
+        fa, fb = f_lo[active], f_hi[active]
+
+        x = b - fb * (b - a) / (fb - fa)
+        # Fall back to bisection if the secant step leaves the bracket
+        outside = ~((x > a) & (x < b))
+        x[outside] = (a[outside] + b[outside]) / 2
+
+        fx = _net_cost_difference(subset_batch(batch, active), field, x, fidelity)
+        evaluations += active.size
+
+        root_in_low = np.sign(fx) == np.sign(fb)
+        # Root between a and x: move b; otherwise move a. Halve the stale end's f (Illinois).
+        hi[active] = np.where(root_in_low, x, b)
+        f_hi[active] = np.where(root_in_low, fx, fb)
+        lo[active] = np.where(root_in_low, a, x)
+        f_lo[active] = np.where(root_in_low, fa, fx)
+        side = np.where(root_in_low, 1, -1).astype(np.int8)
+        repeat = side == last_side[active]
+        f_lo[active] = np.where(repeat & root_in_low, f_lo[active] / 2, f_lo[active])
+        f_hi[active] = np.where(repeat & ~root_in_low, f_hi[active] / 2, f_hi[active])
+        last_side[active] = side
+
+        done = (fx == 0) | (hi[active] - lo[active] < xtol)
+        value[active[done]] = np.where(fx[done] == 0, x[done], (lo[active[done]] + hi[active[done]]) / 2)
+        converged[active[done]] = True
+        active = active[~done]
+
+    return {
+        'field': field,
+        'value': value,
+        'converged': converged,
+        'owning_wins_above': owning_wins_above,
+        'iterations': iterations,
+        'evaluations': evaluations
+    }
+
+
+def _solve_years(batch: Dict[str, np.ndarray], low: int, high: int, fidelity: str) -> Dict[str, Any]:
+    """Integer breakeven: first horizon in [low, high] where the winner flips"""
+    n = batch_size(batch)
+    horizons = np.arange(low, high + 1)
+    count = len(horizons)
+
+    repeated = {key: np.repeat(values, count) for key, values in batch.items()}
+    difference = _net_cost_difference(repeated, 'years', np.tile(horizons, n), fidelity).reshape(n, count)
+
+    owning_wins = difference < 0
+    flipped = owning_wins != owning_wins[:, :1]
+    has_flip = flipped.any(axis=1)
+    first_flip = np.argmax(flipped, axis=1)
+
+    return {
+        'field': 'years',
+        'value': np.where(has_flip, horizons[first_flip], np.nan),
+        'converged': has_flip,
+        'owning_wins_above': owning_wins[np.arange(n), np.where(has_flip, first_flip, count - 1)],
+        'iterations': 1,
+        'evaluations': n * count
+    }
@@ -4,13 +4,775 @@ Home Calculator Core Module
 Contains all financial calculations shared between desktop and web versions
 """
 
+import bisect
 import math
-from typing import Dict, List, Tuple, Any
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import accumulate
+from typing import Dict, List, Tuple, Any, Callable, Hashable, Iterator, Optional, Sequence, Union
+
+
+# Column layout of the yearly tables
+MORTGAGE_COLUMNS = (
+    'Year', 'Monthly EMI', 'Principal Paid', 'Interest Paid', 'Deductible Interest',
+    'Interest Tax Savings', 'Total P&I', 'Property Tax', 'Remaining Balance', 'Home Value'
+)
+RENT_COLUMNS = (
+    'Year', 'Monthly Rent', 'Annual Rent', 'EMI-Rent Diff', 'Yearly Savings with EMI-Rent Diff'
+)
+STOCK_COLUMNS = (
+    'Down Payment Investment', 'EMI-Rent Diff Investment', 'Total Stock Value'
+)
+
+# Keys of the summary metrics, in calculate_summary_metrics order
+SUMMARY_COLUMNS = (
+    'total_rent', 'total_interest', 'total_property_tax', 'total_maintenance',
+    'total_selling_costs', 'brokerage_costs', 'registration_costs', 'home_sale_gains',
+    'total_interest_tax_savings', 'capital_gains_tax_savings', 'home_capital_gains_rate',
+    'stock_investment_gains', 'down_payment_investment_gain', 'emi_rent_diff_investment_gain',
+    'capital_gains_tax_owed', 'rental_standard_deduction_benefit', 'rent_net_cost',
+    'ownership_net_cost', 'winner', 'savings'
+)
+
+# Inputs the analysis reads with inputs[...] - callers must supply these
+REQUIRED_INPUTS = (
+    'years', 'home_price', 'down_payment_pct', 'apr', 'property_tax_rate',
+    'house_growth', 'brokerage_cost', 'registration_cost', 'monthly_rent',
+    'rent_growth', 'tax_rate'
+)
+
+# Inputs the analysis reads with inputs.get(...), with the defaults it falls back to
+OPTIONAL_INPUT_DEFAULTS = {
+    'property_tax_growth': 2.0,
+    'stock_growth': 8.0,
+    'stocks_enabled': False,
+    'include_down_payment_growth': True,
+    'capital_gains_tax_rate': 20.0,
+    'capital_gains_exemption_enabled': True,
+    'maintenance_annual': 0.0,
+    'standard_deduction': 0.0
+}
+
+BOOLEAN_INPUTS = ('stocks_enabled', 'include_down_payment_growth', 'capital_gains_exemption_enabled')
+
+# How mortgage interest is accrued. relative_cost is measured against 'annual'
+# for summary-only and batch evaluation (full tables cost about the same at
+# every level); interest_deviation is the change in 30-year total interest.
+FIDELITY_LEVELS = {
+    'annual': {
+        'description': 'One interest charge per year on the opening balance',
+        'relative_cost': 1.0,
+        'interest_deviation': '+4% to +6% vs monthly at 3-9% APR'
+    },
+    'monthly': {
+        'description': 'Exact monthly amortization at APR / 12, as a lender schedules it',
+        'relative_cost': 1.3,
+        'interest_deviation': 'reference'
+    },
+    'daily': {
+        'description': 'Interest accrued daily at APR / 365 over calendar months, paid monthly',
+        'relative_cost': 1.4,
+        'interest_deviation': '-0.03% to -0.15% vs monthly at 3-9% APR'
+    }
+}
+
+# Calendar month lengths for daily accrual (365-day year)
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Mortgage interest is only deductible on the first $750k of principal
+DEDUCTIBLE_PRINCIPAL_LIMIT = 750000
+
+# Unit amortization schedules cover at least this many years, and the shared
+# cache keeps this many (apr, term, fidelity) schedules
+MIN_SCHEDULE_YEARS = 50
+DEFAULT_SCHEDULE_CACHE_ENTRIES = 256
+
+# Histogram bucket upper bounds for AnalysisMetrics: stage wall time in
+# seconds (a 30-year table is ~50us, a 10k batch ~50ms) and horizon in years
+STAGE_SECONDS_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+)
+HORIZON_YEARS_BUCKETS = (1, 5, 10, 15, 20, 25, 30, 40, 50)
+
+
+def normalize_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an inputs dict to the canonical form the analysis actually depends on
+    
+    Fills in the .get() defaults, coerces numbers to float (years to int) and
+    flags to bool, and drops fields the calculations never read (income, RSUs).
+    Stock-only settings are neutralized when stocks are disabled because they
+    cannot change the result.
+    
+    Args:
+        inputs: Dictionary containing all input parameters
+        
+    Returns:
+        New dictionary with one entry per field in REQUIRED_INPUTS and OPTIONAL_INPUT_DEFAULTS
+    """
+    normalized = {}
+    for field in REQUIRED_INPUTS:
+        normalized[field] = int(inputs[field]) if field == 'years' else float(inputs[field])
+    for field, default in OPTIONAL_INPUT_DEFAULTS.items():
+        value = inputs.get(field, default)
+        normalized[field] = bool(value) if field in BOOLEAN_INPUTS else float(value)
+    
+    if not normalized['stocks_enabled']:
+        normalized['stock_growth'] = OPTIONAL_INPUT_DEFAULTS['stock_growth']
+        normalized['include_down_payment_growth'] = OPTIONAL_INPUT_DEFAULTS['include_down_payment_growth']
+    return normalized
+
+
+def inputs_cache_key(inputs: Dict[str, Any]) -> Tuple:
+    """Hashable key shared by all inputs dicts that normalize to the same scenario"""
+    return tuple(normalize_inputs(inputs).items())
+
+
+def _empty_columns(column_names: Sequence[str]) -> Dict[str, array]:
+    """Create one empty compact array per column ('Year' holds integers)"""
+    return {name: array('l') if name == 'Year' else array('d') for name in column_names}
+
+
+class YearlyRow(Mapping):
+    """Read-only dict-like view of one year in a YearlyTable"""
+    
+    __slots__ = ('_table', '_index')
+    
+    def __init__(self, table: 'YearlyTable', index: int):
+        self._table = table
+        self._index = index
+    
+    def __getitem__(self, key: str) -> Union[int, float]:
+        return self._table._columns[key][self._index]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table._columns)
+    
+    def __len__(self) -> int:
+        return len(self._table._columns)
+    
+    def __repr__(self) -> str:
+        return f"YearlyRow({dict(self)!r})"
+
+
+class YearlyTable(Sequence):
+    """
+    Columnar year-by-year table with one compact array per column
+    
+    Behaves like the list of row dicts it replaces: indexing and iteration
+    yield YearlyRow views, so row['Interest Paid'] and data[-1]['Home Value']
+    keep working. Whole columns are available without touching the rows.
+    """
+    
+    __slots__ = ('_columns', '_length')
+    
+    def __init__(self, columns: Dict[str, array]):
+        self._columns = columns
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns in a YearlyTable must have the same length")
+        self._length = lengths.pop() if lengths else 0
+    
+    @classmethod
+    def empty(cls, column_names: Sequence[str]) -> 'YearlyTable':
+        """Create a table with the given columns and no rows"""
+        return cls(_empty_columns(column_names))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [YearlyRow(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("YearlyTable index out of range")
+        return YearlyRow(self, index)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __repr__(self) -> str:
+        return f"YearlyTable(columns={list(self._columns)!r}, years={self._length})"
+    
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Column names in display order"""
+        return tuple(self._columns)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(values.itemsize * len(values) for values in self._columns.values())
+    
+    def column(self, name: str) -> array:
+        """Return the underlying array for one column (do not modify it)"""
+        return self._columns[name]
+    
+    def copy(self) -> 'YearlyTable':
+        """Return a table with its own copy of every column"""
+        return YearlyTable({name: array(values.typecode, values) for name, values in self._columns.items()})
+    
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Materialize the table as a list of plain row dictionaries"""
+        return [dict(row) for row in self]
+    
+    def to_dataframe(self):
+        """
+        Build a pandas DataFrame backed by the column arrays without copying
+        
+        The frame shares memory with this table, so treat it as read-only.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        data = {
+            name: np.frombuffer(values, dtype=values.typecode) if len(values) else np.empty(0, dtype=values.typecode)
+            for name, values in self._columns.items()
+        }
+        return pd.DataFrame(data, copy=False)
+    
+    @classmethod
+    def from_dataframe(cls, frame) -> 'YearlyTable':
+        """Build a table from a DataFrame with numeric columns (the inverse of to_dataframe)"""
+        columns = {}
+        for name in frame.columns:
+            values = frame[name].to_numpy()
+            columns[name] = array(values.dtype.char, values.tobytes())
+        return cls(columns)
+
+
+class AnalysisResult:
+    """
+    Result of generate_complete_analysis
+    
+    Unpacks like the (mortgage_data, rent_data, summary) tuple it replaces.
+    """
+    
+    __slots__ = ('mortgage_data', 'rent_data', 'summary')
+    
+    def __init__(self, mortgage_data: YearlyTable, rent_data: YearlyTable, summary: Dict[str, Any]):
+        self.mortgage_data = mortgage_data
+        self.rent_data = rent_data
+        self.summary = summary
+    
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.mortgage_data, self.rent_data, self.summary))
+    
+    def __len__(self) -> int:
+        return 3
+    
+    def __getitem__(self, index: int) -> Any:
+        return (self.mortgage_data, self.rent_data, self.summary)[index]
+    
+    def __repr__(self) -> str:
+        return f"AnalysisResult(years={len(self.mortgage_data)}, winner={self.summary.get('winner')!r})"
+    
+    def copy(self) -> 'AnalysisResult':
+        """Return a result that shares no mutable state with this one"""
+        return AnalysisResult(self.mortgage_data.copy(), self.rent_data.copy(), dict(self.summary))
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the tables and summary"""
+        summary_bytes = sys.getsizeof(self.summary) + sum(sys.getsizeof(value) for value in self.summary.values())
+        return self.mortgage_data.nbytes + self.rent_data.nbytes + summary_bytes
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache of AnalysisResult objects with optional TTL
+    
+    Stored results are never handed out directly: get() returns a copy, so a
+    caller mutating its result cannot corrupt later hits.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached results before LRU eviction
+            ttl_seconds: Age after which an entry is treated as a miss (None = never expires)
+            clock: Time source, injectable for deterministic expiry
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[AnalysisResult]:
+        """Return a copy of the cached result for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            result, stored_at, nbytes = entry
+            if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= nbytes
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return result.copy()
+    
+    def put(self, key: Hashable, result: AnalysisResult) -> None:
+        """Store a private copy of result under key, evicting least recently used entries"""
+        stored = result.copy()
+        nbytes = stored.nbytes
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (stored, self._clock(), nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of cache statistics
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, expirations,
+            entries, max_entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes
+            }
+
+
+class AnalysisMetrics:
+    """
+    Thread-safe per-stage counters for the analysis pipeline
+    
+    Records wall time and call counts for each stage (mortgage, rent,
+    summary, summary_closed_form and batch), rows generated per stage and
+    the horizons requested. snapshot() returns plain dicts; to_prometheus()
+    renders the same data in the Prometheus text exposition format.
+    """
+    
+    def __init__(
+        self,
+        seconds_buckets: Sequence[float] = STAGE_SECONDS_BUCKETS,
+        horizon_buckets: Sequence[int] = HORIZON_YEARS_BUCKETS
+    ):
+        """
+        Args:
+            seconds_buckets: Ascending upper bounds of the stage time histogram
+            horizon_buckets: Ascending upper bounds of the horizon histogram
+        """
+        self.seconds_buckets = tuple(seconds_buckets)
+        self.horizon_buckets = tuple(horizon_buckets)
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Zero every counter"""
+        with self._lock:
+            # stage -> [calls, seconds, max_seconds, rows, per-bucket counts]
+            self._stages = {}
+            self._horizons = {}
+            self._scenarios = {}
+    
+    def record_stage(self, stage: str, seconds: float, rows: int = 0) -> None:
+        """
+        Add one run of a stage
+        
+        Args:
+            stage: Stage name, e.g. 'mortgage'
+            seconds: Wall time of the run
+            rows: Yearly table rows the run produced
+        """
+        bucket = bisect.bisect_left(self.seconds_buckets, seconds)
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0.0, 0.0, 0, [0] * (len(self.seconds_buckets) + 1)]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            entry[3] += rows
+            entry[4][bucket] += 1
+    
+    def record_scenarios(self, path: str, horizons: Mapping) -> None:
+        """
+        Add analyzed scenarios
+        
+        Args:
+            path: Entry point that ran them, 'single' or 'batch'
+            horizons: Map of horizon in years -> number of scenarios
+        """
+        with self._lock:
+            for years, count in horizons.items():
+                self._horizons[years] = self._horizons.get(years, 0) + count
+                self._scenarios[path] = self._scenarios.get(path, 0) + count
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of every counter
+        
+        Returns:
+            Dictionary with 'stages' (stage -> calls, seconds, mean_seconds,
+            max_seconds, rows and per-bucket counts), 'horizons' (years ->
+            scenarios) and 'scenarios' (path -> count)
+        """
+        with self._lock:
+            return self._snapshot()
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        stages = {
+            stage: {
+                'calls': calls,
+                'seconds': seconds,
+                'mean_seconds': seconds / calls if calls else 0.0,
+                'max_seconds': max_seconds,
+                'rows': rows,
+                'buckets': list(buckets)
+            }
+            for stage, (calls, seconds, max_seconds, rows, buckets) in self._stages.items()
+        }
+        return {
+            'stages': stages,
+            'horizons': dict(self._horizons),
+            'scenarios': dict(self._scenarios)
+        }
+    
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Add the counters from another instance's snapshot(), e.g. one taken
+        in a worker process
+        """
+        with self._lock:
+            for stage, other in snapshot['stages'].items():
+                entry = self._stages.get(stage)
+                if entry is None:
+                    entry = self._stages[stage] = [0, 0.0, 0.0, 0, [0] * (len(self.seconds_buckets) + 1)]
+                entry[0] += other['calls']
+                entry[1] += other['seconds']
+                entry[2] = max(entry[2], other['max_seconds'])
+                entry[3] += other['rows']
+                entry[4] = [mine + theirs for mine, theirs in zip(entry[4], other['buckets'])]
+            for years, count in snapshot['horizons'].items():
+                self._horizons[int(years)] = self._horizons.get(int(years), 0) + count
+            for path, count in snapshot['scenarios'].items():
+                self._scenarios[path] = self._scenarios.get(path, 0) + count
+    
+    def drain(self) -> Dict[str, Any]:
+        """snapshot() and reset() in one step, so no update falls between them"""
+        with self._lock:
+            snapshot = self._snapshot()
+            self._stages = {}
+            self._horizons = {}
+            self._scenarios = {}
+        return snapshot
+    
+    def to_prometheus(self, cache: Optional[AnalysisCache] = None, prefix: str = 'home_calculator') -> str:
+        """
+        Render the counters in the Prometheus text exposition format
+        
+        Args:
+            cache: Optional AnalysisCache whose stats() are exported alongside
+            prefix: Metric name prefix
+            
+        Returns:
+            Exposition text ending in a newline
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        def histogram(name: str, labels: str, bounds: Sequence[float], counts: Sequence[int], total: float) -> None:
+            separator = ',' if labels else ''
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+            cumulative += counts[len(bounds)]
+            lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {cumulative}')
+            suffix = f'{{{labels}}}' if labels else ''
+            lines.append(f'{name}_sum{suffix} {total!r}')
+            lines.append(f'{name}_count{suffix} {cumulative}')
+        
+        name = f'{prefix}_stage_seconds'
+        lines.append(f'# HELP {name} Wall time of each analysis stage run.')
+        lines.append(f'# TYPE {name} histogram')
+        for stage, stats in sorted(snapshot['stages'].items()):
+            histogram(name, f'stage="{stage}"', self.seconds_buckets, stats['buckets'], stats['seconds'])
+        
+        name = f'{prefix}_stage_rows_total'
+        lines.append(f'# HELP {name} Yearly table rows generated by each stage.')
+        lines.append(f'# TYPE {name} counter')
+        for stage, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{name}{{stage="{stage}"}} {stats["rows"]}')
+        
+        name = f'{prefix}_scenarios_total'
+        lines.append(f'# HELP {name} Scenarios analyzed, by entry point.')
+        lines.append(f'# TYPE {name} counter')
+        for path, count in sorted(snapshot['scenarios'].items()):
+            lines.append(f'{name}{{path="{path}"}} {count}')
+        
+        name = f'{prefix}_horizon_years'
+        lines.append(f'# HELP {name} Analysis horizon requested per scenario.')
+        lines.append(f'# TYPE {name} histogram')
+        horizon_counts = [0] * (len(self.horizon_buckets) + 1)
+        for years, count in snapshot['horizons'].items():
+            horizon_counts[bisect.bisect_left(self.horizon_buckets, years)] += count
+        total_years = sum(years * count for years, count in snapshot['horizons'].items())
+        histogram(name, '', self.horizon_buckets, horizon_counts, total_years)
+        
+        if cache is not None:
+            stats = cache.stats()
+            for key, kind, help_text in (
+                ('hits', 'counter', 'Analysis cache hits.'),
+                ('misses', 'counter', 'Analysis cache misses.'),
+                ('evictions', 'counter', 'Analysis cache LRU evictions.'),
+                ('entries', 'gauge', 'Analyses currently cached.'),
+                ('bytes', 'gauge', 'Approximate size of cached analyses.')
+            ):
+                name = f'{prefix}_cache_{key}' + ('_total' if kind == 'counter' else '')
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                lines.append(f'{name} {stats[key]}')
+        return '\n'.join(lines) + '\n'
+    
+    def write_prometheus(self, path: str, cache: Optional[AnalysisCache] = None) -> None:
+        """
+        Atomically write to_prometheus() to a file, e.g. for the node_exporter
+        textfile collector
+        
+        Args:
+            path: Destination file (usually ending in .prom)
+            cache: Optional AnalysisCache to export alongside
+        """
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            handle.write(self.to_prometheus(cache))
+        os.replace(temp_path, path)
+
+
+class AmortizationSchedule:
+    """
+    Year-by-year amortization of one loan at a fixed (apr, term, fidelity)
+    
+    Every step of the yearly recurrence is linear in the loan amount, so the
+    schedule of a loan of 1 scales to any non-negative loan: a loan of L pays
+    L * monthly_payment and L * interest[k] in year k+1. deductible_scale_limit[k]
+    is the scale at which the opening balance of year k+1 reaches
+    DEDUCTIBLE_PRINCIPAL_LIMIT, so the schedule scaled by s deducts
+    interest[k] * min(s, deductible_scale_limit[k]) that year.
+    """
+    
+    __slots__ = (
+        'apr', 'term', 'fidelity', 'principal_amount', 'monthly_payment',
+        'interest', 'principal', 'balance', 'deductible_scale_limit', 'cumulative_interest'
+    )
+    
+    def __init__(
+        self,
+        apr: float,
+        term: int,
+        fidelity: str,
+        principal_amount: float,
+        monthly_payment: float,
+        interest: Sequence[float],
+        principal: Sequence[float],
+        balance: Sequence[float]
+    ):
+        """
+        Args:
+            apr: Annual percentage rate
+            term: Loan term in years the payment is sized for
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
+            principal_amount: Loan amount the schedule was built for (1 for unit schedules)
+            monthly_payment: Monthly payment of that loan
+            interest: Interest paid in each year
+            principal: Principal paid in each year
+            balance: Closing balance of each year
+        """
+        self.apr = apr
+        self.term = term
+        self.fidelity = fidelity
+        self.principal_amount = principal_amount
+        self.monthly_payment = monthly_payment
+        # Packed doubles: 8 bytes per value instead of a float object each.
+        # Schedules are shared, so treat these arrays as read-only.
+        self.interest = array('d', interest)
+        self.principal = array('d', principal)
+        self.balance = array('d', balance)
+        self.deductible_scale_limit = array('d', (
+            DEDUCTIBLE_PRINCIPAL_LIMIT / (closing + paid) if closing + paid > 0 else math.inf
+            for closing, paid in zip(self.balance, self.principal)
+        ))
+        self.cumulative_interest = array('d', accumulate(self.interest))
+    
+    def __len__(self) -> int:
+        return len(self.interest)
+    
+    def __repr__(self) -> str:
+        return f"AmortizationSchedule(apr={self.apr!r}, term={self.term}, fidelity={self.fidelity!r}, years={len(self)})"
+
+
+class ScheduleCache:
+    """
+    Thread-safe LRU of unit AmortizationSchedules keyed by (apr, term, fidelity)
+    
+    Schedules are immutable and shared between callers. A schedule shorter
+    than the horizon asked for counts as a miss and is replaced by a longer one.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_SCHEDULE_CACHE_ENTRIES):
+        """
+        Args:
+            max_entries: Maximum number of schedules before LRU eviction
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable, years: int) -> Optional[AmortizationSchedule]:
+        """Schedule for key covering at least `years`, or None on a miss"""
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is None or len(schedule) < years:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return schedule
+    
+    def put(self, key: Hashable, schedule: AmortizationSchedule) -> None:
+        """Store a schedule, evicting least recently used entries"""
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every schedule (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of cache statistics
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries and max_entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
 
 
 class HomeCalculatorCore:
     """Core calculation engine for home ownership vs rent analysis"""
     
+    # Opt-in memoization for generate_complete_analysis, see enable_cache()
+    analysis_cache: Optional[AnalysisCache] = None
+    
+    @staticmethod
+    def enable_cache(max_entries: int = 256, ttl_seconds: Optional[float] = None) -> AnalysisCache:
+        """
+        Turn on in-process memoization of generate_complete_analysis
+        
+        Args:
+            max_entries: Maximum number of cached analyses (LRU eviction)
+            ttl_seconds: Optional time-to-live for each entry
+            
+        Returns:
+            The AnalysisCache now in use, for inspecting stats()
+        """
+        HomeCalculatorCore.analysis_cache = AnalysisCache(max_entries, ttl_seconds)
+        return HomeCalculatorCore.analysis_cache
+    
+    @staticmethod
+    def disable_cache() -> None:
+        """Turn off memoization and release cached results"""
+        HomeCalculatorCore.analysis_cache = None
+    
+    # Opt-in per-stage timing, see enable_metrics()
+    analysis_metrics: Optional[AnalysisMetrics] = None
+    
+    @staticmethod
+    def enable_metrics(metrics: Optional[AnalysisMetrics] = None) -> AnalysisMetrics:
+        """
+        Turn on per-stage instrumentation of the analysis pipeline
+        
+        While disabled each entry point pays a single attribute check.
+        
+        Args:
+            metrics: Collector to record into (a fresh AnalysisMetrics if None)
+            
+        Returns:
+            The AnalysisMetrics now in use, for snapshot() or to_prometheus()
+        """
+        HomeCalculatorCore.analysis_metrics = metrics if metrics is not None else AnalysisMetrics()
+        return HomeCalculatorCore.analysis_metrics
+    
+    @staticmethod
+    def disable_metrics() -> None:
+        """Turn off instrumentation (the collector keeps its counters)"""
+        HomeCalculatorCore.analysis_metrics = None
+    
+    # Shared unit amortization schedules, see unit_schedule()
+    schedule_cache: Optional[ScheduleCache] = ScheduleCache()
+    
     @staticmethod
     def calculate_mortgage_payment(principal: float, annual_rate: float, years: int = 30) -> float:
         """
@@ -43,8 +805,9 @@ class HomeCalculatorCore:
         property_tax_growth: float,
         house_growth: float,
         tax_rate: float,
-        years: int
-    ) -> List[Dict[str, Any]]:
+        years: int,
+        fidelity: str = 'annual'
+    ) -> YearlyTable:
         """
         Generate year-by-year mortgage amortization data
         
@@ -57,51 +820,195 @@ class HomeCalculatorCore:
             house_growth: Annual home price growth rate (percentage)
             tax_rate: Income tax rate for deduction calculations (percentage)
             years: Number of years to analyze
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
             
         Returns:
-            List of dictionaries containing yearly mortgage data
+            YearlyTable of yearly mortgage data (rows behave like dictionaries)
         """
         down_payment = home_price * (down_payment_pct / 100)
         loan_amount = home_price - down_payment
-        monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(loan_amount, apr, 30)
+        if loan_amount >= 0:
+            # Scale the shared schedule of a loan of 1 to this loan
+            schedule = HomeCalculatorCore.unit_schedule(apr, fidelity, years)
+            scale = loan_amount
+        else:
+            schedule = HomeCalculatorCore.amortization_schedule(loan_amount, apr, fidelity, years)
+            scale = 1.0
+        monthly_payment = scale * schedule.monthly_payment
         
-        mortgage_data = []
-        current_balance = loan_amount
+        columns = _empty_columns(MORTGAGE_COLUMNS)
         current_home_value = home_price
         current_property_tax_base = home_price  # Separate tax base for Prop 13
         
-        for year in range(1, years + 1):
-            # Mortgage calculations
-            annual_payment = monthly_payment * 12
-            year_interest = current_balance * (apr / 100)
-            year_principal = annual_payment - year_interest
-            current_balance = max(0, current_balance - year_principal)
+        # One pass appending packed doubles: no per-column float lists are built
+        for year, unit_interest, unit_principal, unit_balance, scale_limit in zip(
+            range(1, years + 1), schedule.interest, schedule.principal, schedule.balance,
+            schedule.deductible_scale_limit
+        ):
+            year_interest = scale * unit_interest
+            year_principal = scale * unit_principal
             current_home_value *= (1 + house_growth / 100)
-            
-            # Property tax calculation with Prop 13 limits
             current_property_tax_base *= (1 + property_tax_growth / 100)
-            annual_property_tax = current_property_tax_base * (property_tax_rate / 100)
-            
             # Interest tax deduction (limited to $750k principal)
-            deductible_principal_limit = 750000
-            current_loan_balance = min(current_balance + year_principal, deductible_principal_limit)
-            deductible_interest = year_interest * (current_loan_balance / (current_balance + year_principal)) if (current_balance + year_principal) > 0 else year_interest
-            interest_tax_savings = deductible_interest * (tax_rate / 100)
+            deductible_interest = unit_interest * min(scale, scale_limit)
+            
+            columns['Year'].append(year)
+            columns['Monthly EMI'].append(monthly_payment)
+            columns['Principal Paid'].append(year_principal)
+            columns['Interest Paid'].append(year_interest)
+            columns['Deductible Interest'].append(deductible_interest)
+            columns['Interest Tax Savings'].append(deductible_interest * (tax_rate / 100))
+            columns['Total P&I'].append(year_principal + year_interest)
+            columns['Property Tax'].append(current_property_tax_base * (property_tax_rate / 100))
+            columns['Remaining Balance'].append(scale * unit_balance)
+            columns['Home Value'].append(current_home_value)
+        
+        return YearlyTable(columns)
+    
+    @staticmethod
+    def unit_schedule(
+        apr: float,
+        fidelity: str = 'annual',
+        years: int = MIN_SCHEDULE_YEARS,
+        term: int = 30
+    ) -> AmortizationSchedule:
+        """
+        Shared amortization schedule of a loan of 1, from schedule_cache
+        
+        Multiplying by a non-negative loan amount gives that loan's schedule,
+        so sweeps over home price and down payment build it once per rate.
+        
+        Args:
+            apr: Annual percentage rate
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
+            years: Minimum number of years the schedule must cover
+            term: Loan term in years the payment is sized for
+            
+        Returns:
+            AmortizationSchedule with principal_amount 1
+        """
+        cache = HomeCalculatorCore.schedule_cache
+        if cache is None:
+            return HomeCalculatorCore.amortization_schedule(1.0, apr, fidelity, years, term)
+        key = (apr, term, fidelity)
+        schedule = cache.get(key, years)
+        if schedule is None:
+            schedule = HomeCalculatorCore.amortization_schedule(1.0, apr, fidelity, max(years, MIN_SCHEDULE_YEARS), term)
+            cache.put(key, schedule)
+        return schedule
+    
+    @staticmethod
+    def amortization_schedule(
+        loan_amount: float,
+        apr: float,
+        fidelity: str = 'annual',
+        years: int = MIN_SCHEDULE_YEARS,
+        term: int = 30
+    ) -> AmortizationSchedule:
+        """
+        Step the yearly amortization of one loan (uncached)
+        
+        Args:
+            loan_amount: Loan principal
+            apr: Annual percentage rate
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
+            years: Number of years to cover
+            term: Loan term in years the payment is sized for
+            
+        Returns:
+            AmortizationSchedule of that loan
+        """
+        monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(loan_amount, apr, term)
+        amortize_year = HomeCalculatorCore._year_amortizer(monthly_payment, apr, fidelity)
+        interest, principal, balance = [], [], []
+        current_balance = loan_amount
+        for _ in range(years):
+            year_interest, year_principal, current_balance = amortize_year(current_balance)
+            interest.append(year_interest)
+            principal.append(year_principal)
+            balance.append(current_balance)
+        return AmortizationSchedule(apr, term, fidelity, loan_amount, monthly_payment, interest, principal, balance)
+    
+    @staticmethod
+    def monthly_rates(apr: float, fidelity: str) -> List[float]:
+        """
+        Interest rate charged in each of the 12 months of a year
+        
+        Args:
+            apr: Annual percentage rate
+            fidelity: 'monthly' (APR / 12 every month) or 'daily' (APR / 365 per calendar day)
             
-            mortgage_data.append({
-                'Year': year,
-                'Monthly EMI': monthly_payment,
-                'Principal Paid': year_principal,
-                'Interest Paid': year_interest,
-                'Deductible Interest': deductible_interest,
-                'Interest Tax Savings': interest_tax_savings,
-                'Total P&I': year_principal + year_interest,
-                'Property Tax': annual_property_tax,
-                'Remaining Balance': current_balance,
-                'Home Value': current_home_value
-            })
-        
-        return mortgage_data
+        Returns:
+            List of 12 monthly rates (fractions)
+        """
+        if fidelity == 'monthly':
+            return [apr / 100 / 12] * 12
+        if fidelity == 'daily':
+            return [apr / 100 / 365 * days for days in DAYS_IN_MONTH]
+        raise ValueError(f"No monthly rates for fidelity '{fidelity}'")
+    
+    @staticmethod
+    def yearly_amortization_map(apr: float, fidelity: str) -> Tuple[float, float]:
+        """
+        Fold a year of monthly payments into one affine step
+        
+        Each month does balance = balance * (1 + rate) - payment, so twelve of
+        them compose to closing = opening * growth - monthly_payment * weight.
+        
+        Returns:
+            Tuple of (growth, weight)
+        """
+        growth = 1.0
+        weight = 0.0
+        for rate in HomeCalculatorCore.monthly_rates(apr, fidelity):
+            growth *= 1 + rate
+            weight = weight * (1 + rate) + 1
+        return growth, weight
+    
+    @staticmethod
+    def _year_amortizer(monthly_payment: float, apr: float, fidelity: str) -> Callable[[float], Tuple[float, float, float]]:
+        """
+        Build a function advancing the loan by one year at the given fidelity
+        
+        The returned function maps the opening balance to (interest, principal,
+        closing balance). 'annual' charges one year of interest on the opening
+        balance. 'monthly' and 'daily' apply the folded yearly map, and only in
+        the payoff year walk the 12 months so the last payment stops at zero.
+        """
+        if fidelity not in FIDELITY_LEVELS:
+            raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+        
+        annual_payment = monthly_payment * 12
+        if fidelity == 'annual':
+            def amortize_annual(current_balance):
+                year_interest = current_balance * (apr / 100)
+                year_principal = annual_payment - year_interest
+                return year_interest, year_principal, max(0, current_balance - year_principal)
+            return amortize_annual
+        
+        rates = HomeCalculatorCore.monthly_rates(apr, fidelity)
+        growth, weight = HomeCalculatorCore.yearly_amortization_map(apr, fidelity)
+        
+        def amortize_monthly(current_balance):
+            if current_balance <= 0:
+                return 0.0, 0.0, 0.0
+            closing_balance = current_balance * growth - monthly_payment * weight
+            if closing_balance >= 0:
+                year_principal = current_balance - closing_balance
+                return annual_payment - year_principal, year_principal, closing_balance
+            
+            # Loan is paid off during this year - the final payment covers only what is owed
+            year_interest = 0.0
+            balance = current_balance
+            for rate in rates:
+                if balance <= 0:
+                    break
+                interest = balance * rate
+                year_interest += interest
+                balance -= min(monthly_payment - interest, balance)
+            return year_interest, current_balance, 0.0
+        
+        return amortize_monthly
     
     @staticmethod
     def generate_rent_data(
@@ -113,7 +1020,7 @@ class HomeCalculatorCore:
         years: int,
         stocks_enabled: bool = True,
         include_down_payment_growth: bool = True
-    ) -> List[Dict[str, Any]]:
+    ) -> YearlyTable:
         """
         Generate year-by-year rental and investment data
         
@@ -128,9 +1035,10 @@ class HomeCalculatorCore:
             include_down_payment_growth: Whether down payment grows with stocks
             
         Returns:
-            List of dictionaries containing yearly rent and investment data
+            YearlyTable of yearly rent and investment data (rows behave like
+            dictionaries; stock columns are present only when stocks_enabled)
         """
-        rent_data = []
+        columns = _empty_columns(RENT_COLUMNS + STOCK_COLUMNS if stocks_enabled else RENT_COLUMNS)
         current_rent = monthly_rent
         cumulative_emi_rent_diff_investment = 0
         
@@ -141,13 +1049,11 @@ class HomeCalculatorCore:
             monthly_emi_rent_diff_positive = max(0, monthly_emi_rent_diff)
             annual_emi_rent_diff_positive = monthly_emi_rent_diff_positive * 12
             
-            year_data = {
-                'Year': year,
-                'Monthly Rent': current_rent,
-                'Annual Rent': annual_rent,
-                'EMI-Rent Diff': monthly_emi_rent_diff,
-                'Yearly Savings with EMI-Rent Diff': annual_emi_rent_diff
-            }
+            columns['Year'].append(year)
+            columns['Monthly Rent'].append(current_rent)
+            columns['Annual Rent'].append(annual_rent)
+            columns['EMI-Rent Diff'].append(monthly_emi_rent_diff)
+            columns['Yearly Savings with EMI-Rent Diff'].append(annual_emi_rent_diff)
             
             if stocks_enabled:
                 # Calculate stock growth on down payment (only if enabled)
@@ -164,42 +1070,99 @@ class HomeCalculatorCore:
                 
                 total_stock_investment_value = down_payment_value + cumulative_emi_rent_diff_investment
                 
-                year_data.update({
-                    'Down Payment Investment': down_payment_value,
-                    'EMI-Rent Diff Investment': cumulative_emi_rent_diff_investment,
-                    'Total Stock Value': total_stock_investment_value
-                })
+                columns['Down Payment Investment'].append(down_payment_value)
+                columns['EMI-Rent Diff Investment'].append(cumulative_emi_rent_diff_investment)
+                columns['Total Stock Value'].append(total_stock_investment_value)
             
-            rent_data.append(year_data)
             current_rent *= (1 + rent_growth / 100)
         
-        return rent_data
+        return YearlyTable(columns)
     
     @staticmethod
     def calculate_summary_metrics(
-        mortgage_data: List[Dict],
-        rent_data: List[Dict],
+        mortgage_data: Sequence[Mapping],
+        rent_data: Sequence[Mapping],
         inputs: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive summary metrics for comparison
         
         Args:
-            mortgage_data: Year-by-year mortgage data
-            rent_data: Year-by-year rent data
+            mortgage_data: Year-by-year mortgage data (YearlyTable or list of dicts)
+            rent_data: Year-by-year rent data (YearlyTable or list of dicts)
             inputs: Dictionary containing all input parameters
             
         Returns:
             Dictionary containing all summary metrics
         """
-        # Extract totals from data
-        total_rent = sum([row['Annual Rent'] for row in rent_data])
-        total_interest = sum([row['Interest Paid'] for row in mortgage_data])
-        total_property_tax = sum([row['Property Tax'] for row in mortgage_data])
-        total_interest_tax_savings = sum([row['Interest Tax Savings'] for row in mortgage_data])
+        return HomeCalculatorCore._build_summary_metrics(
+            inputs,
+            **HomeCalculatorCore._mortgage_totals(mortgage_data),
+            **HomeCalculatorCore._rent_totals(rent_data, inputs)
+        )
+    
+    @staticmethod
+    def _mortgage_totals(mortgage_data: Sequence[Mapping]) -> Dict[str, float]:
+        """Totals and final values the summary needs from the mortgage table"""
+        column_values = HomeCalculatorCore._column_values
+        return {
+            'total_interest': sum(column_values(mortgage_data, 'Interest Paid')),
+            'total_property_tax': sum(column_values(mortgage_data, 'Property Tax')),
+            'total_interest_tax_savings': sum(column_values(mortgage_data, 'Interest Tax Savings')),
+            'final_home_value': mortgage_data[-1]['Home Value']
+        }
+    
+    @staticmethod
+    def _rent_totals(rent_data: Sequence[Mapping], inputs: Dict[str, Any]) -> Dict[str, float]:
+        """Totals and final values the summary needs from the rent table"""
+        column_values = HomeCalculatorCore._column_values
+        totals = {
+            'total_rent': sum(column_values(rent_data, 'Annual Rent')),
+            'final_down_payment_value': 0,
+            'final_emi_rent_diff_investment': 0,
+            'total_emi_rent_diff_invested': 0
+        }
+        if inputs.get('stocks_enabled', False):
+            totals['final_down_payment_value'] = rent_data[-1].get('Down Payment Investment', 0)
+            totals['final_emi_rent_diff_investment'] = rent_data[-1].get('EMI-Rent Diff Investment', 0)
+            
+            # Calculate total EMI-rent difference invested
+            monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(
+                inputs['home_price'] * (1 - inputs['down_payment_pct']/100),
+                inputs['apr'],
+                30
+            )
+            totals['total_emi_rent_diff_invested'] = sum([
+                max(0, (monthly_payment * 12) - annual_rent)
+                for annual_rent in column_values(rent_data, 'Annual Rent')
+            ])
+        return totals
+    
+    @staticmethod
+    def _column_values(data: Sequence[Mapping], key: str) -> Sequence[float]:
+        """Values of one column, read straight from the array when data is a YearlyTable"""
+        if isinstance(data, YearlyTable):
+            return data.column(key)
+        return [row[key] for row in data]
+    
+    @staticmethod
+    def _build_summary_metrics(
+        inputs: Dict[str, Any],
+        total_rent: float,
+        total_interest: float,
+        total_property_tax: float,
+        total_interest_tax_savings: float,
+        final_home_value: float,
+        final_down_payment_value: float,
+        final_emi_rent_diff_investment: float,
+        total_emi_rent_diff_invested: float
+    ) -> Dict[str, Any]:
+        """
+        Turn yearly totals and final values into the summary metrics dictionary
         
-        # Calculate final values
-        final_home_value = mortgage_data[-1]['Home Value']
+        Shared by the table-based and closed-form summary paths so both apply
+        exactly the same cost, gain and tax rules.
+        """
         initial_home_value = inputs['home_price']
         home_sale_gains = final_home_value - initial_home_value
         
@@ -220,25 +1183,11 @@ class HomeCalculatorCore:
         capital_gains_tax_owed = 0
         
         if inputs.get('stocks_enabled', False):
-            final_down_payment_value = rent_data[-1].get('Down Payment Investment', 0)
-            final_emi_rent_diff_investment = rent_data[-1].get('EMI-Rent Diff Investment', 0)
-            
             if inputs.get('include_down_payment_growth', True):
                 down_payment_value_gain = final_down_payment_value - inputs['home_price'] * (inputs['down_payment_pct'] / 100)
             else:
                 down_payment_value_gain = 0
             
-            # Calculate total EMI-rent difference invested
-            monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(
-                inputs['home_price'] * (1 - inputs['down_payment_pct']/100), 
-                inputs['apr'], 
-                30
-            )
-            total_emi_rent_diff_invested = sum([
-                max(0, (monthly_payment * 12) - row['Annual Rent'])
-                for row in rent_data
-            ])
-            
             emi_rent_investments_value_gain = final_emi_rent_diff_investment - total_emi_rent_diff_invested
             stock_investment_gains = down_payment_value_gain + emi_rent_investments_value_gain
             capital_gains_tax_owed = stock_investment_gains * (inputs.get('capital_gains_tax_rate', 20.0) / 100)
@@ -277,18 +1226,355 @@ class HomeCalculatorCore:
         }
     
     @staticmethod
-    def generate_complete_analysis(inputs: Dict[str, Any]) -> Tuple[List[Dict], List[Dict], Dict[str, Any]]:
+    def _growth_sum(rate: float, periods: int) -> float:
+        """
+        Sum of (1 + rate)**k for k = 0 .. periods-1, i.e. a geometric series
+        
+        Uses expm1/log1p so rates close to zero keep full precision. Falls back
+        to direct summation when the growth factor is not positive.
+        """
+        if periods <= 0:
+            return 0.0
+        if rate == 0:
+            return float(periods)
+        if rate <= -1:
+            return sum([(1 + rate) ** k for k in range(periods)])
+        return math.expm1(periods * math.log1p(rate)) / rate
+    
+    @staticmethod
+    def _positive_run(payment: float, monthly_rent: float, rent_growth: float, years: int) -> Tuple[int, int]:
+        """
+        Find the years where the EMI exceeds rent, i.e. max(0, EMI - rent) > 0
+        
+        Rent compounds monotonically, so those years form one contiguous run.
+        The boundary is solved with logarithms and then nudged to agree with
+        the direct comparison.
+        
+        Returns:
+            Tuple of (first_year, last_year), inclusive and 1-based. The run is
+            empty when first_year > last_year.
+        """
+        factor = 1 + rent_growth / 100
+        
+        def is_positive(year):
+            return payment - monthly_rent * factor ** (year - 1) > 0
+        
+        if factor <= 0 or monthly_rent <= 0 or payment <= 0:
+            run = [year for year in range(1, years + 1) if is_positive(year)]
+            return (run[0], run[-1]) if run else (1, 0)
+        
+        if factor == 1:
+            return (1, years) if is_positive(1) else (1, 0)
+        
+        # Crossover where monthly_rent * factor**(t) == payment
+        crossover = math.log(payment / monthly_rent) / math.log(factor)
+        if factor > 1:
+            # Rent rising: positive from year 1 up to the crossover
+            first = 1
+            last = min(years, max(0, math.ceil(crossover)))
+            while last >= 1 and not is_positive(last):
+                last -= 1
+            while last < years and is_positive(last + 1):
+                last += 1
+        else:
+            # Rent falling: positive from the crossover onwards
+            last = years
+            first = max(1, min(years + 1, math.floor(crossover) + 2))
+            while first <= years and not is_positive(first):
+                first += 1
+            while first > 1 and is_positive(first - 1):
+                first -= 1
+        return first, last
+    
+    @staticmethod
+    def _amortization_totals(
+        loan_amount: float,
+        monthly_payment: float,
+        apr: float,
+        years: int,
+        fidelity: str = 'annual'
+    ) -> Tuple[float, float]:
+        """
+        Closed-form total interest and total deductible interest over `years`
+        
+        Follows the annual recurrence of generate_mortgage_data:
+        balance(k) = balance(k-1) * (1 + r) - annual_payment, clipped at zero.
+        Interest telescopes to annual_payment * k - loan + balance(k), and while
+        the opening balance is above the $750k limit the deductible interest is
+        exactly r * 750k. Only the payoff year, where clipping kicks in, is
+        evaluated on its own.
+        
+        Monthly and daily fidelity have no closed form for the capped
+        deduction, so they scale the shared unit schedule instead: total
+        interest is one lookup and the deduction one clipped sum over years.
+        
+        Returns:
+            Tuple of (total_interest, total_deductible_interest)
+        """
+        deductible_principal_limit = DEDUCTIBLE_PRINCIPAL_LIMIT
+        rate = apr / 100
+        annual_payment = monthly_payment * 12
+        
+        if fidelity != 'annual':
+            if loan_amount >= 0:
+                schedule = HomeCalculatorCore.unit_schedule(apr, fidelity, years)
+                scale = loan_amount
+            else:
+                schedule = HomeCalculatorCore.amortization_schedule(loan_amount, apr, fidelity, years)
+                scale = 1.0
+            total_interest = scale * schedule.cumulative_interest[years - 1]
+            total_deductible = sum(
+                value * min(scale, limit)
+                for value, limit in zip(schedule.interest[:years], schedule.deductible_scale_limit)
+            )
+            return total_interest, total_deductible
+        
+        if loan_amount == 0 or rate == 0:
+            return 0.0, 0.0
+        
+        if loan_amount < 0 or rate < 0 or annual_payment <= loan_amount * rate:
+            # Negative or non-amortizing loan - no closed form, walk the years
+            total_interest = 0.0
+            total_deductible = 0.0
+            current_balance = loan_amount
+            for _ in range(years):
+                year_interest = current_balance * rate
+                year_principal = annual_payment - year_interest
+                current_balance = max(0, current_balance - year_principal)
+                opening_balance = current_balance + year_principal
+                total_interest += year_interest
+                if opening_balance > 0:
+                    total_deductible += year_interest * (min(opening_balance, deductible_principal_limit) / opening_balance)
+                else:
+                    total_deductible += year_interest
+            return total_interest, total_deductible
+        
+        def balance(year):
+            return loan_amount * (1 + rate) ** year - annual_payment * HomeCalculatorCore._growth_sum(rate, year)
+        
+        def first_year_at_or_below(target, estimate):
+            year = max(1, math.ceil(estimate))
+            while year > 1 and balance(year - 1) <= target:
+                year -= 1
+            while balance(year) > target:
+                year += 1
+            return year
+        
+        # Payoff year: first year whose closing balance reaches zero
+        perpetuity = annual_payment / rate
+        payoff_year = first_year_at_or_below(
+            0, math.log(perpetuity / (perpetuity - loan_amount)) / math.log1p(rate)
+        )
+        
+        # First year whose opening balance is within the deduction limit
+        if loan_amount <= deductible_principal_limit:
+            uncapped_year = 1
+        else:
+            uncapped_year = 1 + first_year_at_or_below(
+                deductible_principal_limit,
+                math.log((perpetuity - deductible_principal_limit) / (perpetuity - loan_amount)) / math.log1p(rate)
+            )
+        
+        amortizing_years = min(years, payoff_year)
+        total_interest = annual_payment * amortizing_years - loan_amount + balance(amortizing_years)
+        
+        # Years strictly before payoff: capped ones deduct r * limit, the rest deduct all interest
+        last_regular_year = min(years, payoff_year - 1)
+        capped_years = max(0, min(uncapped_year - 1, last_regular_year))
+        total_deductible = rate * deductible_principal_limit * capped_years
+        if last_regular_year >= uncapped_year:
+            uncapped_count = last_regular_year - uncapped_year + 1
+            total_deductible += annual_payment * uncapped_count - balance(uncapped_year - 1) + balance(last_regular_year)
+        
+        if payoff_year <= years:
+            # Balance clips to zero, so the opening balance is just this year's principal
+            year_interest = balance(payoff_year - 1) * rate
+            year_principal = annual_payment - year_interest
+            if year_principal > 0:
+                total_deductible += year_interest * (min(year_principal, deductible_principal_limit) / year_principal)
+            else:
+                total_deductible += year_interest
+        
+        return total_interest, total_deductible
+    
+    @staticmethod
+    def calculate_summary_metrics_closed_form(inputs: Dict[str, Any], fidelity: str = 'annual') -> Dict[str, Any]:
+        """
+        Calculate summary metrics in constant time without building yearly tables
+        
+        Rent, home value and the property tax base are geometric series, the
+        amortization totals telescope, and the EMI-rent investment is a growing
+        annuity over the run of years where EMI exceeds rent. Results match
+        calculate_summary_metrics up to floating point rounding.
+        
+        Args:
+            inputs: Dictionary containing all input parameters
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
+            
+        Returns:
+            Dictionary containing all summary metrics
+        """
+        growth_sum = HomeCalculatorCore._growth_sum
+        years = inputs['years']
+        home_price = inputs['home_price']
+        
+        down_payment = home_price * (inputs['down_payment_pct'] / 100)
+        loan_amount = home_price - down_payment
+        monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(loan_amount, inputs['apr'], 30)
+        
+        # Home ownership totals
+        total_interest, total_deductible_interest = HomeCalculatorCore._amortization_totals(
+            loan_amount, monthly_payment, inputs['apr'], years, fidelity
+        )
+        total_interest_tax_savings = total_deductible_interest * (inputs['tax_rate'] / 100)
+        
+        property_tax_growth = inputs.get('property_tax_growth', 2.0) / 100
+        total_property_tax = home_price * (1 + property_tax_growth) * growth_sum(property_tax_growth, years) * (inputs['property_tax_rate'] / 100)
+        final_home_value = home_price * (1 + inputs['house_growth'] / 100) ** years
+        
+        # Rent totals
+        monthly_rent = inputs['monthly_rent']
+        rent_growth = inputs['rent_growth'] / 100
+        total_rent = monthly_rent * 12 * growth_sum(rent_growth, years)
+        
+        final_down_payment_value = 0
+        final_emi_rent_diff_investment = 0
+        total_emi_rent_diff_invested = 0
+        if inputs.get('stocks_enabled', False):
+            stock_growth = inputs.get('stock_growth', 8.0) / 100
+            stock_factor = 1 + stock_growth
+            
+            if inputs.get('include_down_payment_growth', True):
+                final_down_payment_value = down_payment * stock_factor ** years
+            else:
+                final_down_payment_value = down_payment
+            
+            # Growing annuity of 12 * (EMI - rent) over the years where it is positive
+            first, last = HomeCalculatorCore._positive_run(monthly_payment, monthly_rent, inputs['rent_growth'], years)
+            if first <= last:
+                count = last - first + 1
+                if stock_factor > 0 and 1 + rent_growth > 0:
+                    rent_ratio = (1 + rent_growth) / stock_factor
+                    payment_value = monthly_payment * stock_factor ** (years - last) * growth_sum(stock_growth, count)
+                    rent_value = (monthly_rent * (1 + rent_growth) ** (first - 1) * stock_factor ** (years - first)
+                                  * growth_sum(rent_ratio - 1, count))
+                    final_emi_rent_diff_investment = 12 * (payment_value - rent_value)
+                else:
+                    for year in range(first, last + 1):
+                        final_emi_rent_diff_investment = (final_emi_rent_diff_investment * stock_factor
+                                                          + 12 * (monthly_payment - monthly_rent * (1 + rent_growth) ** (year - 1)))
+                    final_emi_rent_diff_investment *= stock_factor ** (years - last)
+            
+            summary_payment = HomeCalculatorCore.calculate_mortgage_payment(
+                home_price * (1 - inputs['down_payment_pct']/100),
+                inputs['apr'],
+                30
+            )
+            first, last = HomeCalculatorCore._positive_run(summary_payment, monthly_rent, inputs['rent_growth'], years)
+            if first <= last:
+                count = last - first + 1
+                rent_paid = monthly_rent * 12 * (1 + rent_growth) ** (first - 1) * growth_sum(rent_growth, count)
+                total_emi_rent_diff_invested = summary_payment * 12 * count - rent_paid
+        
+        return HomeCalculatorCore._build_summary_metrics(
+            inputs,
+            total_rent=total_rent,
+            total_interest=total_interest,
+            total_property_tax=total_property_tax,
+            total_interest_tax_savings=total_interest_tax_savings,
+            final_home_value=final_home_value,
+            final_down_payment_value=final_down_payment_value,
+            final_emi_rent_diff_investment=final_emi_rent_diff_investment,
+            total_emi_rent_diff_invested=total_emi_rent_diff_invested
+        )
+    
+    @staticmethod
+    def generate_complete_analysis(
+        inputs: Dict[str, Any],
+        summary_only: bool = False,
+        fidelity: str = 'annual'
+    ) -> AnalysisResult:
         """
         Generate complete financial analysis for home ownership vs rent
         
         Args:
             inputs: Dictionary containing all input parameters
+            summary_only: Skip the yearly tables and compute the summary in
+                closed form. The returned mortgage and rent tables are empty.
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS. 'annual'
+                is fastest; 'monthly' matches a lender's amortization schedule.
             
         Returns:
-            Tuple of (mortgage_data, rent_data, summary_metrics)
+            AnalysisResult, which unpacks as (mortgage_data, rent_data, summary_metrics)
         """
-        # Generate mortgage data
-        mortgage_data = HomeCalculatorCore.generate_mortgage_data(
+        metrics = HomeCalculatorCore.analysis_metrics
+        if metrics is not None:
+            metrics.record_scenarios('single', {int(inputs['years']): 1})
+        
+        cache = HomeCalculatorCore.analysis_cache
+        if cache is None:
+            return HomeCalculatorCore._generate_complete_analysis(inputs, summary_only, fidelity)
+        
+        key = (summary_only, fidelity, inputs_cache_key(inputs))
+        result = cache.get(key)
+        if result is None:
+            result = HomeCalculatorCore._generate_complete_analysis(inputs, summary_only, fidelity)
+            cache.put(key, result)
+        return result
+    
+    @staticmethod
+    def _generate_complete_analysis(inputs: Dict[str, Any], summary_only: bool, fidelity: str) -> AnalysisResult:
+        """Uncached body of generate_complete_analysis"""
+        metrics = HomeCalculatorCore.analysis_metrics
+        if metrics is not None:
+            return HomeCalculatorCore._instrumented_analysis(inputs, summary_only, fidelity, metrics)
+        
+        if summary_only:
+            return AnalysisResult(
+                YearlyTable.empty(MORTGAGE_COLUMNS),
+                YearlyTable.empty(RENT_COLUMNS),
+                HomeCalculatorCore.calculate_summary_metrics_closed_form(inputs, fidelity)
+            )
+        
+        mortgage_data = HomeCalculatorCore._mortgage_stage(inputs, fidelity)
+        rent_data = HomeCalculatorCore._rent_stage(inputs)
+        
+        # Calculate summary metrics
+        summary = HomeCalculatorCore.calculate_summary_metrics(mortgage_data, rent_data, inputs)
+        
+        return AnalysisResult(mortgage_data, rent_data, summary)
+    
+    @staticmethod
+    def _instrumented_analysis(
+        inputs: Dict[str, Any],
+        summary_only: bool,
+        fidelity: str,
+        metrics: AnalysisMetrics
+    ) -> AnalysisResult:
+        """_generate_complete_analysis with each stage timed into metrics"""
+        clock = time.perf_counter
+        started = clock()
+        if summary_only:
+            summary = HomeCalculatorCore.calculate_summary_metrics_closed_form(inputs, fidelity)
+            metrics.record_stage('summary_closed_form', clock() - started)
+            return AnalysisResult(YearlyTable.empty(MORTGAGE_COLUMNS), YearlyTable.empty(RENT_COLUMNS), summary)
+        
+        mortgage_data = HomeCalculatorCore._mortgage_stage(inputs, fidelity)
+        mortgage_done = clock()
+        rent_data = HomeCalculatorCore._rent_stage(inputs)
+        rent_done = clock()
+        summary = HomeCalculatorCore.calculate_summary_metrics(mortgage_data, rent_data, inputs)
+        summary_done = clock()
+        
+        metrics.record_stage('mortgage', mortgage_done - started, len(mortgage_data))
+        metrics.record_stage('rent', rent_done - mortgage_done, len(rent_data))
+        metrics.record_stage('summary', summary_done - rent_done)
+        return AnalysisResult(mortgage_data, rent_data, summary)
+    
+    @staticmethod
+    def _mortgage_stage(inputs: Dict[str, Any], fidelity: str = 'annual') -> YearlyTable:
+        """Build the mortgage table from an inputs dict"""
+        return HomeCalculatorCore.generate_mortgage_data(
             home_price=inputs['home_price'],
             down_payment_pct=inputs['down_payment_pct'],
             apr=inputs['apr'],
@@ -296,16 +1582,19 @@ class HomeCalculatorCore:
             property_tax_growth=inputs.get('property_tax_growth', 2.0),  # Default CA Prop 13 limit
             house_growth=inputs['house_growth'],
             tax_rate=inputs['tax_rate'],
-            years=inputs['years']
+            years=inputs['years'],
+            fidelity=fidelity
         )
-        
+    
+    @staticmethod
+    def _rent_stage(inputs: Dict[str, Any]) -> YearlyTable:
+        """Build the rent table from an inputs dict"""
         # Calculate mortgage payment and down payment for rent analysis
         down_payment = inputs['home_price'] * (inputs['down_payment_pct'] / 100)
         loan_amount = inputs['home_price'] - down_payment
         monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(loan_amount, inputs['apr'], 30)
         
-        # Generate rent data
-        rent_data = HomeCalculatorCore.generate_rent_data(
+        return HomeCalculatorCore.generate_rent_data(
             monthly_rent=inputs['monthly_rent'],
             rent_growth=inputs['rent_growth'],
             monthly_payment=monthly_payment,
@@ -315,11 +1604,134 @@ class HomeCalculatorCore:
             stocks_enabled=inputs.get('stocks_enabled', False),
             include_down_payment_growth=inputs.get('include_down_payment_growth', True)
         )
+    
+    @staticmethod
+    def generate_complete_analysis_batch(
+        inputs_batch: Dict[str, Any],
+        include_yearly: bool = True,
+        fidelity: str = 'annual'
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Generate complete financial analysis for many input sets at once
+
+        Args:
+            inputs_batch: Struct-of-arrays with the same fields as DEFAULT_VALUES.
+                Scalars are broadcast across the batch and omitted optional
+                fields take the same defaults as generate_complete_analysis.
+            include_yearly: Whether to materialize the per-year columns
+            fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+        Returns:
+            Tuple of (mortgage_columns, rent_columns, summary_metrics) holding
+            NumPy arrays - see home_calculator_batch for the layout
+        """
+        # NumPy is only needed for batch work, keep the scalar path dependency-free
+        from home_calculator_batch import generate_complete_analysis_batch
+        return generate_complete_analysis_batch(inputs_batch, include_yearly, fidelity=fidelity)
+
+
+# Which inputs feed each stage of the analysis. The summary reads every input
+# but only needs the stage totals, so it is always cheap to rebuild.
+STAGE_DEPENDENCIES = {
+    'mortgage': frozenset({
+        'years', 'home_price', 'down_payment_pct', 'apr', 'property_tax_rate',
+        'property_tax_growth', 'house_growth', 'tax_rate'
+    }),
+    'rent': frozenset({
+        'years', 'home_price', 'down_payment_pct', 'apr', 'monthly_rent', 'rent_growth',
+        'stock_growth', 'stocks_enabled', 'include_down_payment_growth'
+    }),
+    'summary': frozenset(REQUIRED_INPUTS) | frozenset(OPTIONAL_INPUT_DEFAULTS)
+}
+
+
+class IncrementalAnalysis:
+    """
+    Analysis that recomputes only the stages affected by an input change
+    
+    Keeps the mortgage table, rent table and their totals from the previous
+    run. update() compares normalized inputs, marks the stages listed in
+    STAGE_DEPENDENCIES for the changed fields as dirty and rebuilds just
+    those, e.g. changing brokerage_cost only rebuilds the summary and
+    changing rent_growth leaves the mortgage table untouched.
+    """
+    
+    def __init__(self, inputs: Dict[str, Any], fidelity: str = 'annual'):
+        """
+        Args:
+            inputs: Dictionary containing all input parameters
+            fidelity: Interest accrual model for the mortgage stage, one of FIDELITY_LEVELS
+        """
+        self.inputs = dict(inputs)
+        self.fidelity = fidelity
+        self.stage_runs = {stage: 0 for stage in STAGE_DEPENDENCIES}
+        self.last_recomputed: Tuple[str, ...] = ()
+        self._normalized = normalize_inputs(self.inputs)
+        self._mortgage_data = None
+        self._mortgage_totals = None
+        self._rent_data = None
+        self._rent_totals = None
+        self._summary = None
+        self._recompute(tuple(STAGE_DEPENDENCIES))
+    
+    @property
+    def result(self) -> AnalysisResult:
+        """Current analysis (tables are shared, the summary dict is a copy)"""
+        return AnalysisResult(self._mortgage_data, self._rent_data, dict(self._summary))
+    
+    @staticmethod
+    def dirty_stages(changed_fields: Sequence[str]) -> Tuple[str, ...]:
+        """Stages that must be rebuilt when the given input fields change"""
+        changed = set(changed_fields)
+        return tuple(stage for stage, fields in STAGE_DEPENDENCIES.items() if changed & fields)
+    
+    def update(self, changes: Optional[Dict[str, Any]] = None, **kwargs: Any) -> AnalysisResult:
+        """
+        Apply input changes and rebuild only the dirty stages
         
-        # Calculate summary metrics
-        summary = HomeCalculatorCore.calculate_summary_metrics(mortgage_data, rent_data, inputs)
+        Args:
+            changes: Dictionary of input fields to change
+            **kwargs: Input fields to change, as keyword arguments
+            
+        Returns:
+            The updated AnalysisResult
+        """
+        new_inputs = dict(self.inputs)
+        new_inputs.update(changes or {})
+        new_inputs.update(kwargs)
+        normalized = normalize_inputs(new_inputs)
+        changed = [field for field, value in normalized.items() if self._normalized[field] != value]
         
-        return mortgage_data, rent_data, summary
+        self.inputs = new_inputs
+        self._normalized = normalized
+        self._recompute(self.dirty_stages(changed))
+        return self.result
+    
+    def _recompute(self, stages: Tuple[str, ...]) -> None:
+        metrics = HomeCalculatorCore.analysis_metrics
+        clock = time.perf_counter
+        if 'mortgage' in stages:
+            started = clock() if metrics is not None else 0.0
+            self._mortgage_data = HomeCalculatorCore._mortgage_stage(self.inputs, self.fidelity)
+            self._mortgage_totals = HomeCalculatorCore._mortgage_totals(self._mortgage_data)
+            if metrics is not None:
+                metrics.record_stage('mortgage', clock() - started, len(self._mortgage_data))
+        if 'rent' in stages:
+            started = clock() if metrics is not None else 0.0
+            self._rent_data = HomeCalculatorCore._rent_stage(self.inputs)
+            self._rent_totals = HomeCalculatorCore._rent_totals(self._rent_data, self.inputs)
+            if metrics is not None:
+                metrics.record_stage('rent', clock() - started, len(self._rent_data))
+        if 'summary' in stages:
+            started = clock() if metrics is not None else 0.0
+            self._summary = HomeCalculatorCore._build_summary_metrics(
+                self.inputs, **self._mortgage_totals, **self._rent_totals
+            )
+            if metrics is not None:
+                metrics.record_stage('summary', clock() - started)
+        for stage in stages:
+            self.stage_runs[stage] += 1
+        self.last_recomputed = stages
 
 
 # Default input values for consistency across versions
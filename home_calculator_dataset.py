@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Dataset Module
+Evaluates memory-mapped columnar datasets (one .npy file per input field)
+"""
+
+import os
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from home_calculator_batch import generate_complete_analysis_batch
+from home_calculator_core import (
+    DEFAULT_VALUES, FIDELITY_LEVELS, OPTIONAL_INPUT_DEFAULTS, REQUIRED_INPUTS, SUMMARY_COLUMNS
+)
+
+
+# Rows per batch evaluation: ~20 MB of summary-only working set, and large
+# enough that the per-call overhead of the batch engine is negligible
+DEFAULT_DATASET_CHUNK_SIZE = 32768
+
+COLUMN_EXTENSION = '.npy'
+
+# Output column -> dtype; 'winner' is stored as a flag instead of strings
+OUTPUT_COLUMNS = {
+    **{column: np.dtype(np.float64) for column in SUMMARY_COLUMNS if column != 'winner'},
+    'owning_wins': np.dtype(bool)
+}
+
+
+class ColumnFile:
+    """
+    One 1-D .npy column, mapped a row range at a time
+
+    Pages of a memory map count towards the process RSS for as long as the
+    map is open, so a single map over a large file grows the RSS with every
+    chunk touched. Each slice() call maps only the requested rows, and the
+    pages are released when the returned array is dropped.
+    """
+
+    def __init__(self, path: str):
+        header = np.load(path, mmap_mode='r')
+        if header.ndim != 1:
+            raise ValueError(f"{path}: expected a 1-D column, got shape {header.shape}")
+        self.path = path
+        self.dtype = header.dtype
+        self.rows = header.shape[0]
+        self.offset = header.offset
+        del header
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def slice(self, start: int, stop: int, writable: bool = False) -> np.ndarray:
+        """Memory-mapped view of rows [start, stop), zero-copy"""
+        return np.memmap(
+            self.path, dtype=self.dtype, mode='r+' if writable else 'r',
+            offset=self.offset + start * self.dtype.itemsize, shape=(stop - start,)
+        )
+
+    @classmethod
+    def create(cls, path: str, dtype: np.dtype, rows: int) -> 'ColumnFile':
+        """Create a .npy column of the given length, or reuse a matching existing one"""
+        if os.path.exists(path):
+            column = cls(path)
+            if column.dtype == dtype and column.rows == rows:
+                return column
+        np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(rows,))
+        return cls(path)
+
+
+def write_dataset(directory: str, columns: Dict[str, Any]) -> None:
+    """
+    Write a columnar dataset, one .npy file per column
+
+    Args:
+        directory: Dataset directory (created if missing)
+        columns: Column name -> 1-D array; all columns must have the same length
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All dataset columns must have the same length")
+    os.makedirs(directory, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(directory, name + COLUMN_EXTENSION), np.asarray(values))
+
+
+def open_dataset(directory: str) -> Dict[str, ColumnFile]:
+    """
+    Open every column of a dataset directory without reading it
+
+    Args:
+        directory: Directory of .npy files named after the column
+
+    Returns:
+        Column name -> ColumnFile, all of the same length
+    """
+    columns = {
+        name[:-len(COLUMN_EXTENSION)]: ColumnFile(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory)) if name.endswith(COLUMN_EXTENSION)
+    }
+    if not columns:
+        raise ValueError(f"No {COLUMN_EXTENSION} columns in {directory}")
+    lengths = {name: len(column) for name, column in columns.items()}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Dataset columns differ in length: {lengths}")
+    return columns
+
+
+def evaluate_dataset(
+    dataset_dir: str,
+    output_dir: str,
+    base_inputs: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_DATASET_CHUNK_SIZE,
+    fidelity: str = 'annual',
+    rows: Optional[Tuple[int, int]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze every row of a columnar dataset and write aligned result columns
+
+    Columns named after an input field (home_price.npy, monthly_rent.npy,
+    ...) vary per row; every other input comes from base_inputs and is
+    broadcast, so it costs no memory per row. Other columns (ZIP codes,
+    listing ids) are ignored. Each chunk is mapped straight into the batch
+    engine: float64 inputs (and int64 years, bool flags) are used in place,
+    other dtypes are converted one chunk at a time. Results go to one .npy
+    file per OUTPUT_COLUMNS entry in output_dir, where row i belongs to
+    dataset row i. Only one chunk of inputs and outputs is mapped at a time,
+    so peak memory depends on chunk_size, not on the dataset size.
+
+    Existing output columns of the right length are written in place, so
+    disjoint row ranges can be evaluated by separate processes.
+
+    Args:
+        dataset_dir: Directory of 1-D .npy columns
+        output_dir: Directory for the result columns (created if missing)
+        base_inputs: Inputs for fields without a dataset column, defaults to DEFAULT_VALUES
+        chunk_size: Rows per summary-only batch evaluation
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+        rows: Optional (start, stop) row range to evaluate, default all rows
+        progress: Called after every chunk with the current statistics
+
+    Returns:
+        Statistics dictionary with 'rows' (evaluated), 'total_rows', 'fields'
+        (inputs read from the dataset), 'chunks', 'elapsed' and 'rows_per_second'
+    """
+    if fidelity not in FIDELITY_LEVELS:
+        raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    dataset = open_dataset(dataset_dir)
+    input_fields = list(REQUIRED_INPUTS) + list(OPTIONAL_INPUT_DEFAULTS)
+    fields = [field for field in input_fields if field in dataset]
+    base = dict(DEFAULT_VALUES if base_inputs is None else base_inputs)
+    missing = [field for field in REQUIRED_INPUTS if field not in dataset and field not in base]
+    if missing:
+        raise KeyError(f"Missing required fields (no dataset column or base input): {', '.join(missing)}")
+
+    total_rows = len(next(iter(dataset.values())))
+    start, stop = rows if rows is not None else (0, total_rows)
+    if not 0 <= start <= stop <= total_rows:
+        raise ValueError(f"rows must satisfy 0 <= start <= stop <= {total_rows}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {
+        name: ColumnFile.create(os.path.join(output_dir, name + COLUMN_EXTENSION), dtype, total_rows)
+        for name, dtype in OUTPUT_COLUMNS.items()
+    }
+
+    start_time = time.perf_counter()
+    chunks = 0
+
+    def statistics() -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start_time
+        done = min(stop, start + chunks * chunk_size) - start
+        return {
+            'rows': done,
+            'total_rows': stop - start,
+            'fields': fields,
+            'chunks': chunks,
+            'elapsed': elapsed,
+            'rows_per_second': done / elapsed if elapsed > 0 else 0.0
+        }
+
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(stop, chunk_start + chunk_size)
+        batch = dict(base)
+        for field in fields:
+            batch[field] = dataset[field].slice(chunk_start, chunk_stop)
+        _, _, summary = generate_complete_analysis_batch(batch, include_yearly=False, fidelity=fidelity)
+        summary['owning_wins'] = summary['ownership_net_cost'] < summary['rent_net_cost']
+
+        for name, column in outputs.items():
+            target = column.slice(chunk_start, chunk_stop, writable=True)
+            target[:] = summary[name]
+            target.flush()
+            del target
+        chunks += 1
+        if progress is not None:
+            progress(statistics())
+
+    return statistics()
+
+
+def read_results(output_dir: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Memory-map result columns written by evaluate_dataset
+
+    Args:
+        output_dir: Result directory
+        columns: Column names to open, default every OUTPUT_COLUMNS entry
+
+    Returns:
+        Column name -> read-only memory-mapped array
+    """
+    return {
+        name: np.load(os.path.join(output_dir, name + COLUMN_EXTENSION), mmap_mode='r')
+        for name in (columns or OUTPUT_COLUMNS)
+    }
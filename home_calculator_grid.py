@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Grid Module
+Evaluates the cartesian product of input axes for heatmaps
+"""
+
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+from home_calculator_batch import generate_complete_analysis_batch
+from home_calculator_core import OPTIONAL_INPUT_DEFAULTS
+
+
+# Peak bytes per scenario of one chunk: ~630 measured for a summary-only batch
+# evaluation (independent of years) plus the grid index and axis value arrays
+BYTES_PER_SCENARIO = 1024
+
+DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024
+
+# Half-width of the default axis around the base value, per field
+DEFAULT_AXIS_SPANS = {
+    'years': 10,
+    'home_price': 500000,
+    'down_payment_pct': 15.0,
+    'apr': 2.0,
+    'property_tax_rate': 0.75,
+    'house_growth': 3.0,
+    'monthly_rent': 2000,
+    'rent_growth': 3.0,
+    'stock_growth': 4.0
+}
+
+# Lowest valid value per field for default axes
+AXIS_MINIMUMS = {
+    'years': 1,
+    'home_price': 50000,
+    'down_payment_pct': 0.0,
+    'apr': 0.1,
+    'property_tax_rate': 0.0,
+    'house_growth': -10.0,
+    'monthly_rent': 500,
+    'rent_growth': 0.0,
+    'stock_growth': 0.0
+}
+
+AXIS_MAXIMUMS = {
+    'years': 50,
+    'down_payment_pct': 100.0
+}
+
+
+def default_axis(field: str, inputs: Dict[str, Any], steps: int = 50) -> np.ndarray:
+    """
+    Evenly spaced axis centred on the base value of one field
+
+    Args:
+        field: Input field, one of DEFAULT_AXIS_SPANS
+        inputs: Base scenario inputs dictionary
+        steps: Number of points on the axis
+
+    Returns:
+        1-D array of axis values (unique integers for 'years')
+    """
+    base_value = inputs.get(field, OPTIONAL_INPUT_DEFAULTS.get(field))
+    span = DEFAULT_AXIS_SPANS[field]
+    low = max(base_value - span, AXIS_MINIMUMS.get(field, -np.inf))
+    high = min(base_value + span, AXIS_MAXIMUMS.get(field, np.inf))
+    if field == 'years':
+        return np.unique(np.linspace(low, high, steps).round().astype(np.int64))
+    return np.linspace(low, high, steps)
+
+
+def grid_sweep(
+    inputs: Dict[str, Any],
+    axes: Dict[str, Sequence[float]],
+    max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+    fidelity: str = 'annual'
+) -> Dict[str, Any]:
+    """
+    Evaluate every combination of the axis values around a base scenario
+
+    The grid is flattened and evaluated in summary-only batch chunks sized so
+    that one chunk's working set stays under max_memory_bytes. Only the dense
+    output matrices grow with the grid size.
+
+    Args:
+        inputs: Base scenario inputs dictionary
+        axes: Ordered mapping of input field -> axis values (two or more axes)
+        max_memory_bytes: Memory ceiling for one evaluation chunk
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+    Returns:
+        Dictionary with 'fields' (axis order), 'axes' (axis value arrays),
+        'difference' (ownership_net_cost - rent_net_cost) and 'owning_wins',
+        both dense arrays shaped by the axis lengths, plus 'evaluations' and
+        'chunks'
+    """
+    if len(axes) < 2:
+        raise ValueError("grid_sweep needs at least two axes")
+    fields = list(axes)
+    axis_values = [np.asarray(axes[field]) for field in fields]
+    if any(values.ndim != 1 or values.size == 0 for values in axis_values):
+        raise ValueError("Each axis must be a non-empty 1-D sequence")
+
+    shape = tuple(values.size for values in axis_values)
+    total = int(np.prod(shape))
+    chunk_size = max(1, max_memory_bytes // BYTES_PER_SCENARIO)
+
+    difference = np.empty(total)
+    chunks = 0
+    for start in range(0, total, chunk_size):
+        stop = min(total, start + chunk_size)
+        index = np.unravel_index(np.arange(start, stop), shape)
+        batch = dict(inputs)
+        for field, values, axis_index in zip(fields, axis_values, index):
+            batch[field] = values[axis_index]
+        _, _, summary = generate_complete_analysis_batch(batch, include_yearly=False, fidelity=fidelity)
+        difference[start:stop] = summary['ownership_net_cost'] - summary['rent_net_cost']
+        chunks += 1
+
+    difference = difference.reshape(shape)
+    return {
+        'fields': fields,
+        'axes': axis_values,
+        'difference': difference,
+        'owning_wins': difference < 0,
+        'evaluations': total,
+        'chunks': chunks
+    }
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Monte Carlo Module
+Simulates stochastic house, rent and stock growth on top of the batch engine
+"""
+
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from home_calculator_batch import GROWTH_FIELDS, generate_complete_analysis_batch
+
+
+# Yearly volatility (percentage points) of each growth rate
+DEFAULT_VOLATILITY = {
+    'house_growth': 5.0,
+    'rent_growth': 2.0,
+    'stock_growth': 15.0
+}
+
+# Correlation between yearly house, rent and stock growth, in GROWTH_FIELDS order
+DEFAULT_CORRELATION = (
+    (1.0, 0.5, 0.2),
+    (0.5, 1.0, 0.1),
+    (0.2, 0.1, 1.0)
+)
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+DISTRIBUTIONS = ('normal', 'lognormal')
+
+
+class GrowthModel:
+    """
+    Joint distribution of yearly house, rent and stock growth rates
+
+    Each year's three rates are drawn together from correlated standard
+    normals. With 'normal' the rates themselves are normal (floored at -99%
+    so values cannot go negative); with 'lognormal' the growth factors are
+    lognormal with the requested mean and volatility.
+    """
+
+    def __init__(
+        self,
+        means: Dict[str, float],
+        volatility: Optional[Dict[str, float]] = None,
+        correlation: Optional[Sequence[Sequence[float]]] = None,
+        distribution: str = 'normal'
+    ):
+        """
+        Args:
+            means: Expected yearly growth (percentage) for each of GROWTH_FIELDS
+            volatility: Yearly standard deviation (percentage points) per field
+            correlation: 3x3 correlation matrix in GROWTH_FIELDS order
+            distribution: 'normal' or 'lognormal'
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {', '.join(DISTRIBUTIONS)}")
+        volatility = {**DEFAULT_VOLATILITY, **(volatility or {})}
+        self.means = np.array([means[field] for field in GROWTH_FIELDS], dtype=np.float64)
+        self.volatility = np.array([volatility[field] for field in GROWTH_FIELDS], dtype=np.float64)
+        self.correlation = np.array(correlation if correlation is not None else DEFAULT_CORRELATION, dtype=np.float64)
+        self.distribution = distribution
+
+        if self.correlation.shape != (len(GROWTH_FIELDS), len(GROWTH_FIELDS)):
+            raise ValueError("correlation must be a 3x3 matrix")
+        if not np.allclose(self.correlation, self.correlation.T) or not np.allclose(np.diag(self.correlation), 1.0):
+            raise ValueError("correlation must be symmetric with a unit diagonal")
+        try:
+            self._cholesky = np.linalg.cholesky(self.correlation)
+        except np.linalg.LinAlgError:
+            raise ValueError("correlation must be positive definite")
+
+    @classmethod
+    def from_inputs(cls, inputs: Dict[str, Any], **kwargs: Any) -> 'GrowthModel':
+        """Build a model centred on the constant growth rates of an inputs dict"""
+        means = {
+            'house_growth': inputs['house_growth'],
+            'rent_growth': inputs['rent_growth'],
+            'stock_growth': inputs.get('stock_growth', 8.0)
+        }
+        return cls(means, **kwargs)
+
+    def sample(self, rng: np.random.Generator, paths: int, years: int) -> Dict[str, np.ndarray]:
+        """
+        Draw yearly growth paths
+
+        Args:
+            rng: NumPy random generator to draw from
+            paths: Number of paths
+            years: Number of years per path
+
+        Returns:
+            Dictionary mapping each of GROWTH_FIELDS to a (paths, years) array
+            of yearly growth rates (percentage)
+        """
+        shocks = rng.standard_normal((paths, years, len(GROWTH_FIELDS))) @ self._cholesky.T
+        mean = self.means / 100
+        vol = self.volatility / 100
+
+        if self.distribution == 'normal':
+            rates = np.maximum(mean + vol * shocks, -0.99)
+        else:
+            sigma_sq = np.log1p((vol / (1 + mean))**2)
+            mu = np.log1p(mean) - sigma_sq / 2
+            rates = np.expm1(mu + np.sqrt(sigma_sq) * shocks)
+
+        return {field: rates[:, :, i] * 100 for i, field in enumerate(GROWTH_FIELDS)}
+
+
+def simulate(
+    inputs: Dict[str, Any],
+    paths: int = 100000,
+    seed: Optional[int] = None,
+    growth_model: Optional[GrowthModel] = None,
+    chunk_size: int = 10000,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> Dict[str, Any]:
+    """
+    Run a Monte Carlo analysis of one scenario under random growth paths
+
+    Paths are simulated in chunks of chunk_size, each with its own child
+    stream of the seed, so peak memory scales with chunk_size * years rather
+    than paths * years. A given (seed, chunk_size) always reproduces the same
+    results.
+
+    Args:
+        inputs: Dictionary containing all input parameters
+        paths: Number of simulated paths
+        seed: Seed for the random streams (None = fresh entropy)
+        growth_model: Distribution of yearly growth rates; defaults to
+            GrowthModel.from_inputs(inputs)
+        chunk_size: Paths simulated per vectorized chunk
+        percentiles: Percentiles to report for each net cost
+
+    Returns:
+        Dictionary with 'paths', 'years', 'seed', percentile tables for
+        'ownership_net_cost', 'rent_net_cost' and 'net_cost_difference'
+        (ownership minus rent), their means, and 'probability_ownership_wins'
+    """
+    if paths < 1:
+        raise ValueError("paths must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    growth_model = growth_model or GrowthModel.from_inputs(inputs)
+    years = int(inputs['years'])
+
+    seed_sequence = np.random.SeedSequence(seed)
+    chunk_count = -(-paths // chunk_size)
+    streams = seed_sequence.spawn(chunk_count)
+
+    ownership_net_cost = np.empty(paths)
+    rent_net_cost = np.empty(paths)
+    for chunk, stream in enumerate(streams):
+        start = chunk * chunk_size
+        stop = min(paths, start + chunk_size)
+        rng = np.random.default_rng(stream)
+        growth_paths = growth_model.sample(rng, stop - start, years)
+
+        # Scalars broadcast against the chunk length set by the growth paths
+        inputs_batch = dict(inputs, years=np.full(stop - start, years))
+        _, _, summary = generate_complete_analysis_batch(
+            inputs_batch, include_yearly=False, growth_paths=growth_paths
+        )
+        ownership_net_cost[start:stop] = summary['ownership_net_cost']
+        rent_net_cost[start:stop] = summary['rent_net_cost']
+
+    difference = ownership_net_cost - rent_net_cost
+
+    def percentile_table(values):
+        return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
+
+    return {
+        'paths': paths,
+        'years': years,
+        'seed': seed_sequence.entropy,
+        'ownership_net_cost': percentile_table(ownership_net_cost),
+        'rent_net_cost': percentile_table(rent_net_cost),
+        'net_cost_difference': percentile_table(difference),
+        'mean_ownership_net_cost': float(ownership_net_cost.mean()),
+        'mean_rent_net_cost': float(rent_net_cost.mean()),
+        'probability_ownership_wins': float(np.mean(ownership_net_cost < rent_net_cost))
+    }
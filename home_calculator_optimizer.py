@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Optimizer Module
+Finds the down payment that minimizes the cost of owning
+"""
+
+import math
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from home_calculator_batch import batch_size, generate_complete_analysis_batch, normalize_batch, subset_batch
+
+
+DEFAULT_BOUNDS = (0.0, 100.0)
+
+DEFAULT_GRID_POINTS = 21
+
+# Quantities that can be minimized, computed from a batch summary
+OBJECTIVES = {
+    'ownership_net_cost': lambda summary: summary['ownership_net_cost'],
+    'net_cost_difference': lambda summary: summary['ownership_net_cost'] - summary['rent_net_cost']
+}
+
+# 1 / golden ratio: each golden-section step keeps this fraction of the bracket
+INVERSE_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def _objective_values(
+    batch: Dict[str, np.ndarray],
+    objective: str,
+    down_payment_pct: np.ndarray,
+    fidelity: str
+) -> np.ndarray:
+    """Objective with down_payment_pct set to the given values, summary only"""
+    trial = dict(batch)
+    trial['down_payment_pct'] = down_payment_pct
+    _, _, summary = generate_complete_analysis_batch(trial, include_yearly=False, fidelity=fidelity)
+    return OBJECTIVES[objective](summary)
+
+
+def optimize_down_payment(
+    inputs_batch: Dict[str, Any],
+    bounds: Optional[Tuple[float, float]] = None,
+    cash_on_hand: Optional[Any] = None,
+    objective: str = 'ownership_net_cost',
+    grid_points: int = DEFAULT_GRID_POINTS,
+    xtol: float = 0.01,
+    max_iterations: int = 100,
+    fidelity: str = 'annual'
+) -> Dict[str, Any]:
+    """
+    Find the down payment percentage that minimizes the objective
+
+    Every scenario is optimized at once. A coarse grid over each scenario's
+    bounds is evaluated in one summary-only batch call. Golden-section search
+    then refines the bracket around each scenario's best grid point, and
+    every refinement step is one batch call over the unfinished scenarios.
+    The down payment is paid in cash at purchase, so cash_on_hand caps it
+    at 100 * cash_on_hand / home_price percent.
+
+    Args:
+        inputs_batch: Struct-of-arrays of scenarios (a single inputs dict also works)
+        bounds: (low, high) down payment percentage range, defaults to DEFAULT_BOUNDS
+        cash_on_hand: Optional cash available for the down payment, a scalar
+            or one value per scenario
+        objective: Quantity to minimize, one of OBJECTIVES
+        grid_points: Number of coarse grid points per scenario (at least 3)
+        xtol: Stop once the bracket is narrower than this (percentage points)
+        max_iterations: Upper bound on golden-section iterations
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+    Returns:
+        Dictionary with 'objective', 'down_payment_pct' (optimum per scenario,
+        NaN when infeasible), 'value' (objective at the optimum), 'cash_required',
+        'feasible' (the cash constraint leaves some down payment within bounds),
+        'upper_bound' (effective upper bound after the cash constraint),
+        'at_bound' (optimum within xtol of a bound), 'iterations' and
+        'evaluations' (scenario evaluations performed)
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {', '.join(OBJECTIVES)}")
+    if grid_points < 3:
+        raise ValueError("grid_points must be at least 3")
+    low, high = bounds if bounds is not None else DEFAULT_BOUNDS
+    if not low < high:
+        raise ValueError("bounds must satisfy low < high")
+
+    batch = normalize_batch(inputs_batch)
+    n = batch_size(batch)
+    home_price = batch['home_price']
+
+    lower = np.full(n, float(low))
+    upper = np.full(n, float(high))
+    if cash_on_hand is not None:
+        cash = np.broadcast_to(np.asarray(cash_on_hand, dtype=np.float64), (n,))
+        positive_price = home_price > 0
+        affordable = np.where(positive_price, 100 * cash / np.where(positive_price, home_price, 1.0), np.inf)
+        upper = np.minimum(upper, affordable)
+    feasible = upper >= lower
+
+    down_payment_pct = np.full(n, np.nan)
+    value = np.full(n, np.nan)
+    solvable = np.flatnonzero(feasible)
+    m = solvable.size
+    evaluations = 0
+    iterations = 0
+    if m:
+        # Coarse grid: all scenarios x grid points in one batch call
+        lo, hi = lower[solvable], upper[solvable]
+        grid = lo[:, None] + (hi - lo)[:, None] * np.linspace(0, 1, grid_points)
+        grid_batch = {field: np.repeat(values, grid_points) for field, values in subset_batch(batch, solvable).items()}
+        grid_values = _objective_values(grid_batch, objective, grid.ravel(), fidelity).reshape(m, grid_points)
+        evaluations += m * grid_points
+
+        rows = np.arange(m)
+        best = np.argmin(grid_values, axis=1)
+        best_x = grid[rows, best]
+        best_f = grid_values[rows, best]
+
+        # Golden-section search inside the neighbouring grid cells
+        a = grid[rows, np.maximum(best - 1, 0)]
+        b = grid[rows, np.minimum(best + 1, grid_points - 1)]
+        c = b - INVERSE_GOLDEN * (b - a)
+        d = a + INVERSE_GOLDEN * (b - a)
+        solvable_batch = subset_batch(batch, solvable)
+        both = _objective_values(
+            {field: np.concatenate([values, values]) for field, values in solvable_batch.items()},
+            objective, np.concatenate([c, d]), fidelity
+        )
+        fc, fd = both[:m], both[m:]
+        evaluations += 2 * m
+
+        active = np.flatnonzero(b - a > xtol)
+        while active.size and iterations < max_iterations:
+            iterations += 1
+            ai, bi, ci, di = a[active], b[active], c[active], d[active]
+            fci, fdi = fc[active], fd[active]
+
+            # Minimum in [a, d] when f(c) < f(d): drop (d, b], else drop [a, c)
+            keep_left = fci < fdi
+            ai = np.where(keep_left, ai, ci)
+            bi = np.where(keep_left, di, bi)
+            next_c = np.where(keep_left, bi - INVERSE_GOLDEN * (bi - ai), di)
+            next_d = np.where(keep_left, ci, ai + INVERSE_GOLDEN * (bi - ai))
+            x = np.where(keep_left, next_c, next_d)
+
+            fx = _objective_values(subset_batch(solvable_batch, active), objective, x, fidelity)
+            evaluations += active.size
+
+            a[active], b[active] = ai, bi
+            c[active], d[active] = next_c, next_d
+            fc[active] = np.where(keep_left, fx, fdi)
+            fd[active] = np.where(keep_left, fci, fx)
+
+            active = active[bi - ai > xtol]
+
+        # The search can only improve on the grid; keep the grid point otherwise
+        use_c = (fc <= fd) & (fc < best_f)
+        use_d = ~use_c & (fd < best_f)
+        down_payment_pct[solvable] = np.where(use_c, c, np.where(use_d, d, best_x))
+        value[solvable] = np.where(use_c, fc, np.where(use_d, fd, best_f))
+
+    at_bound = feasible & (
+        (np.abs(down_payment_pct - lower) <= xtol) | (np.abs(down_payment_pct - upper) <= xtol)
+    )
+    return {
+        'objective': objective,
+        'down_payment_pct': down_payment_pct,
+        'value': value,
+        'cash_required': home_price * down_payment_pct / 100,
+        'feasible': feasible,
+        'upper_bound': upper,
+        'at_bound': at_bound,
+        'iterations': iterations,
+        'evaluations': evaluations
+    }
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Results Module
+Out-of-core store for per-year sweep results, memory-mapped as (scenario, year)
+"""
+
+import json
+import time
+from typing import Dict, Any, Callable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from home_calculator_batch import batch_size, generate_complete_analysis_batch, normalize_batch
+from home_calculator_core import FIDELITY_LEVELS, MORTGAGE_COLUMNS, RENT_COLUMNS, STOCK_COLUMNS
+
+
+MAGIC = b'HCYEARS\x00'
+FORMAT_VERSION = 1
+
+# The JSON header is padded to a multiple of this, so every column starts page aligned
+HEADER_ALIGNMENT = 4096
+
+# Every yearly table column except 'Year', which is the second axis itself
+DEFAULT_COLUMNS = tuple(
+    column for column in MORTGAGE_COLUMNS + RENT_COLUMNS + STOCK_COLUMNS if column != 'Year'
+)
+
+# Scenarios per chunk when sweeping or aggregating: one 50-year batch call with
+# yearly columns peaks at ~40 MB, and one mapped float64 column block is 2 MB
+DEFAULT_RESULTS_CHUNK_SIZE = 5000
+
+YearValues = Union[str, Callable[[Dict[str, np.ndarray]], np.ndarray]]
+
+
+def _header_bytes(header: Dict[str, Any], reserve: int = 0) -> bytes:
+    """Magic, 8-byte header length and JSON, padded to HEADER_ALIGNMENT"""
+    text = json.dumps(header).encode('utf-8')
+    length = len(MAGIC) + 8 + len(text) + reserve
+    padded = -(-length // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+    return MAGIC + padded.to_bytes(8, 'little') + text + b' ' * (padded - len(MAGIC) - 8 - len(text))
+
+
+class YearlyResultStore:
+    """
+    Per-year result columns of many scenarios in one preallocated file
+
+    The file starts with a JSON header (scenarios, years, dtype, columns and
+    free-form metadata), followed by one C-ordered (scenarios, years) block
+    per column. Years past a scenario's horizon hold NaN, as in the batch
+    engine's yearly columns.
+
+    Nothing is read until it is asked for: column() maps a whole column
+    lazily, read() copies a slice, and the chunked readers map one block of
+    scenarios at a time and drop it before the next, so streaming over a
+    file much larger than RAM keeps the RSS flat.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a yearly result store")
+            self.header_size = int.from_bytes(handle.read(8), 'little')
+            header = json.loads(handle.read(self.header_size - len(MAGIC) - 8).decode('utf-8'))
+        if header['version'] > FORMAT_VERSION:
+            raise ValueError(f"{path} uses store format {header['version']}, newer than {FORMAT_VERSION}")
+        self.scenarios = header['scenarios']
+        self.years = header['years']
+        self.dtype = np.dtype(header['dtype'])
+        self.columns = list(header['columns'])
+        self.metadata = header['metadata']
+        self._column_bytes = self.scenarios * self.years * self.dtype.itemsize
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        scenarios: int,
+        years: int,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        dtype: Any = np.float64,
+        metadata: Optional[Dict[str, Any]] = None,
+        metadata_reserve: int = HEADER_ALIGNMENT
+    ) -> 'YearlyResultStore':
+        """
+        Preallocate a store file, overwriting any existing one
+
+        The data region is allocated sparsely and filled with NaN as scenarios
+        are written, so creating a store for 10M scenarios is instant.
+
+        Args:
+            path: Store file
+            scenarios: Number of scenarios (rows)
+            years: Years per scenario (the longest horizon)
+            columns: Yearly column names, default DEFAULT_COLUMNS
+            dtype: Floating point storage type (float32 halves the file size)
+            metadata: JSON-serializable information kept in the header
+            metadata_reserve: Spare header bytes for later update_metadata() calls
+
+        Returns:
+            Writable store
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'f':
+            raise ValueError("Result stores hold floating point values (NaN marks years past the horizon)")
+        if scenarios < 0 or years < 1:
+            raise ValueError("A result store needs scenarios >= 0 and years >= 1")
+        if len(set(columns)) != len(columns):
+            raise ValueError("Column names must be unique")
+        header = {
+            'version': FORMAT_VERSION,
+            'scenarios': int(scenarios),
+            'years': int(years),
+            'dtype': dtype.str,
+            'columns': list(columns),
+            'metadata': dict(metadata or {})
+        }
+        prefix = _header_bytes(header, metadata_reserve)
+        with open(path, 'wb') as handle:
+            handle.write(prefix)
+            handle.truncate(len(prefix) + len(columns) * scenarios * years * dtype.itemsize)
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> 'YearlyResultStore':
+        """Open an existing store; nothing beyond the header is read"""
+        return cls(path, writable=writable)
+
+    def __len__(self) -> int:
+        return self.scenarios
+
+    def __repr__(self) -> str:
+        return (
+            f"YearlyResultStore({self.path!r}, scenarios={self.scenarios}, years={self.years}, "
+            f"dtype={self.dtype.name}, columns={len(self.columns)})"
+        )
+
+    def _map(self, column: str, start: int, stop: int, writable: bool = False) -> np.memmap:
+        """Map rows [start, stop) of one column as a (stop - start, years) array"""
+        if column not in self.columns:
+            raise KeyError(f"Unknown column '{column}'")
+        if writable and not self.writable:
+            raise PermissionError(f"{self.path} was opened read-only")
+        if stop == start:
+            # Zero-length maps are not allowed
+            return np.empty((0, self.years), dtype=self.dtype)
+        offset = (
+            self.header_size + self.columns.index(column) * self._column_bytes
+            + start * self.years * self.dtype.itemsize
+        )
+        return np.memmap(
+            self.path, dtype=self.dtype, mode='r+' if writable else 'r',
+            offset=offset, shape=(stop - start, self.years)
+        )
+
+    def column(self, name: str) -> np.memmap:
+        """
+        Whole column as a lazy read-only (scenarios, years) memory map
+
+        Slicing it only reads the touched pages, but they stay resident while
+        the map is alive; use iter_chunks() or year_statistics() to stream.
+        """
+        return self._map(name, 0, self.scenarios)
+
+    def read(self, name: str, scenarios: Any = slice(None), years: Any = slice(None)) -> np.ndarray:
+        """
+        Copy a slice of one column into memory
+
+        Args:
+            name: Column name
+            scenarios: Scenario index (int, slice or index array)
+            years: Year index (0 is year 1)
+
+        Returns:
+            In-memory array of the selected values
+        """
+        values = self.column(name)
+        return np.array(values[scenarios, years])
+
+    def write(self, start: int, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Write the yearly columns of scenarios [start, start + n)
+
+        Args:
+            start: First scenario row
+            columns: Column name -> (n, k) array, e.g. the mortgage and rent
+                columns of one batch call. Years k and above are written as NaN.
+                Store columns that are not given are left untouched.
+        """
+        for name, values in columns.items():
+            if name not in self.columns:
+                continue
+            values = np.asarray(values)
+            stop = start + values.shape[0]
+            if not 0 <= start <= stop <= self.scenarios or values.shape[1] > self.years:
+                raise ValueError(
+                    f"Block of shape {values.shape} at row {start} does not fit a "
+                    f"({self.scenarios}, {self.years}) store"
+                )
+            target = self._map(name, start, stop, writable=True)
+            target[:, :values.shape[1]] = values
+            target[:, values.shape[1]:] = np.nan
+            target.flush()
+            del target
+
+    def update_metadata(self, **values: Any) -> None:
+        """Merge values into the header metadata, rewriting the header in place"""
+        if not self.writable:
+            raise PermissionError(f"{self.path} was opened read-only")
+        metadata = dict(self.metadata, **values)
+        header = {
+            'version': FORMAT_VERSION,
+            'scenarios': self.scenarios,
+            'years': self.years,
+            'dtype': self.dtype.str,
+            'columns': self.columns,
+            'metadata': metadata
+        }
+        text = json.dumps(header).encode('utf-8')
+        space = self.header_size - len(MAGIC) - 8
+        if len(text) > space:
+            raise ValueError(f"Metadata needs {len(text)} header bytes but only {space} are reserved")
+        with open(self.path, 'r+b') as handle:
+            handle.seek(len(MAGIC) + 8)
+            handle.write(text + b' ' * (space - len(text)))
+        self.metadata = metadata
+
+    def iter_chunks(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = DEFAULT_RESULTS_CHUNK_SIZE,
+        rows: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """
+        Stream blocks of scenarios, mapping one block at a time
+
+        Args:
+            columns: Columns to map, default all
+            chunk_size: Scenarios per block
+            rows: Optional (start, stop) scenario range
+
+        Yields:
+            (start row, column name -> (block, years) read-only memory map);
+            the maps are released when the next block is produced
+        """
+        names = list(columns) if columns is not None else self.columns
+        start, stop = rows if rows is not None else (0, self.scenarios)
+        for chunk_start in range(start, stop, chunk_size):
+            chunk_stop = min(stop, chunk_start + chunk_size)
+            yield chunk_start, {name: self._map(name, chunk_start, chunk_stop) for name in names}
+
+    def year_statistics(
+        self,
+        values: YearValues,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = DEFAULT_RESULTS_CHUNK_SIZE
+    ) -> Dict[str, np.ndarray]:
+        """
+        Per-year count, mean, standard deviation, min and max in one streaming pass
+
+        Chunk statistics are merged with Chan's parallel update, so the mean
+        and variance stay accurate over any number of chunks. NaN (years past
+        a scenario's horizon) is skipped.
+
+        Args:
+            values: Column name, or a function of a column name -> block dict
+                returning a (block, years) array, e.g. a yearly net cost
+            columns: Columns the function reads (ignored for a column name)
+            chunk_size: Scenarios per mapped block
+
+        Returns:
+            Dictionary of 'count', 'mean', 'std', 'min' and 'max' arrays of
+            length years (NaN for years no scenario reaches)
+        """
+        if isinstance(values, str):
+            name = values
+            columns = [name]
+            function = lambda blocks: blocks[name]
+        else:
+            if not columns:
+                raise ValueError("columns must list the columns the function reads")
+            function = values
+
+        count = np.zeros(self.years)
+        mean = np.zeros(self.years)
+        m2 = np.zeros(self.years)
+        minimum = np.full(self.years, np.inf)
+        maximum = np.full(self.years, -np.inf)
+        for _, blocks in self.iter_chunks(columns, chunk_size):
+            block = np.asarray(function(blocks), dtype=np.float64)
+            valid = ~np.isnan(block)
+            block_count = valid.sum(axis=0)
+            block_sum = np.where(valid, block, 0.0).sum(axis=0)
+            present = block_count > 0
+            block_mean = np.divide(block_sum, block_count, out=np.zeros(self.years), where=present)
+            block_m2 = np.where(valid, (block - block_mean) ** 2, 0.0).sum(axis=0)
+
+            total = count + block_count
+            delta = block_mean - mean
+            safe_total = np.where(total > 0, total, 1.0)
+            mean = mean + delta * block_count / safe_total
+            m2 = m2 + block_m2 + delta ** 2 * count * block_count / safe_total
+            count = total
+            minimum = np.fmin(minimum, np.where(valid, block, np.inf).min(axis=0))
+            maximum = np.fmax(maximum, np.where(valid, block, -np.inf).max(axis=0))
+            del blocks, block
+
+        reached = count > 0
+        return {
+            'count': count.astype(np.int64),
+            'mean': np.where(reached, mean, np.nan),
+            'std': np.where(reached, np.sqrt(m2 / np.where(reached, count, 1.0)), np.nan),
+            'min': np.where(reached, minimum, np.nan),
+            'max': np.where(reached, maximum, np.nan)
+        }
+
+
+# Columns read by yearly_net_cost
+YEARLY_NET_COST_COLUMNS = ('Interest Paid', 'Property Tax', 'Interest Tax Savings', 'Annual Rent')
+
+
+def yearly_net_cost(blocks: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Yearly cost of owning minus renting for year_statistics()
+
+    Mortgage interest and property tax after the interest tax savings, less
+    the year's rent. Reads 'Interest Paid', 'Property Tax', 'Interest Tax
+    Savings' and 'Annual Rent'.
+    """
+    return blocks['Interest Paid'] + blocks['Property Tax'] - blocks['Interest Tax Savings'] - blocks['Annual Rent']
+
+
+def sweep_to_store(
+    inputs_batch: Dict[str, Any],
+    path: str,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+    dtype: Any = np.float64,
+    chunk_size: int = DEFAULT_RESULTS_CHUNK_SIZE,
+    fidelity: str = 'annual',
+    metadata: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> YearlyResultStore:
+    """
+    Evaluate a batch chunk by chunk and write every yearly column to a store
+
+    Only one chunk of yearly columns exists in memory at a time; the store
+    file holds the full (scenarios, years) results.
+
+    Args:
+        inputs_batch: Struct-of-arrays of scenarios (scalars are broadcast)
+        path: Store file to create
+        columns: Yearly columns to keep, default DEFAULT_COLUMNS
+        dtype: Storage type of the values
+        chunk_size: Scenarios per batch evaluation
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+        metadata: Extra header metadata; fidelity, completion and timing are added
+        progress: Called after every chunk with 'rows', 'total_rows', 'elapsed'
+            and 'rows_per_second'
+
+    Returns:
+        The writable store
+    """
+    if fidelity not in FIDELITY_LEVELS:
+        raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    unknown = [column for column in columns if column not in DEFAULT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown yearly columns: {', '.join(unknown)}")
+
+    batch = normalize_batch(inputs_batch)
+    n = batch_size(batch)
+    store = YearlyResultStore.create(
+        path, n, int(batch['years'].max()) if n else 1, columns, dtype,
+        dict(metadata or {}, fidelity=fidelity, complete=False)
+    )
+
+    start_time = time.perf_counter()
+
+    def statistics(rows: int) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start_time
+        return {
+            'rows': rows,
+            'total_rows': n,
+            'elapsed': elapsed,
+            'rows_per_second': rows / elapsed if elapsed > 0 else 0.0
+        }
+
+    for start in range(0, n, chunk_size):
+        stop = min(n, start + chunk_size)
+        chunk = {field: values[start:stop] for field, values in batch.items()}
+        mortgage_columns, rent_columns, _ = generate_complete_analysis_batch(chunk, fidelity=fidelity)
+        store.write(start, {**mortgage_columns, **rent_columns})
+        del mortgage_columns, rent_columns
+        if progress is not None:
+            progress(statistics(stop))
+
+    store.update_metadata(complete=True, elapsed=round(time.perf_counter() - start_time, 3))
+    return store
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Sensitivity Module
+Tornado analysis of which inputs drive the ownership vs rent decision
+"""
+
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from home_calculator_batch import generate_complete_analysis_batch
+from home_calculator_core import DEFAULT_VALUES, REQUIRED_INPUTS, OPTIONAL_INPUT_DEFAULTS, BOOLEAN_INPUTS
+
+
+# Default +/- step for every numeric input the analysis reads (same units as the input)
+DEFAULT_PERTURBATIONS = {
+    'years': 1,
+    'home_price': 150000,
+    'down_payment_pct': 5.0,
+    'apr': 0.5,
+    'property_tax_rate': 0.25,
+    'property_tax_growth': 1.0,
+    'house_growth': 1.0,
+    'maintenance_annual': 2000,
+    'brokerage_cost': 1.0,
+    'registration_cost': 0.5,
+    'monthly_rent': 500,
+    'rent_growth': 1.0,
+    'tax_rate': 5.0,
+    'standard_deduction': 5000,
+    'stock_growth': 1.0,
+    'capital_gains_tax_rate': 5.0
+}
+
+# Lowest meaningful value per field; fields not listed may go negative. A
+# bound only clamps variants of a base value that is itself within it
+FIELD_MINIMUMS = {
+    'years': 1,
+    'home_price': 0,
+    'down_payment_pct': 0,
+    'apr': 0,
+    'property_tax_rate': 0,
+    'property_tax_growth': 0,
+    'maintenance_annual': 0,
+    'brokerage_cost': 0,
+    'registration_cost': 0,
+    'monthly_rent': 0,
+    'rent_growth': 0,
+    'tax_rate': 0,
+    'standard_deduction': 0,
+    'stock_growth': 0,
+    'capital_gains_tax_rate': 0
+}
+
+FIELD_MAXIMUMS = {
+    'years': 50,
+    'down_payment_pct': 100
+}
+
+
+def sensitivity_fields() -> List[str]:
+    """Numeric fields of DEFAULT_VALUES that feed the analysis (income fields never do)"""
+    analysis_fields = set(REQUIRED_INPUTS) | set(OPTIONAL_INPUT_DEFAULTS)
+    return [
+        field for field, value in DEFAULT_VALUES.items()
+        if field in analysis_fields and field not in BOOLEAN_INPUTS and not isinstance(value, bool)
+    ]
+
+
+def tornado_analysis(
+    inputs: Dict[str, Any],
+    perturbations: Optional[Dict[str, float]] = None,
+    fidelity: str = 'annual'
+) -> List[Dict[str, Any]]:
+    """
+    Rank inputs by how much a +/- step moves ownership_net_cost - rent_net_cost
+
+    Builds the base scenario plus a low and a high variant for every numeric
+    field and evaluates all 2N+1 scenarios in one batched pass.
+
+    Args:
+        inputs: Base scenario inputs dictionary
+        perturbations: Step per field, overriding DEFAULT_PERTURBATIONS. Fields
+            mapped to 0 or None are skipped.
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+
+    Returns:
+        List of rows sorted by 'swing' (largest first), each with 'field',
+        'base_value', 'low_value', 'high_value', 'low_difference',
+        'high_difference', 'base_difference' and 'swing'. Differences are
+        ownership_net_cost - rent_net_cost, so negative favours owning.
+    """
+    steps = {**DEFAULT_PERTURBATIONS, **(perturbations or {})}
+    fields = [field for field in sensitivity_fields() if steps.get(field)]
+
+    variants = [dict(inputs)]
+    bounds = []
+    for field in fields:
+        base_value = inputs.get(field, OPTIONAL_INPUT_DEFAULTS.get(field))
+        minimum = FIELD_MINIMUMS.get(field, -np.inf)
+        maximum = FIELD_MAXIMUMS.get(field, np.inf)
+        low_value = base_value - steps[field]
+        high_value = base_value + steps[field]
+        if base_value >= minimum:
+            low_value = max(low_value, minimum)
+        if base_value <= maximum:
+            high_value = min(high_value, maximum)
+        bounds.append((field, base_value, low_value, high_value))
+        variants.append(dict(inputs, **{field: low_value}))
+        variants.append(dict(inputs, **{field: high_value}))
+
+    batch = {
+        field: np.array([variant.get(field, OPTIONAL_INPUT_DEFAULTS.get(field)) for variant in variants])
+        for field in list(REQUIRED_INPUTS) + list(OPTIONAL_INPUT_DEFAULTS)
+    }
+    _, _, summary = generate_complete_analysis_batch(batch, include_yearly=False, fidelity=fidelity)
+    difference = summary['ownership_net_cost'] - summary['rent_net_cost']
+    base_difference = float(difference[0])
+
+    rows = []
+    for i, (field, base_value, low_value, high_value) in enumerate(bounds):
+        low_difference = float(difference[1 + 2 * i])
+        high_difference = float(difference[2 + 2 * i])
+        rows.append({
+            'field': field,
+            'base_value': base_value,
+            'low_value': low_value,
+            'high_value': high_value,
+            'low_difference': low_difference,
+            'high_difference': high_difference,
+            'base_difference': base_difference,
+            'swing': abs(high_difference - low_difference)
+        })
+
+    rows.sort(key=lambda row: row['swing'], reverse=True)
+    return rows
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Server Module
+Asyncio HTTP JSON API that coalesces concurrent requests into batch evaluations
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from home_calculator_batch import generate_complete_analysis_batch, summary_row, yearly_table
+from home_calculator_core import DEFAULT_VALUES, FIDELITY_LEVELS, HomeCalculatorCore
+from home_calculator_stream import parse_scenarios
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Extra time a single request waits for others to share its batch evaluation
+# (0: dispatch as soon as a worker is free, batching whatever queued meanwhile)
+DEFAULT_COALESCE_WINDOW = 0.0
+DEFAULT_MAX_BATCH = 512
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+JSON_CONTENT_TYPE = 'application/json'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+STATUS_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class RequestError(Exception):
+    """Client error reported as a JSON error response"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _dumps(payload: Any) -> bytes:
+    """Compact JSON encoding of a response body"""
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def evaluate_requests(inputs_list: List[Dict[str, Any]], fidelity: str, summary_only: bool) -> List[Tuple[int, bytes]]:
+    """
+    Validate and evaluate a group of scenarios in one batch call
+
+    Runs in a worker, so responses are serialized here as well and only
+    bytes travel back to the event loop.
+
+    Args:
+        inputs_list: Inputs dictionaries, one per response
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+        summary_only: Whether to skip the yearly tables
+
+    Returns:
+        One (HTTP status, JSON body) per input: {"summary": ...} plus
+        "mortgage_data" and "rent_data" row lists, or {"error": ...}
+    """
+    batch, valid, errors = parse_scenarios(inputs_list)
+    responses = [(400, _dumps({'error': errors[i]})) if i in errors else None for i in range(len(inputs_list))]
+    if valid:
+        mortgage_columns, rent_columns, summary = generate_complete_analysis_batch(
+            batch, include_yearly=not summary_only, fidelity=fidelity
+        )
+        for position, i in enumerate(valid):
+            payload = {'summary': summary_row(summary, position)}
+            if not summary_only:
+                payload['mortgage_data'] = yearly_table(mortgage_columns, position).to_rows()
+                payload['rent_data'] = yearly_table(rent_columns, position).to_rows()
+            responses[i] = (200, _dumps(payload))
+    return responses
+
+
+# Set in process pool workers, whose metrics must travel back with each result
+_drain_worker_metrics = False
+
+
+def _enable_worker_metrics() -> None:
+    """Process pool initializer: record metrics in the worker for evaluate_in_worker to drain"""
+    global _drain_worker_metrics
+    _drain_worker_metrics = True
+    HomeCalculatorCore.enable_metrics()
+
+
+def evaluate_in_worker(
+    inputs_list: List[Dict[str, Any]],
+    fidelity: str,
+    summary_only: bool
+) -> Tuple[List[Tuple[int, bytes]], Optional[Dict[str, Any]]]:
+    """evaluate_requests plus the worker process's metrics recorded since the last call"""
+    responses = evaluate_requests(inputs_list, fidelity, summary_only)
+    metrics = HomeCalculatorCore.analysis_metrics
+    return responses, metrics.drain() if _drain_worker_metrics and metrics is not None else None
+
+
+async def _evaluate_group(
+    executor: Executor,
+    inputs_list: List[Dict[str, Any]],
+    fidelity: str,
+    summary_only: bool
+) -> List[Tuple[int, bytes]]:
+    """Run evaluate_requests in the pool, merging worker metrics into this process"""
+    loop = asyncio.get_running_loop()
+    responses, snapshot = await loop.run_in_executor(
+        executor, evaluate_in_worker, inputs_list, fidelity, summary_only
+    )
+    metrics = HomeCalculatorCore.analysis_metrics
+    if snapshot is not None and metrics is not None:
+        metrics.merge(snapshot)
+    return responses
+
+
+def _request_options(body: Dict[str, Any]) -> Tuple[str, bool]:
+    """Validated (fidelity, summary_only) from a request body"""
+    fidelity = body.get('fidelity', 'annual')
+    if fidelity not in FIDELITY_LEVELS:
+        raise RequestError(400, f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+    return fidelity, bool(body.get('summary_only', False))
+
+
+class RequestCoalescer:
+    """
+    Groups concurrent single-scenario requests into shared batch evaluations
+
+    Requests are grouped by fidelity and summary_only. While a worker is
+    free, a group is dispatched at the end of the current event loop pass
+    (or after `window` seconds), so a lone request pays no extra latency.
+    While every worker is busy, requests queue up and the whole group is
+    dispatched in one worker call as soon as a worker frees up, so batches
+    grow with load. A group reaching max_batch is dispatched immediately.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        workers: int,
+        window: float = DEFAULT_COALESCE_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH
+    ):
+        self.executor = executor
+        self.workers = workers
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[str, bool], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, bool], asyncio.Handle] = {}
+        self._in_flight = 0
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, inputs: Dict[str, Any], fidelity: str, summary_only: bool) -> Tuple[int, bytes]:
+        """Queue one scenario and wait for its (status, body)"""
+        loop = asyncio.get_running_loop()
+        key = (fidelity, summary_only)
+        future = loop.create_future()
+        group = self._pending.setdefault(key, [])
+        group.append((inputs, future))
+        if len(group) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers and self._in_flight < self.workers:
+            self._schedule(key)
+        return await future
+
+    def _schedule(self, key: Tuple[str, bool]) -> None:
+        loop = asyncio.get_running_loop()
+        if self.window > 0:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        else:
+            self._timers[key] = loop.call_soon(self._flush, key)
+
+    def _flush(self, key: Tuple[str, bool]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._pending.pop(key, [])
+        if group:
+            self.batches += 1
+            self.requests += len(group)
+            self._in_flight += 1
+            asyncio.ensure_future(self._evaluate(key, group))
+
+    async def _evaluate(self, key: Tuple[str, bool], group: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        fidelity, summary_only = key
+        try:
+            responses = await _evaluate_group(self.executor, [inputs for inputs, _ in group], fidelity, summary_only)
+        except Exception as error:
+            responses = [(500, _dumps({'error': f"{type(error).__name__}: {error}"}))] * len(group)
+        finally:
+            self._in_flight -= 1
+        for (_, future), response in zip(group, responses):
+            if not future.done():
+                future.set_result(response)
+        # A worker is free again: dispatch whatever queued while all were busy
+        for pending_key in list(self._pending):
+            if pending_key not in self._timers and self._in_flight < self.workers:
+                self._schedule(pending_key)
+
+
+class AnalysisServer:
+    """
+    HTTP/1.1 JSON API around the analysis core
+
+    Endpoints:
+        POST /analyze        {"inputs": {...}, "fidelity": "annual", "summary_only": false}
+                             -> {"summary": {...}, "mortgage_data": [...], "rent_data": [...]}
+        POST /analyze/batch  {"scenarios": [{...}, ...], "fidelity": ..., "summary_only": ...}
+                             -> {"results": [...]} with one result or {"error": ...} per scenario
+        GET  /health         -> {"status": "ok", "batches": ..., "requests": ...}
+        GET  /metrics        -> Prometheus text exposition of AnalysisMetrics
+                                (only when started with metrics=True)
+
+    Single requests are coalesced by RequestCoalescer. Batch requests are
+    split into max_batch-sized chunks that are evaluated concurrently. All
+    validation, evaluation and JSON encoding runs in the worker pool, so the
+    event loop only moves bytes.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: Optional[int] = None,
+        use_processes: bool = True,
+        window: float = DEFAULT_COALESCE_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        metrics: bool = False
+    ):
+        """
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 picks a free one, see .port after start())
+            workers: Worker pool size, default os.cpu_count()
+            use_processes: Process pool (parallel across cores) instead of threads
+            window: Coalescing window in seconds for single requests
+            max_batch: Largest batch evaluated in one worker call
+            metrics: Enable per-stage instrumentation and serve GET /metrics
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = None
+        self._collect_metrics = metrics
+        self.executor = None
+        self.coalescer = None
+        self._server = None
+
+    async def start(self) -> None:
+        """Start the worker pool and begin listening"""
+        if self._collect_metrics:
+            self.metrics = HomeCalculatorCore.enable_metrics()
+        if self.use_processes:
+            initializer = _enable_worker_metrics if self._collect_metrics else None
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=initializer)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        # Warm every worker so the first requests do not pay for imports
+        # (their drained metrics are dropped, keeping warm-up out of /metrics)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.executor, evaluate_in_worker, [DEFAULT_VALUES], 'annual', True)
+            for _ in range(self.workers)
+        ])
+        if self.metrics is not None:
+            self.metrics.reset()
+        self.coalescer = RequestCoalescer(self.executor, self.workers, self.window, self.max_batch)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and shut the worker pool down"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    async def serve_forever(self) -> None:
+        """Serve until SIGINT/SIGTERM, then stop cleanly so no pool workers are orphaned"""
+        await self.start()
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on Windows; Ctrl+C still raises KeyboardInterrupt
+        try:
+            await stopping.wait()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as error:
+                    await _write_response(writer, error.status, _dumps({'error': str(error)}), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                try:
+                    status, payload, content_type = await self._dispatch(method, path, body)
+                except RequestError as error:
+                    status, payload, content_type = error.status, _dumps({'error': str(error)}), JSON_CONTENT_TYPE
+                await _write_response(writer, status, payload, keep_alive, content_type)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes, str]:
+        path = urlsplit(path).path
+        if path == '/health':
+            if method != 'GET':
+                raise RequestError(405, "Use GET for /health")
+            health = {'status': 'ok', 'batches': self.coalescer.batches, 'requests': self.coalescer.requests}
+            return 200, _dumps(health), JSON_CONTENT_TYPE
+        if path == '/metrics':
+            if self.metrics is None:
+                raise RequestError(404, "Metrics are disabled, start the server with metrics enabled")
+            if method != 'GET':
+                raise RequestError(405, "Use GET for /metrics")
+            return 200, self.metrics_text().encode('utf-8'), PROMETHEUS_CONTENT_TYPE
+        if path not in ('/analyze', '/analyze/batch'):
+            raise RequestError(404, f"No endpoint at {path}")
+        if method != 'POST':
+            raise RequestError(405, f"Use POST for {path}")
+
+        try:
+            request = json.loads(body)
+        except ValueError as error:
+            raise RequestError(400, f"Invalid JSON: {error}") from None
+        if not isinstance(request, dict):
+            raise RequestError(400, "Request body must be a JSON object")
+        fidelity, summary_only = _request_options(request)
+
+        if path == '/analyze':
+            inputs = request.get('inputs')
+            if not isinstance(inputs, dict):
+                raise RequestError(400, "'inputs' must be a JSON object")
+            status, payload = await self.coalescer.submit(inputs, fidelity, summary_only)
+            return status, payload, JSON_CONTENT_TYPE
+
+        scenarios = request.get('scenarios')
+        if not isinstance(scenarios, list) or not all(isinstance(inputs, dict) for inputs in scenarios):
+            raise RequestError(400, "'scenarios' must be a list of JSON objects")
+        chunks = await asyncio.gather(*[
+            _evaluate_group(self.executor, scenarios[start:start + self.max_batch], fidelity, summary_only)
+            for start in range(0, len(scenarios), self.max_batch)
+        ])
+        # Splice the pre-encoded per-scenario bodies into one response
+        bodies = [body for chunk in chunks for _, body in chunk]
+        return 200, b'{"results":[' + b','.join(bodies) + b']}', JSON_CONTENT_TYPE
+
+    def metrics_text(self) -> str:
+        """Prometheus exposition of the analysis metrics, cache and coalescer counters"""
+        lines = [self.metrics.to_prometheus(HomeCalculatorCore.analysis_cache)]
+        for name, value, help_text in (
+            ('requests', self.coalescer.requests, 'Single-scenario requests coalesced.'),
+            ('batches', self.coalescer.batches, 'Batch evaluations the coalesced requests shared.')
+        ):
+            lines.append(
+                f'# HELP home_calculator_server_{name}_total {help_text}\n'
+                f'# TYPE home_calculator_server_{name}_total counter\n'
+                f'home_calculator_server_{name}_total {value}\n'
+            )
+        return ''.join(lines)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+    """Read one HTTP/1.x request; None when the client closed the connection"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as error:
+        if error.partial.strip():
+            raise RequestError(400, "Incomplete request") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise RequestError(413, "Request headers too large") from None
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, path, version = lines[0].split(' ')
+    except ValueError:
+        raise RequestError(400, "Malformed request line") from None
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise RequestError(400, "Invalid Content-Length") from None
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b''
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return method.upper(), path, body, keep_alive
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    keep_alive: bool,
+    content_type: str = JSON_CONTENT_TYPE
+) -> None:
+    writer.write(
+        f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+
+
+async def load_test(
+    host: str,
+    port: int,
+    body: Dict[str, Any],
+    path: str = '/analyze',
+    concurrency: int = 64,
+    total_requests: int = 5000
+) -> Dict[str, float]:
+    """
+    Closed-loop load generator: `concurrency` keep-alive clients send the same request
+
+    Args:
+        host: Server host
+        port: Server port
+        body: JSON request body
+        path: Endpoint to call
+        concurrency: Number of concurrent connections
+        total_requests: Requests to send in total
+
+    Returns:
+        Dictionary with 'requests', 'errors', 'seconds', 'requests_per_second'
+        and latency percentiles 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'
+    """
+    payload = json.dumps(body).encode('utf-8')
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n"
+    ).encode('latin-1') + payload
+    latencies = []
+    errors = 0
+    remaining = total_requests
+
+    async def client():
+        nonlocal remaining, errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - started)
+                if not head.startswith(b'HTTP/1.1 200'):
+                    errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    seconds = time.perf_counter() - started
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': seconds,
+        'requests_per_second': len(latencies) / seconds,
+        'p50_ms': p50,
+        'p90_ms': p90,
+        'p99_ms': p99,
+        'max_ms': max(latencies) * 1000
+    }
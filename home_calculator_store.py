@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Store Module
+SQLite-backed scenario store with indexed summaries and lazily loaded yearly tables
+"""
+
+import json
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, List, Tuple, Any, Iterable, Optional, Union
+
+from home_calculator_core import SUMMARY_COLUMNS, AnalysisResult, HomeCalculatorCore, YearlyTable
+
+
+DEFAULT_STORE_PATH = 'scenarios.db'
+
+# Inputs copied out of the JSON blob so they can be filtered and sorted on
+INPUT_COLUMNS = ('years', 'home_price', 'down_payment_pct', 'apr', 'monthly_rent', 'stocks_enabled')
+
+# winner has two values, so it leads composite indexes instead of having its own
+INDEXES = (
+    ('winner', 'home_price'), ('winner', 'savings'), ('home_price',), ('monthly_rent',),
+    ('years',), ('apr',), ('ownership_net_cost',), ('rent_net_cost',), ('savings',)
+)
+
+QUERYABLE_COLUMNS = ('name', 'fidelity', 'updated_at') + INPUT_COLUMNS + SUMMARY_COLUMNS
+
+QUERY_OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+# Header length prefix of an encoded table
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+def encode_table(table: YearlyTable) -> bytes:
+    """
+    Serialize a YearlyTable into a compact BLOB
+
+    Layout: 4-byte header length, a JSON header listing (name, typecode) per
+    column and the row count, then each column's raw little-endian machine
+    values back to back. Integer columns are widened to 8 bytes so the BLOB
+    reads back the same on platforms where array('l') is 4 bytes.
+    """
+    specs = []
+    payload = []
+    for name in table.columns:
+        values = table.column(name)
+        if values.typecode == 'd':
+            specs.append((name, 'd'))
+            payload.append(values.tobytes())
+        else:
+            specs.append((name, 'q'))
+            payload.append(array('q', values).tobytes())
+    header = json.dumps({'columns': specs, 'length': len(table)}).encode()
+    return _HEADER_LENGTH.pack(len(header)) + header + b''.join(payload)
+
+
+def decode_table(blob: bytes) -> YearlyTable:
+    """Inverse of encode_table"""
+    (header_length,) = _HEADER_LENGTH.unpack_from(blob)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(blob[offset:offset + header_length])
+    offset += header_length
+
+    length = header['length']
+    columns = {}
+    for name, typecode in header['columns']:
+        values = array(typecode)
+        size = values.itemsize * length
+        values.frombytes(blob[offset:offset + size])
+        offset += size
+        columns[name] = values if typecode == 'd' else array('l', values)
+    return YearlyTable(columns)
+
+
+class ScenarioStore:
+    """
+    Persistent scenario library in a single SQLite file
+
+    Each scenario row keeps its inputs (JSON), the inputs and summary metrics
+    worth filtering on as indexed columns, and nothing else. The yearly tables
+    live in a separate table as compact BLOBs and are only read by
+    load_tables, so listing and filtering never deserialize them.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+        """
+        self.path = path
+        # Streamlit reruns on different threads; one connection guarded by a lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA foreign_keys = ON')
+            self._create_schema()
+
+    def _create_schema(self) -> None:
+        summary_columns = ',\n'.join(
+            f"    {column} {'TEXT' if column == 'winner' else 'REAL'}" for column in SUMMARY_COLUMNS
+        )
+        self._connection.execute(f"""
+            CREATE TABLE IF NOT EXISTS scenarios (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                fidelity TEXT NOT NULL DEFAULT 'annual',
+                updated_at REAL NOT NULL,
+                inputs TEXT NOT NULL,
+                years INTEGER,
+                home_price REAL,
+                down_payment_pct REAL,
+                apr REAL,
+                monthly_rent REAL,
+                stocks_enabled INTEGER,
+                {summary_columns}
+            )
+        """)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS scenario_tables (
+                scenario_id INTEGER PRIMARY KEY REFERENCES scenarios(id) ON DELETE CASCADE,
+                mortgage BLOB NOT NULL,
+                rent BLOB NOT NULL
+            )
+        """)
+        for columns in INDEXES:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_scenarios_{'_'.join(columns)} ON scenarios({', '.join(columns)})"
+            )
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        self._connection.close()
+
+    def __enter__(self) -> 'ScenarioStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM scenarios WHERE name = ?", (name,)).fetchone() is not None
+
+    @staticmethod
+    def _row_values(name: str, inputs: Dict[str, Any], summary: Optional[Dict[str, Any]], fidelity: str) -> Tuple:
+        """Column values of one scenarios row, in _UPSERT order"""
+        input_values = tuple(
+            (int(bool(inputs[column])) if column == 'stocks_enabled' else inputs[column]) if column in inputs else None
+            for column in INPUT_COLUMNS
+        )
+        summary_values = tuple(summary[column] if summary else None for column in SUMMARY_COLUMNS)
+        return (name, fidelity, time.time(), json.dumps(inputs)) + input_values + summary_values
+
+    _COLUMNS = ('name', 'fidelity', 'updated_at', 'inputs') + INPUT_COLUMNS + SUMMARY_COLUMNS
+    _UPSERT = (
+        f"INSERT INTO scenarios ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))}) "
+        f"ON CONFLICT(name) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in _COLUMNS[1:])}"
+    )
+
+    def save(
+        self,
+        name: str,
+        inputs: Dict[str, Any],
+        result: Optional[AnalysisResult] = None,
+        fidelity: str = 'annual',
+        analyze: bool = True
+    ) -> None:
+        """
+        Insert or replace one scenario
+
+        Args:
+            name: Unique scenario name
+            inputs: Scenario inputs dictionary
+            result: Analysis of these inputs. Computed with
+                HomeCalculatorCore when omitted and analyze is True.
+            fidelity: Interest accrual model the result was (or will be) computed with
+            analyze: Whether to compute a missing result. When False and no
+                result is given, only the inputs are stored.
+        """
+        if result is None and analyze:
+            result = HomeCalculatorCore.generate_complete_analysis(inputs, fidelity=fidelity)
+        summary = result.summary if result is not None else None
+        # Summary-only results carry empty tables; keep tables only when they are real
+        has_tables = result is not None and len(result.mortgage_data) > 0
+
+        with self._lock, self._connection:
+            self._connection.execute(self._UPSERT, self._row_values(name, inputs, summary, fidelity))
+            scenario_id = self._connection.execute("SELECT id FROM scenarios WHERE name = ?", (name,)).fetchone()[0]
+            if has_tables:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO scenario_tables (scenario_id, mortgage, rent) VALUES (?, ?, ?)",
+                    (scenario_id, encode_table(result.mortgage_data), encode_table(result.rent_data))
+                )
+            else:
+                self._connection.execute("DELETE FROM scenario_tables WHERE scenario_id = ?", (scenario_id,))
+
+    def save_summaries(
+        self,
+        scenarios: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+        fidelity: Union[str, Dict[str, str]] = 'annual'
+    ) -> None:
+        """
+        Insert or replace many scenarios' inputs and summaries in one transaction
+
+        Stored yearly tables of these scenarios are dropped, since they no
+        longer match the summaries.
+
+        Args:
+            scenarios: (name, inputs, summary) triples, e.g. from a batch evaluation
+            fidelity: Fidelity for all scenarios, or a name -> fidelity mapping
+        """
+        rows = [
+            self._row_values(name, inputs, summary, fidelity if isinstance(fidelity, str) else fidelity[name])
+            for name, inputs, summary in scenarios
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(self._UPSERT, rows)
+            self._connection.executemany(
+                "DELETE FROM scenario_tables WHERE scenario_id = (SELECT id FROM scenarios WHERE name = ?)",
+                [(row[0],) for row in rows]
+            )
+
+    def delete(self, name: str) -> bool:
+        """Delete a scenario and its tables; returns whether it existed"""
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM scenarios WHERE name = ?", (name,)).rowcount > 0
+
+    def rename(self, old_name: str, new_name: str) -> bool:
+        """Rename a scenario; returns False if old_name is missing or new_name is taken"""
+        with self._lock, self._connection:
+            try:
+                return self._connection.execute(
+                    "UPDATE scenarios SET name = ? WHERE name = ?", (new_name, old_name)
+                ).rowcount > 0
+            except sqlite3.IntegrityError:
+                return False
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load one scenario without its yearly tables
+
+        Returns:
+            Dictionary with 'name', 'fidelity', 'updated_at', 'inputs' and
+            'summary' (None if only inputs were saved), or None if not found
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT name, fidelity, updated_at, inputs, {', '.join(SUMMARY_COLUMNS)} FROM scenarios WHERE name = ?",
+                (name,)
+            ).fetchone()
+        return self._scenario_from_row(row) if row is not None else None
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Load every scenario (without yearly tables) in insertion order"""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT name, fidelity, updated_at, inputs, {', '.join(SUMMARY_COLUMNS)} FROM scenarios ORDER BY id"
+            ).fetchall()
+        return [self._scenario_from_row(row) for row in rows]
+
+    @staticmethod
+    def _scenario_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        summary = None
+        if row['winner'] is not None:
+            summary = {column: row[column] for column in SUMMARY_COLUMNS}
+        return {
+            'name': row['name'],
+            'fidelity': row['fidelity'],
+            'updated_at': row['updated_at'],
+            'inputs': json.loads(row['inputs']),
+            'summary': summary
+        }
+
+    def load_tables(self, name: str) -> Optional[Tuple[YearlyTable, YearlyTable]]:
+        """
+        Load a scenario's yearly tables
+
+        Returns:
+            (mortgage_data, rent_data), or None if the scenario has no stored tables
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT t.mortgage, t.rent FROM scenario_tables t JOIN scenarios s ON s.id = t.scenario_id WHERE s.name = ?",
+                (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return decode_table(row['mortgage']), decode_table(row['rent'])
+
+    def query(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        order_by: str = 'name',
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List scenarios matching simple column conditions, using the indexes
+
+        Only the indexed input and summary columns are read, never the inputs
+        JSON or the yearly tables.
+
+        Args:
+            where: Mapping of column -> value (equality) or (operator, value),
+                e.g. {'winner': 'RENTING', 'home_price': ('>', 1000000)}
+            order_by: Column to sort by
+            descending: Sort descending instead of ascending
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of dictionaries with 'name', 'fidelity', 'updated_at' and every
+            column of INPUT_COLUMNS and SUMMARY_COLUMNS
+        """
+        sql, params = self._select(', '.join(QUERYABLE_COLUMNS), where)
+        if order_by not in QUERYABLE_COLUMNS:
+            raise ValueError(f"Cannot order by '{order_by}', expected one of {', '.join(QUERYABLE_COLUMNS)}")
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        """Number of scenarios matching the same conditions as query"""
+        sql, params = self._select('COUNT(*)', where)
+        with self._lock:
+            return self._connection.execute(sql, params).fetchone()[0]
+
+    def explain(self, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """SQLite query plan for a query with these conditions (to check index use)"""
+        sql, params = self._select(', '.join(QUERYABLE_COLUMNS), where)
+        with self._lock:
+            return [row['detail'] for row in self._connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    @staticmethod
+    def _select(columns: str, where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """Build a validated SELECT over scenarios from a where mapping"""
+        clauses = []
+        params = []
+        for column, condition in (where or {}).items():
+            if column not in QUERYABLE_COLUMNS:
+                raise ValueError(f"Cannot filter on '{column}', expected one of {', '.join(QUERYABLE_COLUMNS)}")
+            operator, value = condition if isinstance(condition, tuple) else ('=', condition)
+            if operator not in QUERY_OPERATORS:
+                raise ValueError(f"Unknown operator '{operator}', expected one of {', '.join(QUERY_OPERATORS)}")
+            clauses.append(f"{column} {operator} ?")
+            params.append(int(value) if isinstance(value, bool) else value)
+        sql = f"SELECT {columns} FROM scenarios"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params
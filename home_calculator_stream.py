@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Stream Module
+Streams CSV/JSONL scenario files through the batch engine with resumable checkpoints
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from home_calculator_batch import batch_size, generate_complete_analysis_batch, normalize_batch
+from home_calculator_core import (
+    BOOLEAN_INPUTS, FIDELITY_LEVELS, MORTGAGE_COLUMNS, OPTIONAL_INPUT_DEFAULTS, RENT_COLUMNS,
+    REQUIRED_INPUTS, STOCK_COLUMNS, SUMMARY_COLUMNS
+)
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# File extension -> record format
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl'
+}
+
+TRUE_STRINGS = ('1', 'true', 'yes', 'y', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'n', 'off', '')
+
+# Exact spellings of flags resolved without per-value parsing (JSON bools included)
+BOOLEAN_VALUES = {
+    **{text: True for text in TRUE_STRINGS + tuple(text.title() for text in TRUE_STRINGS)},
+    **{text: False for text in FALSE_STRINGS[:-1] + tuple(text.title() for text in FALSE_STRINGS[:-1])},
+    True: True, False: False
+}
+
+# Leading columns of every output record: input record number and its id field
+KEY_COLUMNS = ('row', 'id')
+
+
+def file_format(path: str) -> str:
+    """Record format of a scenario file from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file type '{extension}', expected one of {', '.join(FILE_FORMATS)}")
+    return FILE_FORMATS[extension]
+
+
+def yearly_output_paths(output_path: str) -> Tuple[str, str]:
+    """Mortgage and rent yearly table paths next to an output file"""
+    stem, extension = os.path.splitext(output_path)
+    return f"{stem}.mortgage{extension}", f"{stem}.rent{extension}"
+
+
+def _parse_value(field: str, value: Any) -> Any:
+    """Parse one field value; None means missing. Raises ValueError when invalid."""
+    if value is None or value == '':
+        if field in REQUIRED_INPUTS:
+            raise ValueError(f"missing required field '{field}'")
+        return None
+    if field in BOOLEAN_INPUTS:
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text not in TRUE_STRINGS + FALSE_STRINGS:
+                raise ValueError(f"{field}: expected a boolean, got {value!r}")
+            return text in TRUE_STRINGS
+        return bool(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field}: expected a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{field}: expected a finite number, got {value!r}")
+    if field == 'years' and (number != int(number) or number < 1):
+        raise ValueError(f"years: expected a whole number of at least 1, got {value!r}")
+    return number
+
+
+def _parse_column(field: str, values: List[Any], errors: Dict[int, str]) -> np.ndarray:
+    """
+    Parse one field across a chunk of records
+
+    Numeric columns are converted in a single vectorized call; only a column
+    with missing or malformed entries falls back to per-value parsing, which
+    records the first error per record in errors.
+    """
+    default = OPTIONAL_INPUT_DEFAULTS.get(field)
+    if field in BOOLEAN_INPUTS:
+        try:
+            return np.array([BOOLEAN_VALUES[value] for value in values], dtype=bool)
+        except (KeyError, TypeError):
+            pass
+    elif None not in values and '' not in values:
+        try:
+            column = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            column = None
+        if column is not None and column.ndim == 1:
+            valid = np.isfinite(column)
+            if field == 'years':
+                valid &= (column >= 1) & (column == np.round(column))
+            if valid.all():
+                return column
+
+    column = np.empty(len(values), dtype=bool if field in BOOLEAN_INPUTS else np.float64)
+    for i, value in enumerate(values):
+        try:
+            parsed = _parse_value(field, value)
+        except ValueError as error:
+            errors.setdefault(i, str(error))
+            parsed = None
+        column[i] = default if parsed is None else parsed
+    return column
+
+
+def parse_scenarios(records: List[Dict[str, Any]]) -> Tuple[Dict[str, np.ndarray], List[int], Dict[int, str]]:
+    """
+    Convert a chunk of input records into a struct-of-arrays batch
+
+    CSV records hold strings, so numbers and flags are parsed here. Fields
+    the analysis does not read are ignored; missing optional fields take
+    the core's defaults.
+
+    Args:
+        records: Field -> value mappings from CSV rows or JSON objects
+
+    Returns:
+        Tuple of (batch of the valid records, their positions in records,
+        position -> error message for the rejected records)
+    """
+    errors = {}
+    columns = {
+        field: _parse_column(field, [record.get(field) for record in records], errors)
+        for field in list(REQUIRED_INPUTS) + list(OPTIONAL_INPUT_DEFAULTS)
+    }
+    valid = [i for i in range(len(records)) if i not in errors]
+    if errors:
+        columns = {field: column[valid] for field, column in columns.items()}
+    return normalize_batch(columns), valid, errors
+
+
+def read_records(path: str, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """
+    Stream records from a CSV or JSONL file
+
+    Args:
+        path: Scenario file
+        offset: Byte offset of the first record to read (0 for the start,
+            otherwise a value previously yielded by this function)
+
+    Yields:
+        (record, end_offset) pairs; end_offset is the byte offset just past
+        the record, for resuming. A record that cannot be parsed is yielded
+        as {'_error': message, '_raw': text}.
+    """
+    fmt = file_format(path)
+    consumed = 0
+
+    with open(path, 'rb') as handle:
+        def lines():
+            nonlocal consumed
+            for line in handle:
+                consumed += len(line)
+                yield line.decode('utf-8')
+
+        header = None
+        if fmt == 'csv':
+            header = next(csv.reader(lines()), None)
+            if header is None:
+                return
+            header = [name.strip() for name in header]
+        if offset > consumed:
+            handle.seek(offset)
+            consumed = offset
+
+        if fmt == 'csv':
+            for values in csv.reader(lines()):
+                if not values:
+                    continue
+                if len(values) != len(header):
+                    yield {'_error': f"expected {len(header)} fields, got {len(values)}", '_raw': ','.join(values)}, consumed
+                else:
+                    yield dict(zip(header, values)), consumed
+        else:
+            for line in lines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as error:
+                    yield {'_error': f"invalid JSON: {error}", '_raw': line.rstrip('\r\n')}, consumed
+                    continue
+                if not isinstance(record, dict):
+                    record = {'_error': "expected a JSON object", '_raw': line.rstrip('\r\n')}
+                yield record, consumed
+
+
+class _RecordWriter:
+    """Appends records to a CSV or JSONL file and reports the flushed size"""
+
+    def __init__(self, path: str, columns: List[str], resume_size: Optional[int] = None):
+        self.path = path
+        self.format = file_format(path)
+        self.columns = columns
+        if resume_size is None:
+            self.handle = open(path, 'w', newline='', encoding='utf-8')
+            if self.format == 'csv':
+                csv.writer(self.handle).writerow(columns)
+        else:
+            # Drop anything written after the checkpoint, then continue from there
+            os.truncate(path, resume_size)
+            self.handle = open(path, 'a', newline='', encoding='utf-8')
+        self.csv_writer = csv.writer(self.handle) if self.format == 'csv' else None
+
+    def write_rows(self, rows: List[List[Any]]) -> None:
+        """Write rows of values in column order; None is written as an empty field or null"""
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(rows)
+        else:
+            self.handle.writelines(json.dumps(dict(zip(self.columns, row))) + '\n' for row in rows)
+
+    def sync(self) -> int:
+        """Flush to disk and return the file size"""
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        return os.fstat(self.handle.fileno()).st_size
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+def _evaluate(
+    batch: Dict[str, np.ndarray],
+    include_yearly: bool,
+    fidelity: str
+) -> List[Tuple[List[int], Optional[Tuple], Optional[str]]]:
+    """
+    Evaluate a chunk in one batch call
+
+    If the batch call fails as a whole, each scenario is evaluated alone so
+    only the offending ones are reported.
+
+    Returns:
+        List of (scenario positions, batch result or None, error message or None)
+    """
+    n = batch_size(batch)
+    try:
+        return [(list(range(n)), generate_complete_analysis_batch(batch, include_yearly=include_yearly, fidelity=fidelity), None)]
+    except Exception:
+        pass
+    results = []
+    for i in range(n):
+        single = {field: values[i:i + 1] for field, values in batch.items()}
+        try:
+            results.append(([i], generate_complete_analysis_batch(single, include_yearly=include_yearly, fidelity=fidelity), None))
+        except Exception as error:
+            results.append(([i], None, f"{type(error).__name__}: {error}"))
+    return results
+
+
+def _summary_rows(keys: List[Tuple[int, Any]], summary: Dict[str, np.ndarray]) -> List[List[Any]]:
+    """Output rows (row, id, summary columns...) for one evaluated chunk"""
+    columns = [summary[column].tolist() for column in SUMMARY_COLUMNS]
+    return [[row, record_id, *values] for (row, record_id), values in zip(keys, zip(*columns))]
+
+
+def _yearly_rows(keys: List[Tuple[int, Any]], columns: Dict[str, np.ndarray], names: List[str]) -> List[List[Any]]:
+    """Long-format yearly rows (row, id, Year, ...) for one evaluated chunk"""
+    valid = ~np.isnan(columns['Year'])
+    scenario_index, year_index = np.nonzero(valid)
+    values = np.column_stack([
+        columns[name][scenario_index, year_index] if name in columns else np.full(len(scenario_index), np.nan)
+        for name in names
+    ])
+    # Stock columns are NaN for scenarios without stocks; write them as empty
+    values = np.where(np.isnan(values), None, values).tolist()
+    for row in values:
+        row[0] = int(row[0])
+    return [list(keys[i]) + row for i, row in zip(scenario_index.tolist(), values)]
+
+
+def _write_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomically replace the checkpoint file"""
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        json.dump(state, handle)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def run_batch_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_yearly: bool = False,
+    fidelity: str = 'annual',
+    checkpoint_path: Optional[str] = None,
+    errors_path: Optional[str] = None,
+    id_field: str = 'id',
+    resume: bool = True,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze every scenario in a CSV/JSONL file and stream the results to disk
+
+    Records are read, validated and evaluated chunk_size at a time with one
+    summary-only (or yearly) batch call per chunk, and each chunk's output is
+    flushed before the next is read, so memory stays constant whatever the
+    file size. After every chunk a checkpoint records the input byte offset
+    and the output file sizes; a later run with the same checkpoint skips the
+    finished input, truncates any output written past the checkpoint and
+    carries on. The checkpoint is removed once the file is complete.
+
+    Records that fail to parse or validate are written to the errors file
+    (JSONL with row, id, error and the raw record) and the run continues.
+    If a batch call itself fails, that chunk is re-evaluated row by row so
+    only the offending rows are reported.
+
+    Args:
+        input_path: Scenario file (.csv, .jsonl or .ndjson), one scenario per record
+        output_path: Summary output file (.csv, .jsonl or .ndjson); one record
+            per valid scenario with 'row' (0-based record number), 'id' and
+            every summary metric
+        chunk_size: Scenarios per batch evaluation
+        include_yearly: Also write long-format yearly tables to
+            yearly_output_paths(output_path)
+        fidelity: Interest accrual model, one of FIDELITY_LEVELS
+        checkpoint_path: Checkpoint file, default output_path + '.checkpoint.json'
+        errors_path: Error file, default output_path + '.errors.jsonl'
+        id_field: Input field copied to the 'id' output column
+        resume: Continue from an existing checkpoint (otherwise start over)
+        progress: Called after every chunk with the current statistics
+
+    Returns:
+        Statistics dictionary with 'rows', 'errors', 'chunks', 'input_bytes',
+        'input_size', 'elapsed', 'rows_per_second' and 'resumed_from'
+    """
+    if fidelity not in FIDELITY_LEVELS:
+        raise ValueError(f"Unknown fidelity '{fidelity}', expected one of {', '.join(FIDELITY_LEVELS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    checkpoint_path = checkpoint_path or output_path + '.checkpoint.json'
+    errors_path = errors_path or output_path + '.errors.jsonl'
+
+    state = {
+        'input': os.path.abspath(input_path),
+        'output': os.path.abspath(output_path),
+        'fidelity': fidelity,
+        'include_yearly': include_yearly,
+        'input_offset': 0,
+        'rows': 0,
+        'errors': 0,
+        'sizes': None
+    }
+    resumed = resume and os.path.exists(checkpoint_path)
+    if resumed:
+        with open(checkpoint_path, encoding='utf-8') as handle:
+            saved = json.load(handle)
+        for field in ('input', 'output', 'fidelity', 'include_yearly'):
+            if saved[field] != state[field]:
+                raise ValueError(f"Checkpoint {checkpoint_path} was written for a different {field}: {saved[field]!r}")
+        state = saved
+
+    sizes = state['sizes'] or {}
+    output_columns = list(KEY_COLUMNS + SUMMARY_COLUMNS)
+    writers = {
+        'output': _RecordWriter(output_path, output_columns, sizes.get('output')),
+        'errors': _RecordWriter(errors_path, list(KEY_COLUMNS) + ['error', 'record'], sizes.get('errors'))
+    }
+    mortgage_names = list(MORTGAGE_COLUMNS)
+    rent_names = list(RENT_COLUMNS + STOCK_COLUMNS)
+    if include_yearly:
+        mortgage_path, rent_path = yearly_output_paths(output_path)
+        writers['mortgage'] = _RecordWriter(mortgage_path, list(KEY_COLUMNS) + mortgage_names, sizes.get('mortgage'))
+        writers['rent'] = _RecordWriter(rent_path, list(KEY_COLUMNS) + rent_names, sizes.get('rent'))
+
+    input_size = os.path.getsize(input_path)
+    resumed_from = state['rows']
+    start_time = time.perf_counter()
+    chunks = 0
+
+    def statistics() -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start_time
+        processed = state['rows'] - resumed_from
+        return {
+            'rows': state['rows'],
+            'errors': state['errors'],
+            'chunks': chunks,
+            'input_bytes': state['input_offset'],
+            'input_size': input_size,
+            'elapsed': elapsed,
+            'rows_per_second': processed / elapsed if elapsed > 0 else 0.0,
+            'resumed_from': resumed_from
+        }
+
+    def flush_chunk(records, end_offset):
+        nonlocal chunks
+        error_rows = [
+            [row, record.get(id_field), record['_error'], record['_raw']]
+            for row, record in records if '_error' in record
+        ]
+        parsed = [(row, record) for row, record in records if '_error' not in record]
+        batch, valid, parse_errors = parse_scenarios([record for _, record in parsed])
+        for i, message in parse_errors.items():
+            row, record = parsed[i]
+            error_rows.append([row, record.get(id_field), message, record])
+
+        keys = [(parsed[i][0], parsed[i][1].get(id_field)) for i in valid]
+        if keys:
+            for positions, result, error in _evaluate(batch, include_yearly, fidelity):
+                group_keys = [keys[i] for i in positions]
+                if result is None:
+                    row, record = parsed[valid[positions[0]]]
+                    error_rows.append([row, record.get(id_field), error, record])
+                    continue
+                mortgage_columns, rent_columns, summary = result
+                writers['output'].write_rows(_summary_rows(group_keys, summary))
+                if include_yearly:
+                    writers['mortgage'].write_rows(_yearly_rows(group_keys, mortgage_columns, mortgage_names))
+                    writers['rent'].write_rows(_yearly_rows(group_keys, rent_columns, rent_names))
+        error_rows.sort(key=lambda error_row: error_row[0])
+        writers['errors'].write_rows(error_rows)
+
+        state['sizes'] = {name: writer.sync() for name, writer in writers.items()}
+        state['rows'] += len(records)
+        state['errors'] += len(error_rows)
+        state['input_offset'] = end_offset
+        _write_checkpoint(checkpoint_path, state)
+        chunks += 1
+        if progress is not None:
+            progress(statistics())
+
+    try:
+        records = []
+        row = state['rows']
+        end_offset = state['input_offset']
+        for record, end_offset in read_records(input_path, state['input_offset']):
+            records.append((row, record))
+            row += 1
+            if len(records) >= chunk_size:
+                flush_chunk(records, end_offset)
+                records = []
+        if records or not chunks:
+            flush_chunk(records, end_offset)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    os.remove(checkpoint_path)
+    return statistics()
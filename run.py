@@ -1,20 +1,26 @@
 #!/usr/bin/env python3
 """
 Home Ownership vs Rent Calculator Launcher
-Choose between web and desktop versions
+Choose between web and desktop versions, or analyze scenario files headlessly:
+
+    python run.py batch scenarios.csv results.csv [--chunk-size N] [--yearly] [--metrics-file FILE]
+    python run.py dataset regions/ results/ [--set years=10] [--rows START:STOP]
+    python run.py backtest returns.csv [--years 10] [--from 1970] [--set apr=6.5]
+    python run.py serve [--port 8765] [--workers N] [--metrics]
+    python run.py loadtest [--port 8765] [--concurrency 64] [--requests 5000]
+    python run.py benchmark [--baseline benchmark_baseline.json] [--tolerance 0.25]
+    python run.py importtime [--repeat 5]
 """
 
+import argparse
+import importlib.util
 import sys
 import subprocess
 import os
 
 def check_streamlit_installed():
-    """Check if Streamlit is installed"""
-    try:
-        import streamlit
-        return True
-    except ImportError:
-        return False
+    """Check if Streamlit is installed (without paying for importing it)"""
+    return importlib.util.find_spec("streamlit") is not None
 
 def install_streamlit():
     """Install Streamlit and dependencies"""
@@ -58,7 +64,373 @@ def run_desktop_version():
         return False
     return True
 
+def print_batch_progress(stats):
+    """Overwrite one stderr line with batch progress"""
+    percent = 100.0 * stats['input_bytes'] / stats['input_size'] if stats['input_size'] else 100.0
+    sys.stderr.write(
+        f"\r⏳ {stats['rows']:,} rows ({stats['errors']:,} errors) "
+        f"{percent:5.1f}%  {stats['rows_per_second']:,.0f} rows/s"
+    )
+    sys.stderr.flush()
+
+def run_batch(args):
+    """Run the headless batch subcommand"""
+    from home_calculator_core import HomeCalculatorCore
+    from home_calculator_stream import DEFAULT_CHUNK_SIZE, run_batch_file
+    
+    progress = None if args.quiet else print_batch_progress
+    if args.metrics_file:
+        metrics = HomeCalculatorCore.enable_metrics()
+        
+        def progress(stats, show=progress):
+            metrics.write_prometheus(args.metrics_file)
+            if show is not None:
+                show(stats)
+    
+    try:
+        stats = run_batch_file(
+            args.input, args.output,
+            chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+            include_yearly=args.yearly,
+            fidelity=args.fidelity,
+            checkpoint_path=args.checkpoint,
+            errors_path=args.errors,
+            id_field=args.id_field,
+            resume=not args.restart,
+            progress=progress
+        )
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted - run the same command again to resume", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as error:
+        print(f"\n❌ {error}", file=sys.stderr)
+        return 1
+    
+    if not args.quiet:
+        resumed = f", resumed at row {stats['resumed_from']:,}" if stats['resumed_from'] else ""
+        print(
+            f"\n✅ {stats['rows']:,} rows in {stats['elapsed']:.1f}s "
+            f"({stats['errors']:,} errors{resumed})",
+            file=sys.stderr
+        )
+    return 0
+
+def print_dataset_progress(stats):
+    """Overwrite one stderr line with dataset progress"""
+    percent = 100.0 * stats['rows'] / stats['total_rows'] if stats['total_rows'] else 100.0
+    sys.stderr.write(f"\r⏳ {stats['rows']:,} rows {percent:5.1f}%  {stats['rows_per_second']:,.0f} rows/s")
+    sys.stderr.flush()
+
+def parse_set_values(assignments):
+    """--set field=value pairs as base inputs on top of the defaults"""
+    from home_calculator_core import BOOLEAN_INPUTS, DEFAULT_VALUES
+    
+    inputs = dict(DEFAULT_VALUES)
+    for assignment in assignments or []:
+        field, separator, value = assignment.partition("=")
+        if not separator or field not in DEFAULT_VALUES:
+            raise ValueError(f"--set expects field=value with a known input field, got {assignment!r}")
+        if field in BOOLEAN_INPUTS:
+            inputs[field] = value.strip().lower() in ("1", "true", "yes", "y", "on")
+        else:
+            inputs[field] = float(value)
+    return inputs
+
+def run_dataset(args):
+    """Run the memory-mapped dataset subcommand"""
+    from home_calculator_dataset import DEFAULT_DATASET_CHUNK_SIZE, evaluate_dataset
+    
+    try:
+        rows = None
+        if args.rows:
+            start, _, stop = args.rows.partition(":")
+            rows = (int(start), int(stop))
+        stats = evaluate_dataset(
+            args.dataset, args.output,
+            base_inputs=parse_set_values(args.set),
+            chunk_size=args.chunk_size or DEFAULT_DATASET_CHUNK_SIZE,
+            fidelity=args.fidelity,
+            rows=rows,
+            progress=None if args.quiet else print_dataset_progress
+        )
+    except (OSError, KeyError, ValueError) as error:
+        print(f"\n❌ {error}", file=sys.stderr)
+        return 1
+    
+    if not args.quiet:
+        print(
+            f"\n✅ {stats['rows']:,} rows in {stats['elapsed']:.1f}s "
+            f"(per-row inputs: {', '.join(stats['fields']) or 'none'})",
+            file=sys.stderr
+        )
+    return 0
+
+def run_backtest(args):
+    """Run the historical backtest subcommand and print the result by start year"""
+    from home_calculator_backtest import backtest, load_return_series
+    
+    try:
+        inputs = parse_set_values(args.set)
+        columns = None
+        if args.column:
+            columns = {}
+            for mapping in args.column:
+                field, separator, column = mapping.partition("=")
+                if not separator:
+                    raise ValueError(f"--column expects field=column, got {mapping!r}")
+                columns[field] = column
+        series = load_return_series(args.series, columns=columns, fractions=args.fractions)
+        last = int(series['year'][-1]) if args.to is None else args.to
+        first = int(series['year'][0]) if args.start is None else args.start
+        result = backtest(
+            inputs, series,
+            years=args.years,
+            start_years=(first, last),
+            fidelity=args.fidelity
+        )
+    except (OSError, KeyError, ValueError) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    
+    replayed = list(result['cumulative_growth'])
+    print(f"{'start':>5}  {'winner':<15}{'own - rent':>14}" + "".join(f"{field:>15}" for field in replayed))
+    for i, start in enumerate(result['start_year'].tolist()):
+        growth = "".join(f"{result['cumulative_growth'][field][i]:>14.1f}%" for field in replayed)
+        print(f"{start:>5}  {result['winner'][i]:<15}{result['net_cost_difference'][i]:>14,.0f}{growth}")
+    print()
+    print(f"{result['windows']} windows of {result['years']} years: owning wins "
+          f"{result['probability_ownership_wins']:.0%} ({result['winner_counts']})")
+    print("own - rent percentiles: " + ", ".join(
+        f"p{percentile:g} {value:,.0f}" for percentile, value in result['net_cost_difference_percentiles'].items()
+    ))
+    print(f"Best start year for owning: {result['best_start_year']}, worst: {result['worst_start_year']}")
+    return 0
+
+def run_server(args):
+    """Run the HTTP JSON API until interrupted"""
+    import asyncio
+    from home_calculator_server import AnalysisServer
+    
+    server = AnalysisServer(
+        args.host, args.port,
+        workers=args.workers,
+        use_processes=not args.threads,
+        window=args.window_ms / 1000,
+        max_batch=args.max_batch,
+        metrics=args.metrics
+    )
+    print(f"🌐 Serving POST /analyze and /analyze/batch on http://{args.host}:{args.port}", file=sys.stderr)
+    if args.metrics:
+        print(f"📈 Prometheus metrics on http://{args.host}:{args.port}/metrics", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    print("\n👋 Server stopped", file=sys.stderr)
+    return 0
+
+def run_load_test(args):
+    """Load a running server and print throughput and latency percentiles"""
+    import asyncio
+    from home_calculator_core import DEFAULT_VALUES
+    from home_calculator_server import load_test
+    
+    options = {'fidelity': args.fidelity, 'summary_only': args.summary_only}
+    if args.batch:
+        path, body = '/analyze/batch', dict(options, scenarios=[DEFAULT_VALUES] * args.batch)
+    else:
+        path, body = '/analyze', dict(options, inputs=DEFAULT_VALUES)
+    try:
+        stats = asyncio.run(load_test(args.host, args.port, body, path, args.concurrency, args.requests))
+    except OSError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    scenarios = stats['requests_per_second'] * (args.batch or 1)
+    print(
+        f"{stats['requests']:,} requests ({stats['errors']} errors) in {stats['seconds']:.2f}s: "
+        f"{stats['requests_per_second']:,.0f} req/s ({scenarios:,.0f} scenarios/s), "
+        f"p50 {stats['p50_ms']:.2f} ms, p90 {stats['p90_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+        f"max {stats['max_ms']:.2f} ms"
+    )
+    return 0
+
+def run_benchmark(args):
+    """Run the core benchmarks, write them to JSON and compare against the baseline"""
+    from home_calculator_benchmark import (
+        compare_results, environment_differences, format_comparison, load_results, run_benchmarks, save_results
+    )
+    
+    def report(name, measurements):
+        if not args.quiet:
+            print(
+                f"{name:<80} {measurements['ops_per_sec']:>12,.0f} ops/s "
+                f"{measurements['peak_kib']:>10,.1f} KiB peak",
+                file=sys.stderr
+            )
+    
+    min_time, repeat = (0.02, 3) if args.quick else (args.min_time, args.repeat)
+    results = run_benchmarks(min_time, repeat, args.match, report)
+    save_results(results, args.output)
+    print(f"📝 {len(results['results'])} cases written to {args.output}")
+    
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    
+    baseline = load_results(args.baseline)
+    for difference in environment_differences(results, baseline):
+        print(f"⚠️  Environment differs from baseline - {difference}")
+    rows = compare_results(results, baseline, args.tolerance, args.memory_tolerance)
+    print(format_comparison(rows, only_changes=not args.verbose))
+    regressions = [row for row in rows if row['status'] in ('regressed', 'missing')]
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond tolerance")
+        return 1
+    print("✅ No regressions beyond tolerance")
+    return 0
+
+def run_import_check(args):
+    """Import each budgeted module cold and report the ones over budget"""
+    from home_calculator_benchmark import IMPORT_BUDGETS, check_import_budgets, format_import_report
+    
+    budgets = IMPORT_BUDGETS
+    if args.module:
+        unknown = [module for module in args.module if module not in IMPORT_BUDGETS]
+        if unknown:
+            print(f"❌ No import budget for {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        budgets = {module: IMPORT_BUDGETS[module] for module in args.module}
+    
+    rows = check_import_budgets(budgets, args.repeat)
+    print(format_import_report(rows, verbose=args.verbose))
+    over = [row for row in rows if row['status'] == 'over']
+    if over:
+        print(f"❌ {len(over)} module(s) over their import budget")
+        return 1
+    print("✅ All imports within budget")
+    return 0
+
+def build_parser():
+    """Command line parser for the launcher subcommands (imports nothing NumPy-backed)"""
+    from home_calculator_core import FIDELITY_LEVELS
+    from home_calculator_benchmark import (
+        DEFAULT_BASELINE_PATH, DEFAULT_IMPORT_REPEAT, DEFAULT_MEMORY_TOLERANCE, DEFAULT_RESULTS_PATH,
+        DEFAULT_TOLERANCE
+    )
+    
+    parser = argparse.ArgumentParser(description="Home Ownership vs Rent Calculator")
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser(
+        "batch", help="Analyze every scenario in a CSV/JSONL file",
+        description="Stream scenarios from a CSV/JSONL file through the calculator. "
+                    "Interrupted runs resume from their checkpoint."
+    )
+    batch.add_argument("input", help="Scenario file (.csv, .jsonl or .ndjson)")
+    batch.add_argument("output", help="Summary output file (.csv, .jsonl or .ndjson)")
+    batch.add_argument("--chunk-size", type=int, help="Scenarios per batch evaluation (default: 10000)")
+    batch.add_argument("--yearly", action="store_true", help="Also write mortgage and rent yearly tables")
+    batch.add_argument("--fidelity", choices=list(FIDELITY_LEVELS), default="annual", help="Interest accrual model")
+    batch.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint.json)")
+    batch.add_argument("--errors", help="Rejected rows file (default: OUTPUT.errors.jsonl)")
+    batch.add_argument("--id-field", default="id", help="Input field copied to the output 'id' column")
+    batch.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    batch.add_argument("--quiet", action="store_true", help="No progress output")
+    batch.add_argument("--metrics-file", help="Write per-stage Prometheus metrics to this file after every chunk")
+    
+    dataset = subparsers.add_parser(
+        "dataset", help="Analyze every row of a memory-mapped .npy column dataset",
+        description="Evaluate a directory of 1-D .npy columns named after input fields "
+                    "(home_price.npy, monthly_rent.npy, ...) and write one .npy result column "
+                    "per summary metric, aligned row for row."
+    )
+    dataset.add_argument("dataset", help="Directory of .npy input columns")
+    dataset.add_argument("output", help="Directory for the .npy result columns")
+    dataset.add_argument("--set", action="append", metavar="FIELD=VALUE", help="Input for fields without a column (repeatable)")
+    dataset.add_argument("--chunk-size", type=int, help="Rows per batch evaluation (default: 32768)")
+    dataset.add_argument("--fidelity", choices=list(FIDELITY_LEVELS), default="annual", help="Interest accrual model")
+    dataset.add_argument("--rows", metavar="START:STOP", help="Only evaluate this row range")
+    dataset.add_argument("--quiet", action="store_true", help="No progress output")
+    
+    backtest = subparsers.add_parser(
+        "backtest", help="Replay historical returns over every rolling window",
+        description="Evaluate the scenario over every window of consecutive years in a CSV of annual "
+                    "returns (columns: year, house_growth, rent_growth, stock_growth, in percent)."
+    )
+    backtest.add_argument("series", help="CSV of annual returns")
+    backtest.add_argument("--years", type=int, help="Window length (default: the scenario's years)")
+    backtest.add_argument("--from", dest="start", type=int, help="First start year")
+    backtest.add_argument("--to", type=int, help="Last start year")
+    backtest.add_argument("--set", action="append", metavar="FIELD=VALUE", help="Scenario input (repeatable)")
+    backtest.add_argument("--column", action="append", metavar="FIELD=COLUMN", help="CSV column for a growth field (repeatable)")
+    backtest.add_argument("--fractions", action="store_true", help="Returns are fractions (0.045) instead of percent")
+    backtest.add_argument("--fidelity", choices=list(FIDELITY_LEVELS), default="annual", help="Interest accrual model")
+    
+    serve = subparsers.add_parser("serve", help="Run the HTTP JSON API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, help="Worker pool size (default: CPU count)")
+    serve.add_argument("--threads", action="store_true", help="Use a thread pool instead of processes")
+    serve.add_argument("--window-ms", type=float, default=0.0, help="Extra wait for single requests to share a batch")
+    serve.add_argument("--max-batch", type=int, default=512, help="Largest batch per worker call")
+    serve.add_argument("--metrics", action="store_true", help="Record per-stage metrics and serve GET /metrics")
+    
+    loadtest = subparsers.add_parser("loadtest", help="Measure a running server's throughput and latency")
+    loadtest.add_argument("--host", default="127.0.0.1")
+    loadtest.add_argument("--port", type=int, default=8765)
+    loadtest.add_argument("--concurrency", type=int, default=64, help="Concurrent keep-alive connections")
+    loadtest.add_argument("--requests", type=int, default=5000, help="Total requests")
+    loadtest.add_argument("--batch", type=int, default=0, help="Scenarios per /analyze/batch request (0: single /analyze)")
+    loadtest.add_argument("--fidelity", choices=list(FIDELITY_LEVELS), default="annual")
+    loadtest.add_argument("--summary-only", action="store_true", help="Skip the yearly tables")
+    
+    benchmark = subparsers.add_parser("benchmark", help="Benchmark the core engine against a baseline")
+    benchmark.add_argument("--output", default=DEFAULT_RESULTS_PATH, help="Where to write this run's results")
+    benchmark.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline results to compare against")
+    benchmark.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    benchmark.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed fractional ops/sec drop")
+    benchmark.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE, help="Allowed fractional peak memory growth")
+    benchmark.add_argument("--min-time", type=float, default=0.05, help="Seconds per timing repeat")
+    benchmark.add_argument("--repeat", type=int, default=7, help="Timing repeats per case")
+    benchmark.add_argument("--quick", action="store_true", help="Short timings (--min-time 0.02 --repeat 3)")
+    benchmark.add_argument("--match", help="Only run cases whose name contains this text")
+    benchmark.add_argument("--verbose", action="store_true", help="List every case in the comparison")
+    benchmark.add_argument("--quiet", action="store_true", help="No per-case output")
+    
+    importtime = subparsers.add_parser(
+        "importtime", help="Check cold-start import times against their budgets",
+        description="Import each module in a fresh interpreter under python -X importtime and fail "
+                    "when it exceeds its time budget or loads third-party packages it should not."
+    )
+    importtime.add_argument("--repeat", type=int, default=DEFAULT_IMPORT_REPEAT, help="Fresh imports per module (best is kept)")
+    importtime.add_argument("--module", action="append", help="Only check this module (repeatable)")
+    importtime.add_argument("--verbose", action="store_true", help="List the slowest imports under each module")
+    return parser
+
 def main():
+    if len(sys.argv) > 1:
+        args = build_parser().parse_args()
+        if args.command == "batch":
+            sys.exit(run_batch(args))
+        if args.command == "dataset":
+            sys.exit(run_dataset(args))
+        if args.command == "backtest":
+            sys.exit(run_backtest(args))
+        if args.command == "serve":
+            sys.exit(run_server(args))
+        if args.command == "loadtest":
+            sys.exit(run_load_test(args))
+        if args.command == "benchmark":
+            sys.exit(run_benchmark(args))
+        if args.command == "importtime":
+            sys.exit(run_import_check(args))
+    
     print("🏠 Home Ownership vs Rent Calculator")
     print("=" * 50)
     print()
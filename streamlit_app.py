@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 import streamlit as st
-import pandas as pd
-from home_calculator_core import HomeCalculatorCore, DEFAULT_VALUES
+from home_calculator_core import (
+    HomeCalculatorCore, AnalysisResult, YearlyTable, DEFAULT_VALUES, FIDELITY_LEVELS, inputs_cache_key
+)
+from home_calculator_store import ScenarioStore
 import copy
+import os
 import time
 
 # Page configuration
@@ -14,8 +17,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Pandas, NumPy and the batch engine are imported inside the functions that
+# use them, so the header and sidebar render before those imports are paid for
+
+# Custom CSS for better styling, injected on every run by main()
+PAGE_STYLE = """
 <style>
     .main-header {
         text-align: center;
@@ -63,48 +69,84 @@ st.markdown("""
         min-height: 32px !important;
     }
 </style>
+"""
 
-<script>
-// Add debouncing to number input buttons
-(function() {
-    let lastClickTime = 0;
-    const DEBOUNCE_DELAY = 150; // 150ms debounce
-    
-    function addDebouncing() {
-        const buttons = document.querySelectorAll('.stNumberInput button');
-        buttons.forEach(button => {
-            if (!button.hasAttribute('data-debounced')) {
-                button.setAttribute('data-debounced', 'true');
-                button.addEventListener('click', function(e) {
-                    const now = Date.now();
-                    if (now - lastClickTime < DEBOUNCE_DELAY) {
-                        e.preventDefault();
-                        e.stopPropagation();
-                        return false;
-                    }
-                    lastClickTime = now;
-                }, true);
-            }
-        });
+# Computed results survive reruns (widget clicks, Compare All, scenario switches)
+# and are keyed on the inputs that affect them
+CACHE_MAX_ENTRIES = 64
+CACHE_TTL_SECONDS = 3600
+
+
+def analysis_key(inputs):
+    """Hashable cache key: fidelity plus the normalized analysis inputs (income fields excluded)"""
+    return inputs.get('fidelity', 'annual'), inputs_cache_key(inputs)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_analysis(key, _inputs):
+    """Core analysis plus numeric (float64) display DataFrames for one set of inputs"""
+    mortgage_data, rent_data, summary = HomeCalculatorCore.generate_complete_analysis(
+        _inputs, fidelity=_inputs.get('fidelity', 'annual')
+    )
+    return mortgage_data.to_dataframe(), rent_data.to_dataframe(), summary
+
+
+def currency_columns(df, exclude=('Year',)):
+    """Column config rendering every numeric column of df as dollars, formatted in the browser"""
+    return {
+        col: st.column_config.NumberColumn(col, format="dollar")
+        for col in df.columns if col not in exclude
     }
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_sensitivity(key, _inputs):
+    """Tornado rows and their Vega-Lite chart spec for one set of inputs"""
+    from home_calculator_sensitivity import tornado_analysis
     
-    // Run on page load
-    addDebouncing();
-    
-    // Re-run when Streamlit updates the page
-    const observer = new MutationObserver(addDebouncing);
-    observer.observe(document.body, { childList: true, subtree: true });
-})();
-</script>
-""", unsafe_allow_html=True)
+    tornado_rows = tornado_analysis(_inputs, fidelity=_inputs.get('fidelity', 'annual'))
+    return tornado_rows, HomeCalculator._tornado_chart(tornado_rows).to_dict()
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_heatmap(key, _inputs, x_field, y_field, steps):
+    """Two-axis grid sweep around one set of inputs and its Vega-Lite chart spec"""
+    from home_calculator_grid import default_axis, grid_sweep
+    
+    grid = grid_sweep(_inputs, {
+        y_field: default_axis(y_field, _inputs, steps),
+        x_field: default_axis(x_field, _inputs, steps)
+    }, fidelity=_inputs.get('fidelity', 'annual'))
+    import altair as alt
+    
+    # The grid can exceed altair's 5000-row default; the browser renders it fine
+    with alt.data_transformers.disable_max_rows():
+        return grid, HomeCalculator._heatmap_chart(grid).to_dict()
+
+
+@st.cache_resource(show_spinner=False)
+def get_scenario_store():
+    """
+    Scenario store at the path in HOME_CALCULATOR_STORE, or None when unset
+    
+    Persistence is opt-in: a single store is shared by every browser
+    session, so it suits a single-user deployment only. Without it each
+    session keeps its scenarios in its own session state.
+    """
+    path = os.environ.get('HOME_CALCULATOR_STORE')
+    return ScenarioStore(path) if path else None
+
 
 class HomeCalculator:
-    def __init__(self):
+    def __init__(self, store=None):
+        self.store = store
         self.initialize_session_state()
     
     def initialize_session_state(self):
         """Initialize session state variables"""
         # Initialize scenario management
+        if 'scenarios' not in st.session_state and self.store is not None and len(self.store):
+            self.restore_scenarios()
         if 'scenarios' not in st.session_state:
             st.session_state.scenarios = {
                 'Scenario 1': {
@@ -115,6 +157,8 @@ class HomeCalculator:
                     'calculated': False
                 }
             }
+            if self.store is not None:
+                self.store.save('Scenario 1', DEFAULT_VALUES, analyze=False)
         if 'active_scenario' not in st.session_state:
             st.session_state.active_scenario = 'Scenario 1'
         if 'scenario_counter' not in st.session_state:
@@ -126,16 +170,26 @@ class HomeCalculator:
         if 'calculated' not in st.session_state:
             st.session_state.calculated = False
     
+    def restore_scenarios(self):
+        """Load saved scenarios from the store; yearly tables are loaded on first view"""
+        scenarios = {}
+        for saved in self.store.load_all():
+            scenarios[saved['name']] = {
+                'inputs': dict(DEFAULT_VALUES, **saved['inputs']),
+                'mortgage_data': None,
+                'rent_data': None,
+                'results_inputs': saved['inputs'],
+                'summary': saved['summary'] or {},
+                'calculated': saved['summary'] is not None
+            }
+        st.session_state.scenarios = scenarios
+        st.session_state.active_scenario = next(iter(scenarios))
+        numbers = [int(name.split()[-1]) for name in scenarios if name.startswith('Scenario ') and name.split()[-1].isdigit()]
+        st.session_state.scenario_counter = max(numbers + [len(scenarios)])
+    
     def generate_analysis(self, inputs):
-        """Generate the complete financial analysis using core module"""
-        # Get raw data from core module
-        mortgage_data_raw, rent_data_raw, summary = HomeCalculatorCore.generate_complete_analysis(inputs)
-        
-        # Format data for display in Streamlit tables
-        mortgage_data = self._format_mortgage_data(mortgage_data_raw)
-        rent_data = self._format_rent_data(rent_data_raw, inputs['stocks_enabled'])
-        
-        return mortgage_data, rent_data, summary
+        """Generate the complete financial analysis as display DataFrames (cached across reruns)"""
+        return cached_analysis(analysis_key(inputs), inputs)
     
     def add_scenario(self):
         """Add a new scenario"""
@@ -149,6 +203,8 @@ class HomeCalculator:
             'calculated': False
         }
         st.session_state.active_scenario = new_scenario_name
+        if self.store is not None:
+            self.store.save(new_scenario_name, DEFAULT_VALUES, analyze=False)
         self.sync_legacy_session_state()
         return new_scenario_name
     
@@ -156,6 +212,8 @@ class HomeCalculator:
         """Delete a scenario"""
         if len(st.session_state.scenarios) > 1 and scenario_name in st.session_state.scenarios:
             del st.session_state.scenarios[scenario_name]
+            if self.store is not None:
+                self.store.delete(scenario_name)
             # Switch to first available scenario
             st.session_state.active_scenario = list(st.session_state.scenarios.keys())[0]
             self.sync_legacy_session_state()
@@ -164,6 +222,8 @@ class HomeCalculator:
         """Rename a scenario"""
         if old_name in st.session_state.scenarios and new_name not in st.session_state.scenarios:
             st.session_state.scenarios[new_name] = st.session_state.scenarios.pop(old_name)
+            if self.store is not None:
+                self.store.rename(old_name, new_name)
             if st.session_state.active_scenario == old_name:
                 st.session_state.active_scenario = new_name
     
@@ -182,10 +242,64 @@ class HomeCalculator:
         current_scenario['rent_data'] = rent_data
         current_scenario['summary'] = summary
         current_scenario['calculated'] = True
+        if self.store is not None:
+            inputs = current_scenario['inputs']
+            current_scenario['results_inputs'] = dict(inputs)
+            # Store the result just computed instead of letting the store analyze again
+            result = AnalysisResult(
+                YearlyTable.from_dataframe(mortgage_data), YearlyTable.from_dataframe(rent_data), summary
+            )
+            self.store.save(
+                st.session_state.active_scenario, inputs, result, fidelity=inputs.get('fidelity', 'annual')
+            )
+    
+    def recompute_all_scenarios(self):
+        """
+        Recompute every scenario from its inputs in one batched core call per fidelity level
+        
+        Only summaries are computed here; a scenario's yearly tables are built
+        from the same inputs the first time it is viewed.
+        """
+        from home_calculator_batch import inputs_to_batch, summary_row
+        
+        scenarios = st.session_state.scenarios
+        names_by_fidelity = {}
+        for scenario_name, scenario_data in scenarios.items():
+            names_by_fidelity.setdefault(scenario_data['inputs'].get('fidelity', 'annual'), []).append(scenario_name)
+        
+        for fidelity, scenario_names in names_by_fidelity.items():
+            batch = inputs_to_batch([scenarios[name]['inputs'] for name in scenario_names])
+            _, _, summary = HomeCalculatorCore.generate_complete_analysis_batch(
+                batch, include_yearly=False, fidelity=fidelity
+            )
+            for i, scenario_name in enumerate(scenario_names):
+                scenario_data = scenarios[scenario_name]
+                scenario_data['mortgage_data'] = None
+                scenario_data['rent_data'] = None
+                scenario_data['results_inputs'] = dict(scenario_data['inputs'])
+                scenario_data['summary'] = summary_row(summary, i)
+                scenario_data['calculated'] = True
+            if self.store is not None:
+                self.store.save_summaries(
+                    [(name, scenarios[name]['inputs'], scenarios[name]['summary']) for name in scenario_names],
+                    fidelity=fidelity
+                )
+        self.sync_legacy_session_state()
     
     def sync_legacy_session_state(self):
         """Sync legacy session state with current scenario data"""
         current_scenario = self.get_current_scenario()
+        if current_scenario['calculated'] and current_scenario['mortgage_data'] is None:
+            # Summary came from a batched recompute or the store; build the tables on first view
+            stored_tables = None
+            if self.store is not None:
+                stored_tables = self.store.load_tables(st.session_state.active_scenario)
+            if stored_tables is not None:
+                mortgage_data, rent_data = (table.to_dataframe() for table in stored_tables)
+            else:
+                mortgage_data, rent_data, _ = self.generate_analysis(current_scenario['results_inputs'])
+            current_scenario['mortgage_data'] = mortgage_data
+            current_scenario['rent_data'] = rent_data
         if current_scenario['calculated']:
             st.session_state.mortgage_data = current_scenario['mortgage_data']
             st.session_state.rent_data = current_scenario['rent_data']
@@ -200,51 +314,77 @@ class HomeCalculator:
         current_time = time.time()
         st.session_state.last_input_change = current_time
     
-    def _format_mortgage_data(self, raw_data):
-        """Format mortgage data for display"""
-        formatted_data = []
-        for row in raw_data:
-            formatted_data.append({
-                'Year': row['Year'],
-                'Monthly EMI': f"${row['Monthly EMI']:,.2f}",
-                'Principal Paid': f"${row['Principal Paid']:,.2f}",
-                'Interest Paid': f"${row['Interest Paid']:,.2f}",
-                'Deductible Interest': f"${row['Deductible Interest']:,.2f}",
-                'Interest Tax Savings': f"${row['Interest Tax Savings']:,.2f}",
-                'Total P&I': f"${row['Total P&I']:,.2f}",
-                'Property Tax': f"${row['Property Tax']:,.2f}",
-                'Remaining Balance': f"${row['Remaining Balance']:,.2f}",
-                'Home Value': f"${row['Home Value']:,.2f}"
-            })
-        return formatted_data
-    
-    def _format_rent_data(self, raw_data, stocks_enabled):
-        """Format rent data for display"""
-        formatted_data = []
-        for row in raw_data:
-            formatted_row = {
-                'Year': row['Year'],
-                'Monthly Rent': f"${row['Monthly Rent']:,.2f}",
-                'Annual Rent': f"${row['Annual Rent']:,.2f}",
-                'EMI-Rent Diff': f"${row['EMI-Rent Diff']:,.2f}",
-                'Yearly Savings with EMI-Rent Diff': f"${row['Yearly Savings with EMI-Rent Diff']:,.2f}"
-            }
-            
-            if stocks_enabled:
-                formatted_row.update({
-                    'Down Payment Investment': f"${row['Down Payment Investment']:,.2f}",
-                    'EMI-Rent Diff Investment': f"${row['EMI-Rent Diff Investment']:,.2f}",
-                    'Total Stock Value': f"${row['Total Stock Value']:,.2f}"
+    def generate_sensitivity(self, inputs):
+        """Run the batched tornado analysis and build its chart spec (cached across reruns)"""
+        return cached_sensitivity(analysis_key(inputs), inputs)
+    
+    @staticmethod
+    def _tornado_chart(tornado_rows):
+        """Build a tornado chart of how each input moves Ownership - Rent net cost"""
+        import altair as alt
+        import pandas as pd
+        
+        chart_rows = []
+        for row in tornado_rows:
+            for variant in ('low', 'high'):
+                chart_rows.append({
+                    'Input': row['field'].replace('_', ' ').title(),
+                    'Variant': f"{variant.title()} input",
+                    'Input Value': row[f'{variant}_value'],
+                    'Base': row['base_difference'],
+                    'Ownership - Rent': row[f'{variant}_difference']
                 })
-            
-            formatted_data.append(formatted_row)
-        return formatted_data
+        order = [row['field'].replace('_', ' ').title() for row in tornado_rows]
+        
+        return alt.Chart(pd.DataFrame(chart_rows)).mark_bar().encode(
+            y=alt.Y('Input:N', sort=order, title=None),
+            x=alt.X('Base:Q', title='Ownership Net Cost - Rent Net Cost ($)', axis=alt.Axis(format='$,.0f')),
+            x2='Ownership - Rent:Q',
+            color=alt.Color('Variant:N', scale=alt.Scale(range=['#3498db', '#e67e22'])),
+            tooltip=['Input', 'Variant', alt.Tooltip('Input Value:Q', format=',.2f'),
+                     alt.Tooltip('Ownership - Rent:Q', format='$,.0f')]
+        )
+    
+    def generate_heatmap(self, inputs, x_field, y_field, steps):
+        """Evaluate a grid of two inputs around the current scenario and build its chart spec (cached across reruns)"""
+        return cached_heatmap(analysis_key(inputs), inputs, x_field, y_field, steps)
+    
+    @staticmethod
+    def _heatmap_chart(grid):
+        """Build a heatmap of Ownership - Rent net cost over a two-axis grid"""
+        import altair as alt
+        import numpy as np
+        import pandas as pd
+        
+        y_field, x_field = grid['fields']
+        y_values, x_values = grid['axes']
+        x_title = x_field.replace('_', ' ').title()
+        y_title = y_field.replace('_', ' ').title()
+        
+        y_index, x_index = [index.ravel() for index in np.indices(grid['difference'].shape)]
+        chart_data = pd.DataFrame({
+            x_title: x_values[x_index],
+            y_title: y_values[y_index],
+            'Ownership - Rent': grid['difference'].ravel(),
+            'Winner': ['HOME OWNERSHIP' if wins else 'RENTING' for wins in grid['owning_wins'].ravel()]
+        })
+        
+        return alt.Chart(chart_data).mark_rect().encode(
+            x=alt.X(f'{x_title}:O', axis=alt.Axis(format=',.2f', labelOverlap=True)),
+            y=alt.Y(f'{y_title}:O', sort='descending', axis=alt.Axis(format=',.2f', labelOverlap=True)),
+            color=alt.Color('Ownership - Rent:Q', scale=alt.Scale(scheme='redblue', domainMid=0, reverse=True),
+                            legend=alt.Legend(format='$,.0f')),
+            tooltip=[alt.Tooltip(f'{x_title}:Q', format=',.2f'), alt.Tooltip(f'{y_title}:Q', format=',.2f'),
+                     alt.Tooltip('Ownership - Rent:Q', format='$,.0f'), 'Winner']
+        )
 
 def main():
+    st.markdown(PAGE_STYLE, unsafe_allow_html=True)
+    
     # Header
     st.markdown("<h1 class='main-header'>🏠 Home Ownership vs Rent Calculator</h1>", unsafe_allow_html=True)
     
-    calculator = HomeCalculator()
+    calculator = HomeCalculator(get_scenario_store())
     
     # Scenario Management Header
     col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
@@ -297,6 +437,14 @@ def main():
         # General Settings
         st.subheader("⏱️ General Settings")
         years = st.number_input("Number of Years to Compare", min_value=1, max_value=50, value=current_inputs['years'], key=f"{scenario_key}_years")
+        fidelity_options = list(FIDELITY_LEVELS)
+        fidelity = st.selectbox(
+            "Calculation Fidelity", fidelity_options,
+            index=fidelity_options.index(current_inputs.get('fidelity', 'annual')),
+            format_func=lambda level: level.capitalize(),
+            help=" | ".join(f"{level.capitalize()}: {info['description']}" for level, info in FIDELITY_LEVELS.items()),
+            key=f"{scenario_key}_fidelity"
+        )
         
         # Home Purchase Details
         st.subheader("🏠 Home Purchase Details")
@@ -346,7 +494,7 @@ def main():
         'income_growth': income_growth, 'rsu_income': rsu_income, 'tax_rate': tax_rate,
         'standard_deduction': standard_deduction, 'stocks_enabled': stocks_enabled,
         'include_down_payment_growth': include_down_payment_growth, 'stock_growth': stock_growth,
-        'capital_gains_tax_rate': capital_gains_tax_rate
+        'capital_gains_tax_rate': capital_gains_tax_rate, 'fidelity': fidelity
     }
     
     # Update current scenario inputs
@@ -400,17 +548,17 @@ def main():
             """, unsafe_allow_html=True)
         
         # Detailed Analysis Tabs
-        tab1, tab2, tab3 = st.tabs(["📊 Mortgage Details", "🏠 Rent Details", "📋 Summary"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Mortgage Details", "🏠 Rent Details", "📋 Summary", "🌪️ Sensitivity", "🗺️ Heatmap"])
         
         with tab1:
             st.subheader("📊 Mortgage Details")
-            df_mortgage = pd.DataFrame(st.session_state.mortgage_data)
-            st.dataframe(df_mortgage, use_container_width=True)
+            st.dataframe(st.session_state.mortgage_data, use_container_width=True,
+                         column_config=currency_columns(st.session_state.mortgage_data))
         
         with tab2:
             st.subheader("🏠 Rent Details")
-            df_rent = pd.DataFrame(st.session_state.rent_data)
-            st.dataframe(df_rent, use_container_width=True)
+            st.dataframe(st.session_state.rent_data, use_container_width=True,
+                         column_config=currency_columns(st.session_state.rent_data))
         
         with tab3:
             st.subheader("📋 Financial Summary")
@@ -455,11 +603,48 @@ def main():
                     st.write(f"• **Monthly EMI-Rent savings** invested annually at {inputs['stock_growth']:.1f}%")
                     st.write(f"• **Total investment gains**: ${st.session_state.summary['stock_investment_gains']:,.0f}")
                     st.write(f"• **Capital gains tax** ({inputs['capital_gains_tax_rate']:.1f}%): ${st.session_state.summary['capital_gains_tax_owed']:,.0f}")
+        
+        with tab4:
+            st.subheader("🌪️ Sensitivity Analysis")
+            st.caption("Each bar shows how Ownership Net Cost - Rent Net Cost changes when one input moves down or up by a fixed step. Negative values favour owning; the longest bars are the assumptions that drive the decision.")
+            tornado_rows, tornado_spec = calculator.generate_sensitivity(inputs)
+            st.vega_lite_chart(tornado_spec, use_container_width=True)
+            import pandas as pd
+            df_tornado = pd.DataFrame({
+                'Input': [row['field'] for row in tornado_rows],
+                'Low Value': [row['low_value'] for row in tornado_rows],
+                'High Value': [row['high_value'] for row in tornado_rows],
+                'Low: Ownership - Rent': [row['low_difference'] for row in tornado_rows],
+                'High: Ownership - Rent': [row['high_difference'] for row in tornado_rows],
+                'Swing': [row['swing'] for row in tornado_rows]
+            })
+            st.dataframe(df_tornado, use_container_width=True,
+                         column_config=currency_columns(df_tornado, exclude=('Input', 'Low Value', 'High Value')))
+        
+        with tab5:
+            st.subheader("🗺️ Two-Input Heatmap")
+            st.caption("Ownership Net Cost - Rent Net Cost across a grid of two inputs centred on this scenario. Blue cells favour owning, red cells favour renting.")
+            from home_calculator_grid import DEFAULT_AXIS_SPANS
+            axis_fields = list(DEFAULT_AXIS_SPANS)
+            heatmap_col1, heatmap_col2, heatmap_col3 = st.columns(3)
+            with heatmap_col1:
+                x_field = st.selectbox("X Axis", axis_fields, index=axis_fields.index('apr'), key="heatmap_x_field")
+            with heatmap_col2:
+                y_options = [field for field in axis_fields if field != x_field]
+                y_field = st.selectbox("Y Axis", y_options, index=y_options.index('house_growth') if 'house_growth' in y_options else 0, key="heatmap_y_field")
+            with heatmap_col3:
+                heatmap_steps = st.slider("Grid Resolution", min_value=10, max_value=100, value=40, step=5, key="heatmap_steps")
+            grid, heatmap_spec = calculator.generate_heatmap(inputs, x_field, y_field, heatmap_steps)
+            st.vega_lite_chart(heatmap_spec, use_container_width=True)
+            st.write(f"**Owning wins in {grid['owning_wins'].mean():.0%} of {grid['evaluations']:,} combinations**")
     
     # Comparison Mode
     if st.session_state.comparison_mode and len(st.session_state.scenarios) > 1:
         st.markdown("---")
         st.markdown("## 📊 Scenario Comparison")
+        # Runs as a callback, before the script, so every section of this rerun shows the fresh results
+        st.button("🔄 Recompute All Scenarios", on_click=calculator.recompute_all_scenarios,
+                  help="Recalculate every scenario from its current inputs in one batched pass")
         
         # Prepare comparison data
         comparison_data = []
@@ -468,19 +653,23 @@ def main():
                 summary = scenario_data['summary']
                 comparison_data.append({
                     'Scenario': scenario_name,
-                    'Ownership Net Cost': f"${summary['ownership_net_cost']:,.0f}",
-                    'Rental Net Cost': f"${summary['rent_net_cost']:,.0f}",
+                    'Ownership Net Cost': summary['ownership_net_cost'],
+                    'Rental Net Cost': summary['rent_net_cost'],
                     'Winner': summary['winner'],
-                    'Savings': f"${summary['savings']:,.0f}",
-                    'Home Price': f"${scenario_data['inputs']['home_price']:,.0f}",
-                    'Monthly Rent': f"${scenario_data['inputs']['monthly_rent']:,.0f}",
-                    'Down Payment': f"{scenario_data['inputs']['down_payment_pct']:.1f}%",
-                    'APR': f"{scenario_data['inputs']['apr']:.2f}%"
+                    'Savings': summary['savings'],
+                    'Home Price': float(scenario_data['inputs']['home_price']),
+                    'Monthly Rent': float(scenario_data['inputs']['monthly_rent']),
+                    'Down Payment': float(scenario_data['inputs']['down_payment_pct']),
+                    'APR': float(scenario_data['inputs']['apr'])
                 })
         
         if comparison_data:
+            import pandas as pd
             df = pd.DataFrame(comparison_data)
-            st.dataframe(df, use_container_width=True)
+            column_config = currency_columns(df, exclude=('Scenario', 'Winner', 'Down Payment', 'APR'))
+            column_config['Down Payment'] = st.column_config.NumberColumn('Down Payment', format="%.1f%%")
+            column_config['APR'] = st.column_config.NumberColumn('APR', format="%.2f%%")
+            st.dataframe(df, use_container_width=True, column_config=column_config)
             
             # Summary stats
             st.markdown("### 📈 Quick Insights")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Home Calculator Parity Tests
+Checks the fast paths against the scalar generate_complete_analysis on seeded random inputs
+"""
+
+import math
+from typing import Dict, List, Any
+
+import numpy as np
+import pytest
+
+from home_calculator_batch import (
+    generate_complete_analysis_batch, inputs_to_batch, monthly_rates_batch, yearly_table
+)
+from home_calculator_core import (
+    DEDUCTIBLE_PRINCIPAL_LIMIT, DEFAULT_VALUES, FIDELITY_LEVELS, SUMMARY_COLUMNS, HomeCalculatorCore
+)
+
+
+# Every value must agree to this fraction of the larger of itself and the
+# home price; see "Batch Analysis" in the README
+TOLERANCE = 1e-10
+
+SEED = 20240601
+SCENARIOS = 120
+SHARED_APRS = (0.0, 3.25, 6.5, 9.0)
+
+
+def random_inputs(rng: np.random.Generator, count: int, distinct_aprs: bool) -> List[Dict[str, Any]]:
+    """
+    Scenarios with mixed horizons, negative loans (down payment above 100%),
+    zero and near-zero rates and negative growth
+
+    With distinct_aprs every scenario has its own APR, so the batch engine
+    amortizes each loan directly; otherwise a few APRs are shared and the
+    batch scales one schedule per rate.
+    """
+    scenarios = []
+    for _ in range(count):
+        if distinct_aprs:
+            apr = float(rng.choice([rng.uniform(0, 20), 10 ** rng.uniform(-6, -1)]))
+        else:
+            apr = float(rng.choice(SHARED_APRS))
+        scenarios.append(dict(
+            DEFAULT_VALUES,
+            years=int(rng.integers(1, 51)),
+            home_price=float(rng.choice([0.0, rng.uniform(5e4, 2e7)])) if rng.random() < 0.05 else float(rng.uniform(5e4, 2e7)),
+            down_payment_pct=float(rng.choice([rng.uniform(0, 100), rng.uniform(100, 130), 100.0, 0.0])),
+            apr=apr,
+            property_tax_rate=float(rng.uniform(0, 3)),
+            property_tax_growth=float(rng.uniform(-2, 5)),
+            house_growth=float(rng.uniform(-5, 10)),
+            maintenance_annual=float(rng.uniform(0, 30000)),
+            monthly_rent=float(rng.uniform(500, 20000)),
+            rent_growth=float(rng.uniform(-3, 8)),
+            tax_rate=float(rng.uniform(0, 50)),
+            standard_deduction=float(rng.uniform(0, 30000)),
+            stock_growth=float(rng.uniform(-5, 12)),
+            stocks_enabled=bool(rng.random() < 0.5),
+            include_down_payment_growth=bool(rng.random() < 0.8),
+            capital_gains_exemption_enabled=bool(rng.random() < 0.8)
+        ))
+    return scenarios
+
+
+def assert_close(actual: Any, expected: Any, scale: float, label: str) -> None:
+    """Agreement to TOLERANCE of max(|expected|, scale)"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_allclose(actual, expected, rtol=TOLERANCE, atol=TOLERANCE * scale, err_msg=label)
+
+
+def assert_summaries_match(actual: Dict[str, Any], expected: Dict[str, Any], scale: float, label: str) -> None:
+    """Numeric summary metrics within tolerance; the winner only where the costs are not tied"""
+    for column in SUMMARY_COLUMNS:
+        if column == 'winner':
+            continue
+        assert_close(actual[column], expected[column], scale, f"{label}: {column}")
+    gap = abs(expected['ownership_net_cost'] - expected['rent_net_cost'])
+    if gap > TOLERANCE * scale:
+        assert actual['winner'] == expected['winner'], label
+
+
+def scale_of(inputs: Dict[str, Any]) -> float:
+    return max(abs(inputs['home_price']), 1.0)
+
+
+@pytest.mark.parametrize('distinct_aprs', [False, True], ids=['shared-schedules', 'direct'])
+@pytest.mark.parametrize('fidelity', list(FIDELITY_LEVELS))
+def test_batch_matches_scalar(fidelity, distinct_aprs):
+    rng = np.random.default_rng(SEED)
+    scenarios = random_inputs(rng, SCENARIOS, distinct_aprs)
+    mortgage_columns, rent_columns, summary = generate_complete_analysis_batch(
+        inputs_to_batch(scenarios), fidelity=fidelity
+    )
+
+    for i, inputs in enumerate(scenarios):
+        expected = HomeCalculatorCore.generate_complete_analysis(inputs, fidelity=fidelity)
+        label = f"scenario {i} ({fidelity})"
+        row = {column: summary[column][i] for column in SUMMARY_COLUMNS}
+        assert_summaries_match(row, expected.summary, scale_of(inputs), label)
+
+        for columns, table in ((mortgage_columns, expected.mortgage_data), (rent_columns, expected.rent_data)):
+            batch_table = yearly_table(columns, i)
+            assert len(batch_table) == len(table) == inputs['years'], label
+            for column in table.columns:
+                assert_close(batch_table.column(column), table.column(column), scale_of(inputs), f"{label}: {column}")
+
+
+@pytest.mark.parametrize('fidelity', list(FIDELITY_LEVELS))
+def test_summary_only_matches_tables(fidelity):
+    rng = np.random.default_rng(SEED + 1)
+    for i, inputs in enumerate(random_inputs(rng, SCENARIOS, distinct_aprs=True)):
+        full = HomeCalculatorCore.generate_complete_analysis(inputs, fidelity=fidelity)
+        closed_form = HomeCalculatorCore.generate_complete_analysis(inputs, summary_only=True, fidelity=fidelity)
+        assert len(closed_form.mortgage_data) == 0
+        assert_summaries_match(closed_form.summary, full.summary, scale_of(inputs), f"scenario {i} ({fidelity})")
+
+
+def month_by_month(loan_amount: float, apr: float, fidelity: str, years: int) -> List[List[float]]:
+    """Reference amortization walking every month: [interest, principal, closing] per year"""
+    monthly_payment = HomeCalculatorCore.calculate_mortgage_payment(loan_amount, apr, 30)
+    rates = HomeCalculatorCore.monthly_rates(apr, fidelity)
+    balance = loan_amount
+    rows = []
+    for _ in range(years):
+        opening = balance
+        interest = 0.0
+        if opening > 0:
+            for rate in rates:
+                month_interest = balance * rate
+                interest += month_interest
+                balance -= min(monthly_payment - month_interest, balance)
+                if balance <= 0:
+                    break
+        balance = max(balance, 0.0)
+        rows.append([interest, opening - balance if opening > 0 else 0.0, balance])
+    return rows
+
+
+@pytest.mark.parametrize('fidelity', ['monthly', 'daily'])
+def test_folded_year_matches_month_by_month(fidelity):
+    rng = np.random.default_rng(SEED + 2)
+    for i, inputs in enumerate(random_inputs(rng, SCENARIOS, distinct_aprs=True)):
+        loan_amount = inputs['home_price'] * (1 - inputs['down_payment_pct'] / 100)
+        table = HomeCalculatorCore.generate_mortgage_data(
+            inputs['home_price'], inputs['down_payment_pct'], inputs['apr'], inputs['property_tax_rate'],
+            inputs['property_tax_growth'], inputs['house_growth'], inputs['tax_rate'], inputs['years'], fidelity
+        )
+        expected = np.array(month_by_month(loan_amount, inputs['apr'], fidelity, inputs['years']))
+        label = f"scenario {i} ({fidelity})"
+        scale = scale_of(inputs)
+        assert_close(table.column('Interest Paid'), expected[:, 0], scale, f"{label}: interest")
+        assert_close(table.column('Principal Paid'), expected[:, 1], scale, f"{label}: principal")
+        assert_close(table.column('Remaining Balance'), expected[:, 2], scale, f"{label}: balance")
+
+
+@pytest.mark.parametrize('fidelity', ['monthly', 'daily'])
+def test_batch_monthly_rates_match_scalar_exactly(fidelity):
+    rng = np.random.default_rng(SEED + 3)
+    apr = np.concatenate([rng.uniform(0, 25, 200), 10 ** rng.uniform(-8, 0, 50), [0.0, 6.5]])
+    rates = monthly_rates_batch(apr, fidelity)
+    for i, value in enumerate(apr):
+        assert rates[i].tolist() == HomeCalculatorCore.monthly_rates(float(value), fidelity)
+
+
+@pytest.mark.parametrize('fidelity', list(FIDELITY_LEVELS))
+def test_unit_schedule_scales_to_any_loan(fidelity):
+    rng = np.random.default_rng(SEED + 4)
+    for i, inputs in enumerate(random_inputs(rng, SCENARIOS, distinct_aprs=True)):
+        loan_amount = max(inputs['home_price'] * (1 - inputs['down_payment_pct'] / 100), 0.0)
+        apr, years = inputs['apr'], inputs['years']
+        unit = HomeCalculatorCore.unit_schedule(apr, fidelity, years)
+        direct = HomeCalculatorCore.amortization_schedule(loan_amount, apr, fidelity, years)
+        label = f"scenario {i} ({fidelity})"
+        scale = max(loan_amount, 1.0)
+
+        assert_close(loan_amount * unit.monthly_payment, direct.monthly_payment, scale, f"{label}: payment")
+        for column in ('interest', 'principal', 'balance'):
+            scaled = [loan_amount * value for value in getattr(unit, column)[:years]]
+            assert_close(scaled, getattr(direct, column), scale, f"{label}: {column}")
+
+        # Deductible interest from the scale limits equals the $750k rule applied to the opening balance
+        table = HomeCalculatorCore.generate_mortgage_data(
+            inputs['home_price'], inputs['down_payment_pct'], apr, inputs['property_tax_rate'],
+            inputs['property_tax_growth'], inputs['house_growth'], inputs['tax_rate'], years, fidelity
+        )
+        if loan_amount > 0:
+            expected = [
+                interest * (min(closing + paid, DEDUCTIBLE_PRINCIPAL_LIMIT) / (closing + paid)
+                            if closing + paid > 0 else 1.0)
+                for interest, paid, closing in zip(direct.interest, direct.principal, direct.balance)
+            ]
+            assert_close(table.column('Deductible Interest'), expected, scale, f"{label}: deductible")
+            assert not any(math.isnan(value) for value in table.column('Deductible Interest'))